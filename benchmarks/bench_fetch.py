@@ -0,0 +1,60 @@
+"""
+Load test of the whole fetch path (login, chart request, parsing and time computations)
+against the local mock RecoRu server.
+
+python -m benchmarks.bench_fetch [--accounts N] [--workers N] [--latency SECONDS] [--error-rate RATE]
+"""
+import argparse
+import statistics
+import time as timer
+
+from benchmarks.mock_server import MockRecoruServer
+from recolul import batch
+from recolul.config import Config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=batch.DEFAULT_MAX_WORKERS)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 error")
+    parser.add_argument("--bad-login-rate", type=float, default=0.0, help="Probability of rejecting a login")
+    args = parser.parse_args()
+
+    with MockRecoruServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        bad_login_rate=args.bad_login_rate
+    ) as server:
+        configs = [
+            Config(
+                recoru_contract_id="100000",
+                recoru_auth_id=f"employee{i:05}@example.com",
+                recoru_password="secret",
+                recoru_base_url=server.base_url
+            )
+            for i in range(args.accounts)
+        ]
+        latencies = []
+
+        def get_attendance_chart(config: Config):
+            start = timer.perf_counter()
+            try:
+                return batch.fetch_attendance_chart(config)
+            finally:
+                latencies.append(timer.perf_counter() - start)
+
+        start = timer.perf_counter()
+        results = batch.run_batch(configs, max_workers=args.workers, get_attendance_chart=get_attendance_chart)
+        elapsed = timer.perf_counter() - start
+
+    errors = sum(1 for result in results if not result.ok)
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(f"{args.accounts} accounts in {elapsed:.2f}s ({args.accounts / elapsed:.1f} accounts/s), {errors} errors")
+    print(f"Per account: p50 {quantiles[49] * 1000:.1f}ms, p90 {quantiles[89] * 1000:.1f}ms, p99 {quantiles[98] * 1000:.1f}ms")
+    print(f"{server.request_count} requests, {server.login_count} logins")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Per-page parse time of each available parser backend on the test fixtures.
+
+python -m benchmarks.bench_parsers [--repeat N]
+"""
+import argparse
+import os
+import timeit
+
+from recolul.recoru.parsers import get_available_parsers
+from recolul.recoru.recoru_session import RecoruSession
+
+RESOURCES_FOLDER = os.path.realpath(f"{__file__}/../../tests/resources")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20, help="Number of parses per page")
+    args = parser.parse_args()
+
+    pages = {}
+    for filename in sorted(os.listdir(RESOURCES_FOLDER)):
+        with open(os.path.join(RESOURCES_FOLDER, filename), "rt", encoding="UTF-8") as page_file:
+            pages[filename] = page_file.read()
+
+    backends = get_available_parsers()
+    print(f"{'page':<32}{'size':>8}" + "".join(f"{backend:>14}" for backend in backends))
+    for filename, text in pages.items():
+        timings = [
+            min(timeit.repeat(
+                lambda: RecoruSession._parse_attendance_chart(text, backend),
+                number=1,
+                repeat=args.repeat
+            ))
+            for backend in backends
+        ]
+        print(
+            f"{filename:<32}{len(text) // 1024:>6}KB"
+            + "".join(f"{timing * 1000:>12.2f}ms" for timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Wall time of CLI commands that don't need the network, with a cached synthetic chart.
+Exits with an error when the median of a command is over its budget.
+
+python -m benchmarks.bench_startup [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.synthetic import generate_month_html
+from recolul.recoru.chart_cache import ChartCache
+from recolul.recoru.months import current_month
+
+# Milliseconds, including the interpreter startup
+BUDGETS = {
+    "--version": 60,
+    "when": 100
+}
+
+
+def get_cli_environment(cache_home: str) -> dict[str, str]:
+    """Environment of a CLI process with a configured account whose current chart is cached in cache_home"""
+    environment = dict(
+        os.environ,
+        XDG_CACHE_HOME=cache_home,
+        RECORU_CONTRACT_ID="100000",
+        RECORU_AUTH_ID="alice",
+        RECORU_PASSWORD="secret",
+        # The cached chart is used, the base URL is never reached
+        RECORU_BASE_URL="http://localhost:1"
+    )
+    cache = ChartCache(directory=os.path.join(cache_home, "recolul"))
+    month = current_month()
+    cache.set("100000", "alice", month, generate_month_html(month, seed="startup", today=date.today()))
+    return environment
+
+
+def time_process(argv: list[str], environment: dict[str, str], repeat: int) -> float:
+    """Median wall time in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, env=environment, check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10, help="Number of runs per command")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_home:
+        environment = get_cli_environment(cache_home)
+        over_budget = []
+        baseline = time_process([sys.executable, "-c", "pass"], environment, args.repeat)
+        print(f"{'python -c pass':<24}{baseline:>8.1f}ms")
+        for command, budget in BUDGETS.items():
+            median = time_process([sys.executable, "-m", "recolul.cli", *command.split()], environment, args.repeat)
+            print(f"{'recolul ' + command:<24}{median:>8.1f}ms  (budget {budget}ms)")
+            if median > budget:
+                over_budget.append(command)
+
+    if over_budget:
+        sys.exit(f"Over budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
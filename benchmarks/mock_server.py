@@ -0,0 +1,219 @@
+"""
+Local stand-in for RecoRu, serving synthetic attendance charts.
+
+python -m benchmarks.mock_server [--port 8080] [--latency 0.05] [--error-rate 0.01] [--bad-login-rate 0.0]
+
+Then point recolul at it with RECORU_BASE_URL=http://localhost:8080.
+Any account can log in, except with the password "wrong".
+"""
+import argparse
+import random
+import secrets
+import threading
+import time
+from datetime import date
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from benchmarks.synthetic import generate_month_html
+from recolul.recoru.months import add_months, current_month
+
+_SESSION_COOKIE = "JSESSIONID"
+_LOGIN_PAGE = """<form id="loginForm" action="/ap/login" method="post">
+  <input name="contractId"><input name="authId"><input name="password" type="password">
+</form>"""
+_LOGIN_ERROR_PAGE = """<div class="message-err">ログインできません。</div>""" + _LOGIN_PAGE
+_HOME_PAGE = """<div id="home"></div>"""
+
+
+class MockRecoruServer:
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        bad_login_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        latency: seconds added to every response
+        error_rate: probability of answering with a 500 error
+        bad_login_rate: probability of rejecting a valid login
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.bad_login_rate = bad_login_rate
+        self.seed = seed
+        self.request_count = 0
+        self.login_count = 0
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions: dict[str, str | None] = {}  # Session ID -> logged in account
+        self._pages: dict[tuple[str, date], str] = {}
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def draw(self, probability: float) -> bool:
+        with self._lock:
+            return self._rng.random() < probability
+
+    def new_session(self) -> str:
+        session_id = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[session_id] = None
+        return session_id
+
+    def login(self, session_id: str, account: str) -> None:
+        with self._lock:
+            self._sessions[session_id] = account
+            self.login_count += 1
+
+    def get_account(self, session_id: str | None) -> str | None:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def get_chart_page(self, account: str, month: date) -> str:
+        key = (account, month)
+        with self._lock:
+            page = self._pages.get(key)
+        if page is None:
+            page = generate_month_html(month, seed=f"{self.seed}-{account}-{month:%Y-%m}", today=date.today())
+            with self._lock:
+                self._pages[key] = page
+        return page
+
+
+def _make_handler(server: MockRecoruServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if not self._start_request():
+                return
+            if self.path.rstrip("/") == "/ap":
+                session_id = self._get_session_id() or server.new_session()
+                self._respond(200, _LOGIN_PAGE, session_id)
+            else:
+                self._respond(404, "Not found")
+
+        def do_POST(self):
+            form = self._read_form()
+            if not self._start_request():
+                return
+            match self.path:
+                case "/ap/login":
+                    self._login(form)
+                case "/ap/home/loadAttendanceChartGadget":
+                    self._load_attendance_chart_gadget(form)
+                case _:
+                    self._respond(404, "Not found")
+
+        def log_message(self, format, *args):
+            pass
+
+        def _login(self, form: dict[str, str]):
+            session_id = self._get_session_id()
+            if (
+                not session_id
+                or not form.get("contractId")
+                or form.get("password") == "wrong"
+                or server.draw(server.bad_login_rate)
+            ):
+                self._respond(200, _LOGIN_ERROR_PAGE)
+                return
+            server.login(session_id, f"{form['contractId']}:{form.get('authId', '')}")
+            self._respond(200, _HOME_PAGE)
+
+        def _load_attendance_chart_gadget(self, form: dict[str, str]):
+            account = server.get_account(self._get_session_id())
+            if not account:
+                # Not logged in
+                self._respond(200, _LOGIN_PAGE)
+                return
+            month = add_months(current_month(), int(form.get("periodPoint", 0)))
+            self._respond(200, server.get_chart_page(account, month))
+
+        def _start_request(self) -> bool:
+            """Simulate latency and errors. Return whether the request should be handled."""
+            with server._lock:
+                server.request_count += 1
+            if server.latency:
+                time.sleep(server.latency)
+            if server.draw(server.error_rate):
+                self._respond(500, "Internal Server Error")
+                return False
+            return True
+
+        def _get_session_id(self) -> str | None:
+            cookie = SimpleCookie(self.headers.get("Cookie", ""))
+            return cookie[_SESSION_COOKIE].value if _SESSION_COOKIE in cookie else None
+
+        def _read_form(self) -> dict[str, str]:
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length).decode() if length else ""
+            return {key: values[0] for key, values in parse_qs(body).items()}
+
+        def _respond(self, status: int, text: str, session_id: str | None = None):
+            body = text.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            if session_id:
+                self.send_header("Set-Cookie", f"{_SESSION_COOKIE}={session_id}; Path=/ap")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 error")
+    parser.add_argument("--bad-login-rate", type=float, default=0.0, help="Probability of rejecting a login")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockRecoruServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        bad_login_rate=args.bad_login_rate,
+        seed=args.seed
+    )
+    print(f"Serving on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark suite of chart parsing and time computations.
+
+python -m benchmarks.run [--repeat N] [--rows N] [--filter NAME] [--json PATH]
+
+Each benchmark reports latency percentiles, throughput in chart rows per second,
+and the peak memory allocated during a single run (measured separately, with tracemalloc).
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import statistics
+import time as timer
+import tracemalloc
+from collections.abc import Callable
+from datetime import date
+
+from benchmarks.synthetic import generate_attendance_chart_html
+from recolul import time
+from recolul.recoru.recoru_session import RecoruSession
+
+RESOURCES_FOLDER = os.path.realpath(f"{__file__}/../../tests/resources")
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    name: str
+    rows: int
+    timings: list[float]  # Seconds
+    peak_memory: int  # Bytes
+
+    @property
+    def percentiles(self) -> dict[str, float]:
+        if len(self.timings) == 1:
+            return {"p50": self.timings[0], "p90": self.timings[0], "p99": self.timings[0]}
+        quantiles = statistics.quantiles(self.timings, n=100, method="inclusive")
+        return {"p50": quantiles[49], "p90": quantiles[89], "p99": quantiles[98]}
+
+    @property
+    def throughput(self) -> float:
+        """Rows per second"""
+        return self.rows / statistics.median(self.timings)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "runs": len(self.timings),
+            **{name: value * 1000 for name, value in self.percentiles.items()},
+            "rowsPerSecond": self.throughput,
+            "peakMemory": self.peak_memory
+        }
+
+
+def run_benchmark(name: str, func: Callable[[], object], rows: int, repeat: int) -> BenchmarkResult:
+    func()  # Warm-up
+    gc.collect()
+    timings = []
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        func()
+        timings.append(timer.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(name=name, rows=rows, timings=timings, peak_memory=peak_memory)
+
+
+def get_benchmarks(synthetic_rows: int) -> dict[str, tuple[Callable[[], object], int]]:
+    """Benchmark functions by name, with the number of chart rows they process"""
+    pages = {}
+    for filename in sorted(os.listdir(RESOURCES_FOLDER)):
+        with open(os.path.join(RESOURCES_FOLDER, filename), "rt", encoding="UTF-8") as page_file:
+            pages[filename.removesuffix(".html")] = page_file.read()
+    pages[f"synthetic_{synthetic_rows}"] = generate_attendance_chart_html(
+        date(2023, 1, 1),
+        synthetic_rows,
+        in_progress=True,
+        seed=0
+    )
+
+    benchmarks = {}
+    for page_name, text in pages.items():
+        chart = RecoruSession._parse_attendance_chart(text)
+        rows = len(chart)
+        benchmarks[f"parse/{page_name}"] = (lambda text=text: RecoruSession._parse_attendance_chart(text), rows)
+        benchmarks[f"overtime_history/{page_name}"] = (lambda chart=chart: time.get_overtime_history(chart), rows)
+        benchmarks[f"until_today/{page_name}"] = (lambda chart=chart: time.until_today(chart), rows)
+        if page_name.startswith(("when_", "synthetic_")):
+            # Only these charts have an entry in progress
+            benchmarks[f"leave_time/{page_name}"] = (lambda chart=chart: time.get_leave_time(chart), rows)
+    return benchmarks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs per benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="Number of rows of the synthetic chart")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'benchmark':<46}{'p50':>10}{'p90':>10}{'p99':>10}{'rows/s':>12}{'peak':>10}")
+    for name, (func, rows) in get_benchmarks(args.rows).items():
+        if args.filter not in name:
+            continue
+        result = run_benchmark(name, func, rows, args.repeat)
+        results.append(result)
+        percentiles = result.percentiles
+        print(
+            f"{name:<46}"
+            + "".join(f"{percentiles[p] * 1000:>8.3f}ms" for p in ("p50", "p90", "p99"))
+            + f"{result.throughput:>12,.0f}"
+            + f"{result.peak_memory / 1024:>8.0f}KB"
+        )
+
+    if args.json:
+        with open(args.json, "wt", encoding="UTF-8") as json_file:
+            json.dump([result.to_dict() for result in results], json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Synthetic attendance chart pages, with the same structure as the pages returned by RecoRu.
+
+python -m benchmarks.synthetic --employees 100 --months 12 --output DIR
+writes DIR/<employee>/<YYYY-MM>.html
+"""
+import argparse
+import calendar
+import os
+import random
+from datetime import date, timedelta
+from html import escape
+
+from recolul.recoru.months import add_months, current_month, get_month_range
+
+_WEEKDAYS = "月火水木金土日"
+
+_HEADER_COLUMNS = [
+    ("item-day", "日付"),
+    ("item-workPlace", "作業場所"),
+    ("item-attendKbn", "勤務区分"),
+    ("item-worktimeStart", "開始"),
+    ("item-worktimeEnd", "終了"),
+    ("item-breaktime", "休憩時間"),
+    ("item-yukyutime", "時間有休"),
+    ("item-standardWorkTime", "所定内労働"),
+    ("item-workTime", "労働時間"),
+    ("item-actualWorkTime", "実労働時間"),
+    ("item-outsideTime", "時間外"),
+    ("item-worktimeMemo", "メモ"),
+    ("item-summaryItem", "HF Bldg."),
+    ("item-summaryItem", "WFH")
+]
+
+
+def generate_attendance_chart_html(
+    first_day: date,
+    day_count: int,
+    in_progress: bool = False,
+    seed: int | str | None = None
+) -> str:
+    """
+    Generate the page of an attendance chart starting at first_day.
+    If in_progress, the last day is clocked in but not clocked out.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(day_count):
+        day = first_day + timedelta(days=i)
+        is_last_day = i == day_count - 1
+        rows.extend(_generate_day_rows(rng, day, in_progress=in_progress and is_last_day))
+    return _generate_page(rows)
+
+
+def generate_month_html(month: date, seed: int | str | None = None, today: date | None = None) -> str:
+    """
+    Generate the page of the attendance chart of a whole month.
+    Days after `today` have no entries yet, and `today` is in progress.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for day_of_month in range(1, calendar.monthrange(month.year, month.month)[1] + 1):
+        day = month.replace(day=day_of_month)
+        if today and day > today:
+            rows.extend(_generate_day_rows(rng, day, in_progress=False, future=True))
+        else:
+            rows.extend(_generate_day_rows(rng, day, in_progress=day == today))
+    return _generate_page(rows)
+
+
+def _generate_page(rows: list[str]) -> str:
+    header = "\n".join(f'<td class="{css_class}">{title}</td>' for css_class, title in _HEADER_COLUMNS)
+    return f"""<form id="attendanceChartGadgetForm" action="/ap/home/loadAttendanceChartGadget" method="post">
+  <input id="periodPoint" name="periodPoint" class="form_params" type="hidden" value="0">
+  <table id="ID-attendanceChartGadgetTable" class="h-tbl-attendanceChartGadget">
+    <thead>
+      <tr>
+{header}
+      </tr>
+    </thead>
+    <tbody>
+{"".join(rows)}
+    </tbody>
+  </table>
+</form>"""
+
+
+def _generate_day_rows(rng: random.Random, day: date, in_progress: bool, future: bool = False) -> list[str]:
+    label = f"{day.month}/{day.day}({_WEEKDAYS[day.weekday()]})"
+    if day.weekday() == 5:
+        color = "blue"
+    elif day.weekday() == 6 or rng.random() < 0.03:  # Sundays and public holidays
+        color = "red"
+    else:
+        color = "#666"
+
+    if future:
+        return [_generate_row(day, 1, label, color)]
+    draw = rng.random()
+    if color != "#666" and not in_progress:
+        if draw < 0.05:
+            # Worked holiday, compensated by a swap day
+            return [_generate_row(day, 1, label, color, "WFH", "Attendance/Work", "10:00", "15:00", "swap day")]
+        return [_generate_row(day, 1, label, color)]
+
+    if not in_progress and draw < 0.04:
+        return [_generate_row(day, 1, label, color, category=rng.choice(["Paid Leave", "Sick Leave"]))]
+    if not in_progress and draw < 0.05:
+        return [_generate_row(day, 1, label, color, category="Flexible Holiday")]
+    if not in_progress and draw < 0.08:
+        return [
+            _generate_row(day, 1, label, color, "WFH", rng.choice(["Half Day Leave AM", "Flexible Holiday AM"])),
+            _generate_row(day, 2, "", "", "HF Bldg.", "Attendance/Work", "13:00", "17:30")
+        ]
+    if not in_progress and draw < 0.2:
+        # Morning at home, afternoon at the office
+        return [
+            _generate_row(day, 1, label, color, "WFH", "Attendance/Work", "07:00", f"08:{rng.randint(30, 59)}"),
+            _generate_row(
+                day, 2, "", "", "HF Bldg.", "Attendance/Work", f"09:{rng.randint(10, 40)}", f"17:{rng.randint(10, 50):02}"
+            )
+        ]
+
+    workplace = rng.choice(["HF Bldg.", "HF Bldg.", "WFH"])
+    clock_in = f"{rng.randint(7, 10):02}:{rng.randint(0, 59):02}"
+    if in_progress:
+        clock_out = ""
+    elif draw < 0.22:
+        clock_out = f"{rng.randint(0, 2):02}:{rng.randint(0, 59):02}"  # After midnight
+    else:
+        clock_out = f"{rng.randint(16, 20):02}:{rng.randint(0, 59):02}"
+    return [_generate_row(day, 1, label, color, workplace, "Attendance/Work", clock_in, clock_out)]
+
+
+def _generate_row(
+    day: date,
+    entry_index: int,
+    label: str,
+    color: str,
+    workplace: str = "",
+    category: str = "",
+    clock_in: str = "",
+    clock_out: str = "",
+    memo: str = ""
+) -> str:
+    day_label = f'<label style="color: {color};">{label}</label>' if label else ""
+    return f"""      <tr class=" " onclick="loadAttendanceEditDialog('36','{day:%Y%m%d}','{entry_index}', 'false');">
+        <td class="item-day item">{day_label}</td>
+        <td class="item-workPlace item">{escape(workplace)}</td>
+        <td class="item-attendKbn item" title="">{escape(category)}</td>
+        <td class="item-worktimeStart item" title="">{clock_in}</td>
+        <td class="item-worktimeEnd item" title="">{clock_out}</td>
+        <td class="item-breaktime item" title=""><label style="vertical-align: middle;"></label></td>
+        <td class="item-yukyutime item"><label></label></td>
+        <td class="item-standardWorkTime item"><label></label></td>
+        <td class="item-workTime item"><label></label></td>
+        <td class="item-actualWorkTime item"><label></label></td>
+        <td class="item-outsideTime item"><label></label></td>
+        <td class="item-worktimeMemo"><div class="custom-scrollbar" style="max-height: 70px;">{escape(memo)}</div></td>
+        <td class="item-summaryItem item"><label></label></td>
+        <td class="item-summaryItem item"><label></label></td>
+      </tr>
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=10)
+    parser.add_argument("--months", type=int, default=1, help="Number of months until the current month")
+    parser.add_argument("--output", required=True, help="Output folder")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    last_month = current_month()
+    first_month = add_months(last_month, 1 - args.months)
+    for employee in range(args.employees):
+        employee_folder = os.path.join(args.output, f"employee{employee:05}")
+        os.makedirs(employee_folder, exist_ok=True)
+        for month in get_month_range(first_month, last_month):
+            text = generate_month_html(month, seed=f"{args.seed}-{employee}-{month:%Y-%m}", today=date.today())
+            with open(os.path.join(employee_folder, f"{month:%Y-%m}.html"), "wt", encoding="UTF-8") as page_file:
+                page_file.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from gui.settings import Settings
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.recoru.cookie_store import CookieStore
+from recolul.recoru.parsed_charts import ParsedChartMemo
+from recolul.recoru.recoru_session import RecoruSession
+
+
+class ChartLoader(QObject):
+    """
+    Fetch the attendance chart of the current month in a background thread.
+
+    A running request can't be interrupted, so cancelling a load (or starting a new one)
+    makes the loader ignore its result instead.
+    """
+    loaded = Signal(object)  # AttendanceChart
+    failed = Signal(object)  # Exception
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+        self._cookie_store = CookieStore()
+        # Refreshes mostly fetch an unchanged page, which is then not parsed again
+        self.parsed_charts = ParsedChartMemo()
+        self._generation = 0
+        self._pending_generation: int | None = None
+
+        self._signals = _LoadSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+        self._signals.failed.connect(self._on_failed)
+
+    @property
+    def is_loading(self) -> bool:
+        return self._pending_generation is not None
+
+    def load(self, settings: Settings) -> None:
+        self._generation += 1
+        self._pending_generation = self._generation
+        self._thread_pool.start(
+            _LoadTask(self._generation, settings, self._cookie_store, self.parsed_charts, self._signals)
+        )
+
+    def cancel(self) -> None:
+        self._generation += 1
+        self._pending_generation = None
+
+    def _on_loaded(self, generation: int, attendance_chart: AttendanceChart) -> None:
+        if generation != self._pending_generation:
+            return
+        self._pending_generation = None
+        self.loaded.emit(attendance_chart)
+
+    def _on_failed(self, generation: int, error: Exception) -> None:
+        if generation != self._pending_generation:
+            return
+        self._pending_generation = None
+        self.failed.emit(error)
+
+
+class _LoadSignals(QObject):
+    """Signals of _LoadTask, emitted from the worker thread and delivered on the main thread"""
+    loaded = Signal(int, object)
+    failed = Signal(int, object)
+
+
+class _LoadTask(QRunnable):
+    def __init__(
+        self,
+        generation: int,
+        settings: Settings,
+        cookie_store: CookieStore,
+        parsed_charts: ParsedChartMemo,
+        signals: _LoadSignals
+    ):
+        super().__init__()
+        self._generation = generation
+        self._settings = settings
+        self._cookie_store = cookie_store
+        self._parsed_charts = parsed_charts
+        self._signals = signals
+
+    def run(self) -> None:
+        try:
+            # Cookies are kept between loads so that refreshes don't log in again
+            with RecoruSession(
+                contract_id=self._settings.recoru_contract_id,
+                auth_id=self._settings.recoru_auth_id,
+                password=self._settings.recoru_password,
+                cookie_store=self._cookie_store,
+                parsed_charts=self._parsed_charts
+            ) as recoru_session:
+                attendance_chart = recoru_session.get_attendance_chart()
+        except Exception as error:
+            self._signals.failed.emit(self._generation, error)
+        else:
+            self._signals.loaded.emit(self._generation, attendance_chart)
@@ -1,16 +1,19 @@
 import sys
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QApplication, QMainWindow, QMessageBox, QTextEdit
 
 import gui.rc_icons  # Keep this import
+from gui.chart_loader import ChartLoader
 from gui.settings import Settings
 from gui.settings_dialog import SettingsDialog
 from gui.summary import Summary
 from recolul import __version__
 from recolul.errors import InvalidRecoruLoginError
-from recolul.recoru.recoru_session import RecoruSession
+from recolul.recoru.attendance_chart import AttendanceChart
+
+_REFETCH_INTERVAL = 10 * 60_000  # Milliseconds
 
 
 class MainMenu(QMainWindow):
@@ -19,7 +22,7 @@ class MainMenu(QMainWindow):
 
         try:
             self.setWindowTitle("Recolul")
-            self.setFixedSize(500, 250)
+            self.setFixedSize(500, 500)
             self.setWindowIcon(QPixmap(":/icons/recolul.png"))
             self.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonFollowStyle)
             tool_bar = self.addToolBar("Recolul")
@@ -28,6 +31,17 @@ class MainMenu(QMainWindow):
 
             self._settings_dialog = None
             self._settings = Settings.load()
+
+            self._chart_loader = ChartLoader(self)
+            self._chart_loader.loaded.connect(self._on_attendance_chart_loaded)
+            self._chart_loader.failed.connect(self._on_load_failed)
+
+            # Fetch again regularly, to take clock-ins and edits into account
+            refetch_timer = QTimer(self)
+            refetch_timer.setInterval(_REFETCH_INTERVAL)
+            refetch_timer.timeout.connect(self._refetch_attendance_chart)
+            refetch_timer.start()
+
             if not self._settings.is_empty:
                 self._load_attendance_chart()
             else:
@@ -58,22 +72,32 @@ class MainMenu(QMainWindow):
 
         self._settings = new_settings
         self._settings.save()
+        # The chart of the previous account is not relevant anymore
+        self._chart_loader.cancel()
         self._load_attendance_chart()
 
     def _load_attendance_chart(self):
-        try:
-            with RecoruSession(
-                contract_id=self._settings.recoru_contract_id,
-                auth_id=self._settings.recoru_auth_id,
-                password=self._settings.recoru_password
-            ) as recoru_session:
-                attendance_chart = recoru_session.get_attendance_chart()
-        except InvalidRecoruLoginError:
-            self._set_global_message("Invalid RecoRu login information. Please check the settings.")
+        self._set_global_message("Loading...")
+        self._chart_loader.load(self._settings)
+
+    def _refetch_attendance_chart(self):
+        if self._settings.is_empty or self._chart_loader.is_loading:
             return
+        self._chart_loader.load(self._settings)
 
-        summary = Summary(attendance_chart, self)
-        self.setCentralWidget(summary)
+    def _on_attendance_chart_loaded(self, attendance_chart: AttendanceChart):
+        summary = self.centralWidget()
+        if isinstance(summary, Summary):
+            summary.set_attendance_chart(attendance_chart)
+        else:
+            self.setCentralWidget(Summary(attendance_chart, self))
+
+    def _on_load_failed(self, error: Exception):
+        if isinstance(error, InvalidRecoruLoginError):
+            self._set_global_message("Invalid RecoRu login information. Please check the settings.")
+        elif not isinstance(self.centralWidget(), Summary):
+            self._set_global_message(f"Could not load the attendance chart: {error}")
+        # Otherwise keep showing the last loaded chart, the next refetch may succeed
 
     def _set_global_message(self, message: str):
         text_edit = QTextEdit(message, self)
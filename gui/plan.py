@@ -0,0 +1,39 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import QLabel, QPlainTextEdit, QVBoxLayout, QWidget
+
+from recolul.planner import get_leave_plans
+from recolul.recoru.attendance_chart import AttendanceChart
+
+
+class Plan(QWidget):
+    """Leave times of the remaining working days of the month, for each scenario"""
+    def __init__(self, full_attendance_chart: AttendanceChart, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._full_attendance_chart = full_attendance_chart
+
+        self._text_edit = QPlainTextEdit()
+        self._text_edit.setReadOnly(True)
+        # Columns are aligned with spaces
+        self._text_edit.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        label = QLabel("Rest of the month", self)
+
+        self._layout = QVBoxLayout(self)
+        self._layout.addWidget(label, alignment=Qt.AlignmentFlag.AlignHCenter)
+        self._layout.addWidget(self._text_edit)
+
+        self.update_text()
+
+    def update_text(self):
+        plans = get_leave_plans(self._full_attendance_chart)
+        text = "Leave at:\n"
+        text += f"{'':<12}" + "".join(f"{plan.scenario.value:<8}" for plan in plans) + "\n"
+        for planned_days in zip(*(plan.days for plan in plans)):
+            text += f"{planned_days[0].row.day.text:<12}"
+            text += "".join(f"{str(day.leave_time):<8}" for day in planned_days) + "\n"
+        self._text_edit.setPlainText(text)
+
+    def set_attendance_chart(self, full_attendance_chart: AttendanceChart):
+        self._full_attendance_chart = full_attendance_chart
+        self.update_text()
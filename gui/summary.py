@@ -1,21 +1,34 @@
 from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QHBoxLayout, QWidget
+from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QWidget
 
+from gui.plan import Plan
 from gui.this_month import ThisMonth
 from gui.today import Today
+from recolul.incremental import OvertimeEngine
 from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.time import get_month_summary
 
 
 class Summary(QWidget):
     def __init__(self, full_attendance_chart: AttendanceChart, parent: QWidget | None = None):
         super().__init__(parent)
+        self._full_attendance_chart = full_attendance_chart
+        # Kept between refreshes so that complete rows are only evaluated once
+        self._overtime_engine = OvertimeEngine()
 
-        self.this_month = ThisMonth(full_attendance_chart, self)
-        self.today = Today(full_attendance_chart, self)
+        self.this_month = ThisMonth(self)
+        self.today = Today(self)
+        self.plan = Plan(full_attendance_chart, self)
 
-        self.layout = QHBoxLayout(self)
-        self.layout.addWidget(self.this_month)
-        self.layout.addWidget(self.today)
+        # The plan gets its own row, its table doesn't fit in a third column
+        panels = QHBoxLayout()
+        panels.addWidget(self.this_month)
+        panels.addWidget(self.today)
+        self.layout = QVBoxLayout(self)
+        self.layout.addLayout(panels)
+        self.layout.addWidget(self.plan)
+
+        self._update_summary()
 
         # Refresh every minute
         timer = QTimer(self)
@@ -23,6 +36,20 @@ class Summary(QWidget):
         timer.timeout.connect(self.refresh)
         timer.start()
 
+    def set_attendance_chart(self, full_attendance_chart: AttendanceChart):
+        if full_attendance_chart is self._full_attendance_chart:
+            # Unchanged page, see ParsedChartMemo
+            return
+        self._full_attendance_chart = full_attendance_chart
+        self.plan.set_attendance_chart(full_attendance_chart)
+        self._update_summary()
+
     def refresh(self):
-        self.this_month.update_text()
-        self.today.update_text()
+        self._update_summary()
+        self.plan.update_text()
+
+    def _update_summary(self):
+        # Both panels render from a single pass over the chart
+        month_summary = get_month_summary(self._full_attendance_chart, evaluate=self._overtime_engine.evaluate_row)
+        self.this_month.set_month_summary(month_summary)
+        self.today.set_month_summary(month_summary)
@@ -0,0 +1,189 @@
+import asyncio
+import csv
+import dataclasses
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from recolul import time
+from recolul.config import DEFAULT_RECORU_BASE_URL, Config
+from recolul.duration import Duration
+from recolul.errors import InvalidRecoruLoginError
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.recoru.chart_cache import ChartCache
+from recolul.recoru.cookie_store import CookieStore
+from recolul.recoru.recoru_session import RecoruSession
+from recolul.recoru.snapshot_archive import SnapshotArchive
+from recolul.scheduler import FetchScheduler
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+@dataclasses.dataclass
+class AccountResult:
+    contract_id: str
+    auth_id: str
+    overtime_balance: Duration | None = None
+    total_workplace_times: dict[str, Duration] = dataclasses.field(default_factory=dict)
+    working_days: int | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "contractId": self.contract_id,
+            "authId": self.auth_id,
+            "overtimeBalance": str(self.overtime_balance) if self.overtime_balance is not None else None,
+            "totalWorkplaceTimes": {
+                workplace: str(work_time) for workplace, work_time in self.total_workplace_times.items()
+            },
+            "workingDays": self.working_days,
+            "error": self.error
+        }
+
+
+def read_credentials(path: str) -> list[Config]:
+    """
+    Read a CSV file with one account per row.
+    Column names need to match the keys of the config file (contractId, authId, password, optional baseUrl).
+    """
+    with open(path, "rt", encoding="UTF-8", newline="") as credentials_file:
+        return [
+            Config(
+                recoru_contract_id=row["contractId"].strip(),
+                recoru_auth_id=row["authId"].strip(),
+                recoru_password=row["password"],
+                recoru_base_url=row.get("baseUrl") or DEFAULT_RECORU_BASE_URL
+            )
+            for row in csv.DictReader(credentials_file)
+            if row["contractId"].strip()
+        ]
+
+
+def fetch_attendance_chart(
+    config: Config,
+    cache: ChartCache | None = None,
+    cookie_store: CookieStore | None = None,
+    archive: SnapshotArchive | None = None
+) -> AttendanceChart:
+    with RecoruSession(
+        contract_id=config.recoru_contract_id,
+        auth_id=config.recoru_auth_id,
+        password=config.recoru_password,
+        cache=cache,
+        cookie_store=cookie_store,
+        base_url=config.recoru_base_url,
+        archive=archive
+    ) as recoru_session:
+        return recoru_session.get_attendance_chart()
+
+
+def fetch_attendance_charts(
+    config: Config,
+    first_month: date,
+    last_month: date,
+    cache: ChartCache | None = None,
+    cookie_store: CookieStore | None = None,
+    archive: SnapshotArchive | None = None
+) -> list[AttendanceChart]:
+    """Charts of every month from first_month to last_month, fetched in parallel over a single session"""
+    with RecoruSession(
+        contract_id=config.recoru_contract_id,
+        auth_id=config.recoru_auth_id,
+        password=config.recoru_password,
+        cache=cache,
+        cookie_store=cookie_store,
+        base_url=config.recoru_base_url,
+        archive=archive
+    ) as recoru_session:
+        return recoru_session.get_attendance_charts(first_month, last_month)
+
+
+def process_account(
+    config: Config,
+    get_attendance_chart: Callable[[Config], AttendanceChart] = fetch_attendance_chart
+) -> AccountResult:
+    """Compute the results of a single account. Errors are reported in the result instead of being raised."""
+    result = AccountResult(contract_id=config.recoru_contract_id, auth_id=config.recoru_auth_id)
+    try:
+        _set_account_results(result, get_attendance_chart(config))
+    except Exception as error:
+        result.error = _format_error(error)
+    return result
+
+
+def run_batch(
+    configs: Iterable[Config],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    get_attendance_chart: Callable[[Config], AttendanceChart] = fetch_attendance_chart,
+    scheduler: FetchScheduler | None = None
+) -> list[AccountResult]:
+    """
+    Process all accounts concurrently. Results are returned in the same order as the configs.
+    With a scheduler, fetches are rate limited and run by the scheduler instead of on max_workers threads.
+    """
+    if scheduler is None:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda config: process_account(config, get_attendance_chart), configs))
+
+    configs = list(configs)
+    futures = [
+        scheduler.submit(config.recoru_contract_id, get_attendance_chart, config)
+        for config in configs
+    ]
+    return [
+        process_account(config, lambda _: future.result())
+        for config, future in zip(configs, futures)
+    ]
+
+
+async def run_batch_async(
+    configs: Iterable[Config],
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    cache: ChartCache | None = None,
+    archive: SnapshotArchive | None = None
+) -> list[AccountResult]:
+    """
+    Same as run_batch, with every account in flight at once on the current event loop.
+    Accounts share a pool of at most max_connections connections. Requires aiohttp.
+    """
+    import aiohttp  # Optional dependency
+
+    from recolul.recoru.async_recoru_session import AsyncRecoruSession
+
+    async def process(config: Config) -> AccountResult:
+        result = AccountResult(contract_id=config.recoru_contract_id, auth_id=config.recoru_auth_id)
+        try:
+            async with AsyncRecoruSession(
+                contract_id=config.recoru_contract_id,
+                auth_id=config.recoru_auth_id,
+                password=config.recoru_password,
+                cache=cache,
+                base_url=config.recoru_base_url,
+                connector=connector,
+                archive=archive
+            ) as recoru_session:
+                full_attendance_chart = await recoru_session.get_attendance_chart()
+            _set_account_results(result, full_attendance_chart)
+        except Exception as error:
+            result.error = _format_error(error)
+        return result
+
+    async with aiohttp.TCPConnector(limit=max_connections) as connector:
+        return list(await asyncio.gather(*(process(config) for config in configs)))
+
+
+def _set_account_results(result: AccountResult, full_attendance_chart: AttendanceChart) -> None:
+    attendance_chart = time.until_today(full_attendance_chart)
+    result.overtime_balance, result.total_workplace_times = time.get_overtime_balance(attendance_chart)
+    result.working_days = time.count_working_days(full_attendance_chart)
+
+
+def _format_error(error: Exception) -> str:
+    if isinstance(error, InvalidRecoruLoginError):
+        return "Invalid RecoRu login information"
+    return f"{type(error).__name__}: {error}"
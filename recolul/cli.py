@@ -1,44 +1,59 @@
+"""
+Subcommands import what they use when they run (plotly, requests, BeautifulSoup...),
+so that commands like `recolul when` start quickly.
+"""
 import argparse
 import sys
-from getpass import getpass
+from datetime import date, datetime
+from typing import TYPE_CHECKING
 
-from recolul import __version__, plotting, time
+from recolul import __version__
 from recolul.config import Config
-from recolul.duration import Duration
-from recolul.errors import NoClockInError
-from recolul.recoru.attendance_chart import AttendanceChart
-from recolul.recoru.recoru_session import RecoruSession
-from recolul.time import get_row_work_time, until_today
+from recolul.recoru.chart_cache import DEFAULT_TTL, ChartCache
+from recolul.recoru.months import current_month
 
+if TYPE_CHECKING:
+    from recolul.recoru.attendance_chart import AttendanceChart
+    from recolul.recoru.snapshot_archive import SnapshotArchive
 
-def balance(exclude_last_day: bool) -> None:
-    full_attendance_chart = _get_attendance_chart()
-    attendance_chart = until_today(full_attendance_chart)
-    if exclude_last_day and len(attendance_chart) > 1:
-        attendance_chart = attendance_chart[:-1]
-    overtime_balance, total_workplace_times = time.get_overtime_balance(attendance_chart)
-    print(f"Monthly overtime balance: {overtime_balance}")
+
+def balance(
+    exclude_last_day: bool,
+    cache: ChartCache | None,
+    first_month: date,
+    last_month: date,
+    archive: "SnapshotArchive | None" = None,
+    snapshot_time: datetime | None = None
+) -> None:
+    from recolul import time
+    from recolul.duration import Duration
+    from recolul.recoru.attendance_chart import merge_attendance_charts
+
+    attendance_charts = _get_attendance_charts(cache, first_month, last_month, archive, snapshot_time)
+    summary = time.get_month_summary(merge_attendance_charts(attendance_charts), exclude_last_day=exclude_last_day)
+    period = "Monthly" if first_month == last_month else f"{first_month:%Y-%m} to {last_month:%Y-%m}"
+    print(f"{period} overtime balance: {summary.overtime_balance}")
     print(f"Total time per workplace:")
-    for workplace, total_work_time in total_workplace_times.items():
+    for workplace, total_work_time in summary.total_workplace_times.items():
         print(f"  {workplace}: {total_work_time}")
     print(
-        f"Maximum WFH time this month: {Duration(60) * time.count_working_days(full_attendance_chart)}"
+        f"Maximum WFH time {'this month' if first_month == last_month else 'over the period'}: "
+        f"{Duration(60) * summary.working_days}"
     )
 
-    if exclude_last_day:
+    if exclude_last_day or not summary.last_day:
         return
 
-    last_day = attendance_chart[-1]
-    print(f"\nLast day {last_day.day.text}")
-    print(f"  Clock-in: {max(entry.clock_in_time for entry in last_day.entries)}")
-    print(f"  Working hours: {get_row_work_time(last_day)}")
+    print(f"\nLast day {summary.last_day.day.text}")
+    print(f"  Clock-in: {summary.last_day_clock_in}")
+    print(f"  Working hours: {summary.last_day_work_time}")
 
 
-def when_to_leave() -> None:
-    attendance_chart = until_today(_get_attendance_chart())
-    try:
-        leave_times = time.get_leave_time(attendance_chart)
-    except NoClockInError:
+def when_to_leave(cache: ChartCache | None, archive: "SnapshotArchive | None" = None) -> None:
+    from recolul import time
+
+    leave_times = time.get_month_summary(_get_attendance_chart(cache, archive)).leave_times
+    if leave_times is None:
         print("You have already clocked out.")
         return
 
@@ -52,8 +67,51 @@ def when_to_leave() -> None:
         )
 
 
+def watch_leave_time(cache: ChartCache | None, interval: float, archive: "SnapshotArchive | None" = None) -> None:
+    from recolul import watch
+    from recolul.recoru.cookie_store import CookieStore
+    from recolul.recoru.recoru_session import RecoruSession
+
+    config = _get_config()
+    # A single session, logged in once for all the refetches
+    with RecoruSession(
+        contract_id=config.recoru_contract_id,
+        auth_id=config.recoru_auth_id,
+        password=config.recoru_password,
+        cache=cache,
+        cookie_store=CookieStore(),
+        base_url=config.recoru_base_url,
+        archive=archive
+    ) as recoru_session:
+        try:
+            watch.watch_leave_time(recoru_session.get_attendance_chart, interval)
+        except KeyboardInterrupt:
+            print()
+
+
+def plan_leave_times(cache: ChartCache | None, clock_in: str | None, archive: "SnapshotArchive | None" = None) -> None:
+    from recolul import planner
+    from recolul.duration import Duration
+
+    plans = planner.get_leave_plans(
+        _get_attendance_chart(cache, archive),
+        clock_in=Duration.parse(clock_in) if clock_in else planner.DEFAULT_CLOCK_IN
+    )
+    print(f"Overtime balance: {plans[0].overtime_balance}\n")
+    print(f"{'Day':<12}" + "".join(f"{plan.scenario.value:<16}" for plan in plans))
+    for planned_days in zip(*(plan.days for plan in plans)):
+        print(f"{planned_days[0].row.day.text:<12}" + "".join(
+            f"{str(day.leave_time) + (' (break)' if day.includes_break else ''):<16}" for day in planned_days
+        ))
+    for plan in plans:
+        if plan.final_balance.minutes:
+            print(f"\n{plan.scenario.value}: the month ends with an overtime balance of {plan.final_balance}")
+
+
 def update_config() -> None:
     """Needs to match Config.load"""
+    from getpass import getpass
+
     recoru_contract_id = input("recoru.contractId: ")
     recoru_auth_id = input("recoru.authId: ")
     recoru_password = getpass("recoru.password: ")
@@ -65,12 +123,206 @@ def update_config() -> None:
     config.save()
 
 
-def graph(exclude_last_day: bool) -> None:
-    attendance_chart = until_today(_get_attendance_chart())
+def graph(
+    exclude_last_day: bool,
+    cache: ChartCache | None,
+    first_month: date,
+    last_month: date,
+    output: str | None = None,
+    archive: "SnapshotArchive | None" = None,
+    snapshot_time: datetime | None = None
+) -> None:
+    from recolul import plotting, time
+
+    attendance_charts = _get_attendance_charts(cache, first_month, last_month, archive, snapshot_time)
+    attendance_chart = time.merge_until_today(attendance_charts, last_month)
     if exclude_last_day and len(attendance_chart) > 1:
         attendance_chart = attendance_chart[:-1]
     days, history, _ = time.get_overtime_history(attendance_chart)
-    plotting.plot_overtime_balance_history(days, history)
+    if output:
+        plotting.write_overtime_balance_history(days, history, output)
+    else:
+        plotting.plot_overtime_balance_history(days, history)
+
+
+def graph_batch(
+    credentials_path: str,
+    directory: str,
+    output_format: str,
+    exclude_last_day: bool,
+    cache: ChartCache | None,
+    first_month: date,
+    last_month: date,
+    max_workers: int | None,
+    archive: "SnapshotArchive | None" = None
+) -> None:
+    """Write the graph of every account to directory/<contractId>-<authId>.<format>"""
+    import os
+    import re
+    from concurrent.futures import ThreadPoolExecutor
+
+    from recolul import batch, plotting, time
+    from recolul.recoru.cookie_store import CookieStore
+
+    configs = batch.read_credentials(credentials_path)
+    cookie_store = CookieStore()
+
+    def get_history(config: Config):
+        try:
+            attendance_charts = batch.fetch_attendance_charts(
+                config,
+                first_month,
+                last_month,
+                cache=cache,
+                cookie_store=cookie_store,
+                archive=archive
+            )
+        except Exception as error:
+            print(f"{config.recoru_contract_id}/{config.recoru_auth_id}: error: {error}", file=sys.stderr)
+            return None
+        attendance_chart = time.merge_until_today(attendance_charts, last_month)
+        if exclude_last_day and len(attendance_chart) > 1:
+            attendance_chart = attendance_chart[:-1]
+        days, history, _ = time.get_overtime_history(attendance_chart)
+        filename = re.sub(r"[^\w.@-]", "_", f"{config.recoru_contract_id}-{config.recoru_auth_id}")
+        path = os.path.join(directory, f"{filename}.{output_format}")
+        return path, days, history, f"{config.recoru_contract_id}/{config.recoru_auth_id}"
+
+    # Fetched in threads, rendered in processes
+    with ThreadPoolExecutor(max_workers=batch.DEFAULT_MAX_WORKERS) as executor:
+        histories = [history for history in executor.map(get_history, configs) if history]
+    os.makedirs(directory, exist_ok=True)
+    plotting.write_overtime_balance_histories(histories, max_workers=max_workers)
+
+
+def run_batch(
+    credentials_path: str,
+    max_workers: int | None,
+    output_format: str,
+    cache: ChartCache | None,
+    use_async: bool = False,
+    archive: "SnapshotArchive | None" = None,
+    rate: float | None = None,
+    max_per_contract: int | None = None
+) -> None:
+    import asyncio
+    import functools
+    import json
+
+    from recolul import batch
+    from recolul.recoru.cookie_store import CookieStore
+
+    configs = batch.read_credentials(credentials_path)
+    if use_async:
+        results = asyncio.run(
+            batch.run_batch_async(
+                configs,
+                max_connections=max_workers or batch.DEFAULT_MAX_CONNECTIONS,
+                cache=cache,
+                archive=archive
+            )
+        )
+    else:
+        get_attendance_chart = functools.partial(
+            batch.fetch_attendance_chart,
+            cache=cache,
+            cookie_store=CookieStore(),
+            archive=archive
+        )
+        if rate:
+            from recolul import scheduler
+
+            with scheduler.FetchScheduler(
+                rate=rate,
+                max_per_contract=max_per_contract or scheduler.DEFAULT_MAX_PER_CONTRACT,
+                max_concurrency=max_workers or scheduler.DEFAULT_MAX_CONCURRENCY
+            ) as fetch_scheduler:
+                results = batch.run_batch(configs, get_attendance_chart=get_attendance_chart, scheduler=fetch_scheduler)
+        else:
+            results = batch.run_batch(
+                configs,
+                max_workers=max_workers or batch.DEFAULT_MAX_WORKERS,
+                get_attendance_chart=get_attendance_chart
+            )
+    for result in results:
+        if output_format == "json":
+            print(json.dumps(result.to_dict(), ensure_ascii=False))
+        elif result.ok:
+            print(
+                f"{result.contract_id}/{result.auth_id}: "
+                f"overtime balance {result.overtime_balance}, "
+                f"{result.working_days} working days"
+            )
+        else:
+            print(f"{result.contract_id}/{result.auth_id}: error: {result.error}")
+
+
+def export_history(
+    directory: str,
+    file_format: str,
+    credentials_path: str | None,
+    first_month: date,
+    last_month: date,
+    max_workers: int | None,
+    cache: ChartCache | None,
+    archive: "SnapshotArchive | None" = None
+) -> None:
+    from recolul import batch, export, time
+    from recolul.recoru.cookie_store import CookieStore
+
+    configs = batch.read_credentials(credentials_path) if credentials_path else [_get_config()]
+    cookie_store = CookieStore()
+
+    def get_attendance_chart(config: Config) -> "AttendanceChart":
+        attendance_charts = batch.fetch_attendance_charts(
+            config,
+            first_month,
+            last_month,
+            cache=cache,
+            cookie_store=cookie_store,
+            archive=archive
+        )
+        return time.merge_until_today(attendance_charts, last_month)
+
+    with export.ExportWriter(directory, file_format) as writer:
+        errors = export.export_accounts(
+            configs,
+            writer,
+            get_attendance_chart,
+            max_workers=max_workers or batch.DEFAULT_MAX_WORKERS
+        )
+    for (contract_id, auth_id), error in errors.items():
+        print(f"{contract_id}/{auth_id}: error: {error}", file=sys.stderr)
+
+
+def serve(host: str | None, port: int | None, refresh_interval: float) -> None:
+    from recolul import profiling, server
+    from recolul.recoru.cookie_store import CookieStore
+    from recolul.recoru.recoru_session import RecoruSession
+
+    config = _get_config()
+    # Served on /metrics
+    profiling.enable()
+    with RecoruSession(
+        contract_id=config.recoru_contract_id,
+        auth_id=config.recoru_auth_id,
+        password=config.recoru_password,
+        cookie_store=CookieStore(),
+        base_url=config.recoru_base_url
+    ) as recoru_session:
+        recolul_server = server.RecoluServer(
+            recoru_session,
+            host=host or server.DEFAULT_HOST,
+            port=port or server.DEFAULT_PORT,
+            refresh_interval=refresh_interval
+        )
+        # Fail early on invalid login information
+        recolul_server.chart_store.get_attendance_chart(current_month())
+        print(f"Serving on {recolul_server.base_url}")
+        try:
+            recolul_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
 
 
 def main() -> None:
@@ -78,49 +330,441 @@ def main() -> None:
     parser.add_argument("-v", "--version", action="version", version=__version__)
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    balance_parser = subparsers.add_parser("balance", help="Calculate overtime balance")
+    cache_parser = argparse.ArgumentParser(add_help=False)
+    cache_group = cache_parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the attendance chart cache"
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Fetch the attendance chart even if it is cached"
+    )
+    cache_parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL,
+        help=(
+            "Number of seconds during which a chart fetched before the end of its month is cached "
+            f"(default: {DEFAULT_TTL})"
+        )
+    )
+    cache_parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Archive the fetched attendance charts, to recompute balances offline later"
+    )
+
+    offline_parser = argparse.ArgumentParser(add_help=False)
+    offline_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Compute from the latest archived attendance charts (see --archive) instead of fetching them"
+    )
+    offline_parser.add_argument(
+        "--as-of",
+        type=_parse_time,
+        help="Compute from the charts archived at or before this time (YYYY-MM-DD[THH:MM]). Implies --offline"
+    )
+
+    profile_parser = argparse.ArgumentParser(add_help=False)
+    profile_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent logging in, fetching, parsing and computing, to stderr"
+    )
+    profile_parser.add_argument(
+        "--profile-format",
+        choices=["text", "json", "prometheus"],
+        default="text",
+        help="Format of the --profile output"
+    )
+    profile_parser.add_argument(
+        "--profile-output",
+        help="Write the --profile output to a file instead of stderr"
+    )
+
+    balance_parser = subparsers.add_parser(
+        "balance",
+        parents=[cache_parser, offline_parser, profile_parser],
+        help="Calculate overtime balance"
+    )
     balance_parser.add_argument(
         "--exclude-last-day",
         action="store_true",
         help="Exclude last/current day from the calculation"
     )
+    _add_month_range_arguments(balance_parser)
 
-    subparsers.add_parser("when", help="Calculate at which time to leave to avoid overtime this month")
+    when_parser = subparsers.add_parser(
+        "when",
+        parents=[cache_parser, profile_parser],
+        help="Calculate at which time to leave to avoid overtime this month"
+    )
+    when_parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Plan the leave times of every remaining working day of the month, for each scenario"
+    )
+    when_parser.add_argument(
+        "--clock-in",
+        type=_parse_clock_time,
+        help="With --plan, clock-in time (HH:MM) of the coming days (default: 09:00)"
+    )
+    when_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep the leave time up to date until clocking out"
+    )
+    when_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_TTL,
+        help=f"With --watch, number of seconds between refetches of the attendance chart (default: {DEFAULT_TTL})"
+    )
 
     subparsers.add_parser("config", help="Init or update config")
 
-    graph_parser = subparsers.add_parser("graph", help="Display a graph of overtime balance over the month")
+    graph_parser = subparsers.add_parser(
+        "graph",
+        parents=[cache_parser, offline_parser, profile_parser],
+        help="Display a graph of overtime balance over the month"
+    )
     graph_parser.add_argument(
         "--exclude-last-day",
         action="store_true",
         help="Exclude last/current day from the graph"
     )
+    graph_parser.add_argument(
+        "--output",
+        help=(
+            "Write the graph to a .html, .png or .svg file instead of opening a browser. "
+            "With --credentials, folder of the graphs"
+        )
+    )
+    graph_parser.add_argument(
+        "--credentials",
+        help="CSV file of accounts (see batch), whose graphs are written in parallel to the --output folder"
+    )
+    graph_parser.add_argument(
+        "--format",
+        choices=["html", "png", "svg"],
+        default="html",
+        help="Format of the graphs written with --credentials. Images require kaleido"
+    )
+    graph_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of processes rendering graphs with --credentials (default: number of CPUs)"
+    )
+    _add_month_range_arguments(graph_parser)
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        parents=[cache_parser, profile_parser],
+        help="Calculate overtime balance of multiple accounts"
+    )
+    batch_parser.add_argument(
+        "credentials",
+        help="CSV file with contractId, authId and password columns"
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Maximum number of accounts fetched concurrently (default: 8), or of connections with --async (default: 100)"
+    )
+    batch_parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch all accounts from a single event loop (requires aiohttp)"
+    )
+    batch_parser.add_argument(
+        "--rate",
+        type=float,
+        help=(
+            "Start at most RATE account fetches per second, and lower the concurrency when RecoRu slows down or "
+            "fails. --workers is then the maximum concurrency"
+        )
+    )
+    batch_parser.add_argument(
+        "--max-per-contract",
+        type=int,
+        help="With --rate, maximum number of accounts of the same contract ID fetched concurrently (default: 4)"
+    )
+    batch_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (json outputs one JSON object per line)"
+    )
+
+    export_parser = subparsers.add_parser(
+        "export",
+        parents=[cache_parser, profile_parser],
+        help="Export the overtime history and the chart entries as Parquet or Arrow files"
+    )
+    export_parser.add_argument("directory", help="Output folder")
+    export_parser.add_argument(
+        "--format",
+        choices=["parquet", "arrow"],
+        default="parquet",
+        help="Parquet files, or Arrow IPC streams (requires pyarrow)"
+    )
+    export_parser.add_argument(
+        "--credentials",
+        help="CSV file of the accounts to export (see batch). Defaults to the configured account"
+    )
+    export_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Maximum number of accounts fetched concurrently (default: 8)"
+    )
+    _add_month_range_arguments(export_parser)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve the overtime balance as a JSON API")
+    serve_parser.add_argument("--host", help="Default: 127.0.0.1")
+    serve_parser.add_argument("--port", type=int, help="Default: 8000")
+    serve_parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=DEFAULT_TTL,
+        help=f"Number of seconds between fetches of the chart of the current month (default: {DEFAULT_TTL})"
+    )
 
     args = parser.parse_args(sys.argv[1:])
+    if args.command in ("balance", "graph", "export"):
+        args.last_month = args.last_month or current_month()
+        args.first_month = args.first_month or args.last_month
+        if args.last_month > current_month():
+            parser.error("--to can't be a future month")
+        if args.first_month > args.last_month:
+            parser.error("--from must be before --to")
+    if args.command == "when" and args.watch and args.plan:
+        parser.error("--watch can't be used with --plan")
+    if args.command == "batch" and args.use_async and args.rate:
+        parser.error("--rate can't be used with --async")
+    if args.command == "graph" and args.credentials and not args.output:
+        parser.error("--credentials requires an --output folder")
+    if args.command == "graph" and args.credentials and _get_snapshot_time(args):
+        parser.error("--offline can't be used with --credentials")
+
+    if getattr(args, "profile", False):
+        from recolul import profiling
+
+        profiler = profiling.enable()
+        try:
+            _run_command(args)
+        finally:
+            _write_profile(profiler.format(args.profile_format), args.profile_output)
+    else:
+        _run_command(args)
+
+
+def _run_command(args: argparse.Namespace) -> None:
     match args.command:
         case "balance":
-            balance(exclude_last_day=args.exclude_last_day)
+            balance(
+                exclude_last_day=args.exclude_last_day,
+                cache=_get_cache(args),
+                first_month=args.first_month,
+                last_month=args.last_month,
+                archive=_get_archive(args),
+                snapshot_time=_get_snapshot_time(args)
+            )
+        case "when" if args.watch:
+            watch_leave_time(
+                # Cached charts are reused until the next refetch
+                cache=None if args.no_cache else ChartCache(ttl=args.interval, refresh=args.refresh),
+                interval=args.interval,
+                archive=_get_archive(args)
+            )
+        case "when" if args.plan:
+            plan_leave_times(cache=_get_cache(args), clock_in=args.clock_in, archive=_get_archive(args))
         case "when":
-            when_to_leave()
+            when_to_leave(cache=_get_cache(args), archive=_get_archive(args))
         case "config":
             update_config()
+        case "graph" if args.credentials:
+            graph_batch(
+                args.credentials,
+                args.output,
+                output_format=args.format,
+                exclude_last_day=args.exclude_last_day,
+                cache=_get_cache(args),
+                first_month=args.first_month,
+                last_month=args.last_month,
+                max_workers=args.workers,
+                archive=_get_archive(args)
+            )
         case "graph":
-            graph(exclude_last_day=args.exclude_last_day)
+            graph(
+                exclude_last_day=args.exclude_last_day,
+                cache=_get_cache(args),
+                first_month=args.first_month,
+                last_month=args.last_month,
+                output=args.output,
+                archive=_get_archive(args),
+                snapshot_time=_get_snapshot_time(args)
+            )
+        case "batch":
+            run_batch(
+                args.credentials,
+                max_workers=args.workers,
+                output_format=args.format,
+                cache=_get_cache(args),
+                use_async=args.use_async,
+                archive=_get_archive(args),
+                rate=args.rate,
+                max_per_contract=args.max_per_contract
+            )
+        case "export":
+            export_history(
+                args.directory,
+                file_format=args.format,
+                credentials_path=args.credentials,
+                first_month=args.first_month,
+                last_month=args.last_month,
+                max_workers=args.workers,
+                cache=_get_cache(args),
+                archive=_get_archive(args)
+            )
+        case "serve":
+            serve(host=args.host, port=args.port, refresh_interval=args.refresh_interval)
+
+
+def _write_profile(profile: str, path: str | None) -> None:
+    if path:
+        with open(path, "wt", encoding="UTF-8") as profile_file:
+            profile_file.write(profile)
+    else:
+        print(profile, file=sys.stderr)
+
+
+def _add_month_range_arguments(subparser: argparse.ArgumentParser) -> None:
+    subparser.add_argument(
+        "--from",
+        dest="first_month",
+        type=_parse_month,
+        help="First month (YYYY-MM) of the period. Defaults to the last month of the period"
+    )
+    subparser.add_argument(
+        "--to",
+        dest="last_month",
+        type=_parse_month,
+        help="Last month (YYYY-MM) of the period. Defaults to the current month"
+    )
+
+
+def _parse_month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid month '{value}', expected YYYY-MM")
+
+
+def _parse_clock_time(value: str) -> str:
+    try:
+        datetime.strptime(value, "%H:%M")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid time '{value}', expected HH:MM")
+    return value
+
+
+def _parse_time(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid time '{value}', expected YYYY-MM-DD[THH:MM]")
+
+
+def _get_cache(args: argparse.Namespace) -> ChartCache | None:
+    if args.no_cache:
+        return None
+    return ChartCache(ttl=args.cache_ttl, refresh=args.refresh)
+
+
+def _get_archive(args: argparse.Namespace) -> "SnapshotArchive | None":
+    if not args.archive and not _get_snapshot_time(args):
+        return None
+    from recolul.recoru.snapshot_archive import SnapshotArchive
 
+    return SnapshotArchive()
 
-def _get_attendance_chart() -> AttendanceChart:
+
+def _get_snapshot_time(args: argparse.Namespace) -> datetime | None:
+    """Time of the archived charts to compute from, or None to fetch the charts"""
+    if getattr(args, "as_of", None):
+        return args.as_of
+    return datetime.now() if getattr(args, "offline", False) else None
+
+
+def _get_config() -> Config:
     config = Config.from_env() or Config.load()
     if not config:
         raise RuntimeError(f"No config found")
+    return config
 
-    with RecoruSession(
-        contract_id=config.recoru_contract_id,
-        auth_id=config.recoru_auth_id,
-        password=config.recoru_password
-    ) as recoru_session:
-        attendance_chart = recoru_session.get_attendance_chart()
 
-    return attendance_chart
+def _get_attendance_chart(cache: ChartCache | None, archive: "SnapshotArchive | None" = None) -> "AttendanceChart":
+    from recolul.recoru.attendance_chart import parse_attendance_chart
+
+    config = _get_config()
+    # Only import the HTTP stack when the chart needs to be fetched
+    if cache and (text := cache.get(config.recoru_contract_id, config.recoru_auth_id, current_month())) is not None:
+        return parse_attendance_chart(text)
+
+    from recolul import batch
+    from recolul.recoru.cookie_store import CookieStore
+
+    return batch.fetch_attendance_chart(config, cache=cache, cookie_store=CookieStore(), archive=archive)
+
+
+def _get_attendance_charts(
+    cache: ChartCache | None,
+    first_month: date,
+    last_month: date,
+    archive: "SnapshotArchive | None" = None,
+    snapshot_time: datetime | None = None
+) -> list["AttendanceChart"]:
+    config = _get_config()
+    if snapshot_time:
+        return _read_archived_attendance_charts(config, archive, first_month, last_month, snapshot_time)
+
+    from recolul import batch
+    from recolul.recoru.cookie_store import CookieStore
+
+    return batch.fetch_attendance_charts(
+        config,
+        first_month,
+        last_month,
+        cache=cache,
+        cookie_store=CookieStore(),
+        archive=archive
+    )
+
+
+def _read_archived_attendance_charts(
+    config: Config,
+    archive: "SnapshotArchive",
+    first_month: date,
+    last_month: date,
+    snapshot_time: datetime
+) -> list["AttendanceChart"]:
+    from recolul.recoru.months import get_month_range
+    from recolul.recoru.recoru_session import RecoruSession
+
+    attendance_charts = []
+    for month in get_month_range(first_month, last_month):
+        snapshot = archive.find(config.recoru_contract_id, config.recoru_auth_id, month, as_of=snapshot_time)
+        if snapshot is None:
+            raise RuntimeError(
+                f"No chart of {month:%Y-%m} archived before {snapshot_time:%Y-%m-%d %H:%M}. Fetch it with --archive"
+            )
+        attendance_charts.append(RecoruSession.read_attendance_chart_snapshot(archive, snapshot))
+    return attendance_charts
 
 
 if __name__ == "__main__":
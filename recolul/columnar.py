@@ -0,0 +1,170 @@
+"""
+Columnar form of attendance charts, for computing the overtime of many charts at once.
+Requires numpy (pip install recolul[fast]).
+"""
+import dataclasses
+from collections.abc import Sequence
+
+import numpy as np
+
+from recolul.duration import Duration, parse_minutes
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.time import DEFAULT_WORKPLACE, MIN_HOURS_FOR_MANDATORY_BREAK, get_leave_work_time, get_required_time
+
+_MISSING = -1
+
+
+@dataclasses.dataclass(frozen=True)
+class ColumnarChart:
+    """
+    Row-level arrays are indexed by row, entry-level arrays by entry.
+    Times are in minutes, missing clock-in/clock-out times are -1.
+    """
+    days: list[str]
+    required_minutes: np.ndarray
+    row_owners: np.ndarray  # Index of the chart each row comes from, when stacked
+    entry_rows: np.ndarray
+    clock_in_minutes: np.ndarray
+    clock_out_minutes: np.ndarray
+    workplace_codes: np.ndarray
+    workplaces: list[str]
+    category_codes: np.ndarray
+    categories: list[str]
+    chart_count: int  # Including charts without rows
+
+    @classmethod
+    def from_chart(cls, attendance_chart: AttendanceChart) -> "ColumnarChart":
+        workplace_indices: dict[str, int] = {}
+        category_indices: dict[str, int] = {}
+        required_minutes, entry_rows, clock_in_minutes, clock_out_minutes = [], [], [], []
+        workplace_codes, category_codes = [], []
+        for row_index, row in enumerate(attendance_chart):
+            required_minutes.append(get_required_time(row).minutes)
+            for entry in row.entries:
+                entry_rows.append(row_index)
+                clock_in_minutes.append(parse_minutes(entry.clock_in_time) if entry.clock_in_time else _MISSING)
+                clock_out_minutes.append(parse_minutes(entry.clock_out_time) if entry.clock_out_time else _MISSING)
+                workplace = entry.workplace or DEFAULT_WORKPLACE
+                workplace_codes.append(workplace_indices.setdefault(workplace, len(workplace_indices)))
+                category_codes.append(category_indices.setdefault(entry.category, len(category_indices)))
+
+        return cls(
+            days=[row.day.text for row in attendance_chart],
+            required_minutes=np.array(required_minutes, dtype=np.int32),
+            row_owners=np.zeros(len(attendance_chart), dtype=np.int32),
+            entry_rows=np.array(entry_rows, dtype=np.int32),
+            clock_in_minutes=np.array(clock_in_minutes, dtype=np.int32),
+            clock_out_minutes=np.array(clock_out_minutes, dtype=np.int32),
+            workplace_codes=np.array(workplace_codes, dtype=np.int32),
+            workplaces=list(workplace_indices),
+            category_codes=np.array(category_codes, dtype=np.int32),
+            categories=list(category_indices),
+            chart_count=1
+        )
+
+    @classmethod
+    def stack(cls, charts: Sequence["ColumnarChart"]) -> "ColumnarChart":
+        """Concatenate single charts into one, keeping track of which chart each row comes from"""
+        workplace_indices: dict[str, int] = {}
+        category_indices: dict[str, int] = {}
+        row_offsets = np.cumsum([0] + [len(chart.days) for chart in charts])
+        workplace_codes, category_codes = [], []
+        for chart in charts:
+            workplace_mapping = np.array(
+                [workplace_indices.setdefault(workplace, len(workplace_indices)) for workplace in chart.workplaces],
+                dtype=np.int32
+            )
+            category_mapping = np.array(
+                [category_indices.setdefault(category, len(category_indices)) for category in chart.categories],
+                dtype=np.int32
+            )
+            workplace_codes.append(workplace_mapping[chart.workplace_codes])
+            category_codes.append(category_mapping[chart.category_codes])
+
+        return cls(
+            days=[day for chart in charts for day in chart.days],
+            required_minutes=_concatenate([chart.required_minutes for chart in charts]),
+            row_owners=_concatenate([np.full(len(chart.days), i, dtype=np.int32) for i, chart in enumerate(charts)]),
+            entry_rows=_concatenate([chart.entry_rows + offset for chart, offset in zip(charts, row_offsets)]),
+            clock_in_minutes=_concatenate([chart.clock_in_minutes for chart in charts]),
+            clock_out_minutes=_concatenate([chart.clock_out_minutes for chart in charts]),
+            workplace_codes=_concatenate(workplace_codes),
+            workplaces=list(workplace_indices),
+            category_codes=_concatenate(category_codes),
+            categories=list(category_indices),
+            chart_count=len(charts)
+        )
+
+    def get_entry_work_minutes(self, now: Duration | None = None) -> np.ndarray:
+        """Vectorized time.get_entry_work_time. Entries in progress are counted until `now`."""
+        now_minutes = (now or Duration.now()).minutes
+        leave_minutes = np.array(
+            [
+                leave_work_time.minutes if (leave_work_time := get_leave_work_time(category)) is not None
+                else _MISSING
+                for category in self.categories
+            ],
+            dtype=np.int32
+        )[self.category_codes]
+
+        clock_in = self.clock_in_minutes
+        clock_out = np.where(self.clock_out_minutes == _MISSING, now_minutes, self.clock_out_minutes)
+        # After midnight
+        clock_out = np.where(clock_out < clock_in, clock_out + 24 * 60, clock_out)
+        work_minutes = clock_out - clock_in
+        work_minutes -= np.where(work_minutes >= MIN_HOURS_FOR_MANDATORY_BREAK.minutes, 60, 0)
+        work_minutes = np.where(clock_in == _MISSING, 0, work_minutes)
+        return np.where(leave_minutes != _MISSING, leave_minutes, work_minutes)
+
+    def get_row_work_minutes(self, entry_work_minutes: np.ndarray) -> np.ndarray:
+        return _sum_by(self.entry_rows, entry_work_minutes, len(self.days))
+
+
+def get_overtime_history(
+    chart: ColumnarChart,
+    now: Duration | None = None
+) -> tuple[list[str], np.ndarray, dict[str, Duration]]:
+    """Vectorized time.get_overtime_history. The history is an array of minutes."""
+    entry_work_minutes = chart.get_entry_work_minutes(now)
+    row_work_minutes = chart.get_row_work_minutes(entry_work_minutes)
+    # Can have work time during holidays
+    counted_rows = np.flatnonzero((chart.required_minutes > 0) | (row_work_minutes > 0))
+    days = [chart.days[i] for i in counted_rows]
+    overtime_history = row_work_minutes[counted_rows] - chart.required_minutes[counted_rows]
+    return days, overtime_history, _get_total_workplace_times(chart, entry_work_minutes)
+
+
+def get_overtime_balance(chart: ColumnarChart, now: Duration | None = None) -> tuple[Duration, dict[str, Duration]]:
+    _, overtime_history, total_workplace_times = get_overtime_history(chart, now)
+    return Duration(int(overtime_history.sum())), total_workplace_times
+
+
+def get_overtime_balances(chart: ColumnarChart, now: Duration | None = None) -> np.ndarray:
+    """Overtime balance in minutes of each chart of a stacked chart"""
+    row_work_minutes = chart.get_row_work_minutes(chart.get_entry_work_minutes(now))
+    row_overtime_minutes = np.where(
+        (chart.required_minutes > 0) | (row_work_minutes > 0),
+        row_work_minutes - chart.required_minutes,
+        0
+    )
+    return _sum_by(chart.row_owners, row_overtime_minutes, chart.chart_count)
+
+
+def get_total_workplace_times(chart: ColumnarChart, now: Duration | None = None) -> dict[str, Duration]:
+    return _get_total_workplace_times(chart, chart.get_entry_work_minutes(now))
+
+
+def _get_total_workplace_times(chart: ColumnarChart, entry_work_minutes: np.ndarray) -> dict[str, Duration]:
+    totals = _sum_by(chart.workplace_codes, entry_work_minutes, len(chart.workplaces))
+    return {
+        workplace: Duration(int(total))
+        for workplace, total in zip(chart.workplaces, totals)
+    }
+
+
+def _sum_by(indices: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(indices, weights=values, minlength=size).astype(np.int64)
+
+
+def _concatenate(arrays: list[np.ndarray]) -> np.ndarray:
+    return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int32)
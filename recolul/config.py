@@ -3,6 +3,11 @@ import os.path
 from dataclasses import dataclass
 
 DEFAULT_CONFIG_PATH = os.path.realpath(f"{__file__}/../config.ini")
+DEFAULT_RECORU_BASE_URL = "https://app.recoru.in"
+DEFAULT_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "recolul"
+)
 
 
 @dataclass
@@ -10,6 +15,7 @@ class Config:
     recoru_contract_id: str
     recoru_auth_id: str
     recoru_password: str
+    recoru_base_url: str = DEFAULT_RECORU_BASE_URL
 
     @classmethod
     def from_env(cls):
@@ -17,7 +23,8 @@ class Config:
             return cls(
                 recoru_contract_id=os.environ["RECORU_CONTRACT_ID"],
                 recoru_auth_id=os.getenv("RECORU_AUTH_ID"),
-                recoru_password=os.environ["RECORU_PASSWORD"]
+                recoru_password=os.environ["RECORU_PASSWORD"],
+                recoru_base_url=os.getenv("RECORU_BASE_URL", DEFAULT_RECORU_BASE_URL)
             )
         except KeyError:
             return None
@@ -32,7 +39,8 @@ class Config:
         return cls(
             recoru_contract_id=config["recoru"]["contractId"],
             recoru_auth_id=config["recoru"]["authId"],
-            recoru_password=config["recoru"]["password"]
+            recoru_password=config["recoru"]["password"],
+            recoru_base_url=config["recoru"].get("baseUrl", DEFAULT_RECORU_BASE_URL)
         )
 
     def save(self, path: str = DEFAULT_CONFIG_PATH):
@@ -42,5 +50,7 @@ class Config:
             "contractId": self.recoru_contract_id,
             "password": self.recoru_password
         }
+        if self.recoru_base_url != DEFAULT_RECORU_BASE_URL:
+            config["recoru"]["baseUrl"] = self.recoru_base_url
         with open(path, "w") as config_file:
             config.write(config_file)
@@ -1,18 +1,32 @@
+from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def parse_minutes(duration: str) -> int:
+    """Number of minutes of an "HH:MM" string. Charts repeat the same few values, hence the cache."""
+    if duration == "":
+        return 0
+    hours, minutes = duration.split(":")
+    return 60 * int(hours) + int(minutes)
 
 
 class Duration:
+    __slots__ = ("minutes",)
+
     @classmethod
     def parse(cls, duration: str):
-        if duration == "":
-            return cls(0)
-        hours, minutes = duration.split(":")
-        total_minutes = 60 * int(hours) + int(minutes)
-        return cls(total_minutes)
+        return cls(parse_minutes(duration))
+
+    @classmethod
+    def parse_many(cls, durations: Iterable[str]) -> list["Duration"]:
+        return [cls(parse_minutes(duration)) for duration in durations]
 
     @classmethod
     def now(cls):
-        return cls.parse(datetime.now().strftime("%H:%M"))
+        now = datetime.now()
+        return cls(60 * now.hour + now.minute)
 
     def __init__(self, minutes: int = 0):
         self.minutes: int = minutes
@@ -22,10 +36,13 @@ class Duration:
 
     __str__ = __repr__
 
+    def __hash__(self):
+        return hash(self.minutes)
+
     def __eq__(self, other):
         return self.minutes == other.minutes
 
-    def __neq__(self, other):
+    def __ne__(self, other):
         return self.minutes != other.minutes
 
     def __add__(self, other):
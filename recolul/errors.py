@@ -4,5 +4,11 @@ class InvalidRecoruLoginError(Exception):
         super().__init__("Invalid RecoRu login information. Run recolul config")
 
 
+class UnexpectedRecoruPageError(Exception):
+    """RecoRu returned another page than the attendance chart, e.g. a maintenance page"""
+    def __init__(self):
+        super().__init__("RecoRu did not return the attendance chart, try again later")
+
+
 class NoClockInError(Exception):
     """A clock-in time was expected but wasn't found"""
@@ -0,0 +1,163 @@
+"""
+Export of overtime histories as Parquet files or Arrow IPC streams, for analytics.
+Requires pyarrow (pip install recolul[export]).
+
+Two tables are written:
+- overtime: one row per account and counted day (the output of time.get_overtime_history)
+- entries: one row per account and chart entry, with its workplace, category and work minutes
+
+Rows are written in batches of `batch_size`, so memory doesn't grow with the size of the export.
+"""
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from recolul import time
+from recolul.batch import DEFAULT_MAX_WORKERS
+from recolul.config import Config
+from recolul.recoru.attendance_chart import AttendanceChart
+
+DEFAULT_BATCH_SIZE = 65_536
+# Format -> file extension. Arrow IPC streams, unlike files, allow each batch to have its own dictionaries.
+FORMATS = {
+    "parquet": "parquet",
+    "arrow": "arrows"
+}
+
+_STRING_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+OVERTIME_SCHEMA = pa.schema([
+    ("contract_id", _STRING_DICTIONARY),
+    ("auth_id", _STRING_DICTIONARY),
+    ("date", pa.date32()),
+    ("day", pa.string()),
+    ("overtime_minutes", pa.int32())
+])
+ENTRIES_SCHEMA = pa.schema([
+    ("contract_id", _STRING_DICTIONARY),
+    ("auth_id", _STRING_DICTIONARY),
+    ("date", pa.date32()),
+    ("entry_index", pa.int8()),
+    ("workplace", _STRING_DICTIONARY),
+    ("category", _STRING_DICTIONARY),
+    ("clock_in_time", pa.string()),
+    ("clock_out_time", pa.string()),
+    ("work_minutes", pa.int32())
+])
+
+
+class ExportWriter:
+    """Write the overtime and entries tables of many accounts to `directory`"""
+    def __init__(self, directory: str, file_format: str = "parquet", batch_size: int = DEFAULT_BATCH_SIZE):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown export format '{file_format}'. Choose from {', '.join(FORMATS)}")
+        os.makedirs(directory, exist_ok=True)
+        extension = FORMATS[file_format]
+        self._overtime = _TableWriter(os.path.join(directory, f"overtime.{extension}"), OVERTIME_SCHEMA, batch_size)
+        self._entries = _TableWriter(os.path.join(directory, f"entries.{extension}"), ENTRIES_SCHEMA, batch_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write_chart(self, contract_id: str, auth_id: str, attendance_chart: AttendanceChart) -> None:
+        for row in attendance_chart:
+            row_result = time.evaluate_row(row)
+            if row_result.overtime_minutes is not None:
+                self._overtime.append((contract_id, auth_id, row.date, row.day.text, row_result.overtime_minutes))
+            for entry_index, (entry, (workplace, work_minutes)) in enumerate(
+                zip(row.entries, row_result.workplace_minutes)
+            ):
+                self._entries.append((
+                    contract_id,
+                    auth_id,
+                    row.date,
+                    entry_index,
+                    workplace,
+                    entry.category,
+                    entry.clock_in_time,
+                    entry.clock_out_time,
+                    work_minutes
+                ))
+
+    def close(self) -> None:
+        self._overtime.close()
+        self._entries.close()
+
+
+def export_accounts(
+    configs: Sequence[Config],
+    writer: ExportWriter,
+    get_attendance_chart: Callable[[Config], AttendanceChart],
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> dict[tuple[str, str], str]:
+    """
+    Fetch the charts of all accounts concurrently and write them in the order of the configs.
+    Return the errors of the accounts that couldn't be exported, by contract ID and auth ID.
+    """
+    def fetch(config: Config) -> AttendanceChart | Exception:
+        try:
+            return get_attendance_chart(config)
+        except Exception as error:
+            return error
+
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for config, attendance_chart in zip(configs, _bounded_map(executor, fetch, configs, max_workers * 2)):
+            if isinstance(attendance_chart, Exception):
+                errors[config.recoru_contract_id, config.recoru_auth_id] = (
+                    f"{type(attendance_chart).__name__}: {attendance_chart}"
+                )
+            else:
+                writer.write_chart(config.recoru_contract_id, config.recoru_auth_id, attendance_chart)
+    return errors
+
+
+def _bounded_map(executor: ThreadPoolExecutor, function: Callable, items: Iterable, max_pending: int) -> Iterable:
+    """Same as executor.map, with at most max_pending results waiting to be consumed"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    for future in pending:
+        yield future.result()
+
+
+class _TableWriter:
+    def __init__(self, path: str, schema: pa.Schema, batch_size: int):
+        self._schema = schema
+        self._batch_size = batch_size
+        self._columns: list[list] = [[] for _ in schema.names]
+        self._row_count = 0
+        if path.endswith(".parquet"):
+            self._writer = pq.ParquetWriter(path, schema)
+        else:
+            self._writer = pa.ipc.new_stream(path, schema)
+
+    def append(self, row: tuple) -> None:
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self._row_count += 1
+        if self._row_count >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._row_count:
+            return
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(self._columns, self._schema)],
+            schema=self._schema
+        )
+        self._writer.write_batch(batch)
+        self._columns = [[] for _ in self._schema.names]
+        self._row_count = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
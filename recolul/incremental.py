@@ -0,0 +1,113 @@
+from recolul.duration import Duration
+from recolul.recoru.attendance_chart import AttendanceChart, ChartRow
+from recolul.time import LeaveTime, RowResult, evaluate_row, get_leave_time_from_balance, is_row_in_progress
+
+
+class OvertimeEngine:
+    """
+    Same computations as recolul.time, for charts that are evaluated repeatedly,
+    e.g. on every refresh of the GUI.
+
+    Results of complete rows are memoized by content, and cumulative sums are kept for the
+    last evaluated chart, so that only the rows in progress are evaluated again on each call.
+    """
+    def __init__(self, max_rows: int = 10_000):
+        self._max_rows = max_rows
+        self._row_results: dict[ChartRow, RowResult] = {}
+        self.hits = 0
+        self.misses = 0
+
+        # Last evaluated chart
+        self._rows: list[ChartRow] = []
+        self._results: list[RowResult | None] = []  # None for rows in progress
+        self._live_indices: list[int] = []
+        self._cumulative_overtime: list[int] = [0]
+        self._cumulative_workplace_minutes: list[dict[str, int]] = [{}]
+
+    def evaluate_row(self, row: ChartRow) -> RowResult:
+        if is_row_in_progress(row):
+            return evaluate_row(row)
+
+        if (row_result := self._row_results.get(row)) is not None:
+            self.hits += 1
+            return row_result
+
+        self.misses += 1
+        if len(self._row_results) >= self._max_rows:
+            self._row_results.clear()
+        row_result = self._row_results[row] = evaluate_row(row)
+        return row_result
+
+    def get_overtime_history(
+        self,
+        attendance_chart: AttendanceChart
+    ) -> tuple[list[str], list[Duration], dict[str, Duration]]:
+        self._update(attendance_chart)
+        days = []
+        overtime_history = []
+        for row, row_result in zip(attendance_chart, self._results):
+            row_result = row_result or evaluate_row(row)
+            if row_result.overtime_minutes is not None:
+                days.append(row.day.text)
+                overtime_history.append(Duration(row_result.overtime_minutes))
+        _, total_workplace_times = self.get_overtime_balance(attendance_chart)
+        return days, overtime_history, total_workplace_times
+
+    def get_overtime_balance(self, attendance_chart: AttendanceChart) -> tuple[Duration, dict[str, Duration]]:
+        self._update(attendance_chart)
+        row_count = len(attendance_chart)
+        overtime_minutes = self._cumulative_overtime[row_count]
+        total_workplace_minutes = dict(self._cumulative_workplace_minutes[row_count])
+        for i in self._live_indices:
+            if i >= row_count:
+                break
+            row_result = evaluate_row(self._rows[i])
+            overtime_minutes += row_result.overtime_minutes or 0
+            for workplace, entry_work_minutes in row_result.workplace_minutes:
+                total_workplace_minutes[workplace] = total_workplace_minutes.get(workplace, 0) + entry_work_minutes
+        return (
+            Duration(overtime_minutes),
+            {workplace: Duration(minutes) for workplace, minutes in total_workplace_minutes.items()}
+        )
+
+    def get_leave_time(self, attendance_chart: AttendanceChart) -> list[LeaveTime]:
+        overtime_balance, _ = self.get_overtime_balance(attendance_chart[:-1])
+        return get_leave_time_from_balance(overtime_balance, attendance_chart[-1])
+
+    def _update(self, attendance_chart: AttendanceChart) -> None:
+        """Make the evaluated rows start with the rows of the given chart"""
+        common_length = min(len(attendance_chart), len(self._rows))
+        # Fast comparison when rows are the same objects, falls back on content otherwise
+        if attendance_chart[:common_length] != self._rows[:common_length]:
+            first_difference = next(
+                i for i in range(common_length)
+                if attendance_chart[i] != self._rows[i]
+            )
+            self._truncate(first_difference)
+        for row in attendance_chart[len(self._rows):]:
+            self._append(row)
+
+    def _truncate(self, length: int) -> None:
+        del self._rows[length:]
+        del self._results[length:]
+        del self._cumulative_overtime[length + 1:]
+        del self._cumulative_workplace_minutes[length + 1:]
+        self._live_indices = [i for i in self._live_indices if i < length]
+
+    def _append(self, row: ChartRow) -> None:
+        self._rows.append(row)
+        cumulative_workplace_minutes = self._cumulative_workplace_minutes[-1]
+        if is_row_in_progress(row):
+            self._live_indices.append(len(self._results))
+            self._results.append(None)
+            self._cumulative_overtime.append(self._cumulative_overtime[-1])
+        else:
+            row_result = self.evaluate_row(row)
+            self._results.append(row_result)
+            self._cumulative_overtime.append(self._cumulative_overtime[-1] + (row_result.overtime_minutes or 0))
+            cumulative_workplace_minutes = dict(cumulative_workplace_minutes)
+            for workplace, entry_work_minutes in row_result.workplace_minutes:
+                cumulative_workplace_minutes[workplace] = (
+                    cumulative_workplace_minutes.get(workplace, 0) + entry_work_minutes
+                )
+        self._cumulative_workplace_minutes.append(cumulative_workplace_minutes)
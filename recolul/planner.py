@@ -0,0 +1,148 @@
+"""
+Leave times of every remaining working day of the month, so that the month ends with a zero overtime balance.
+"""
+import dataclasses
+import enum
+from datetime import date
+
+from recolul import profiling
+from recolul.duration import Duration, parse_minutes
+from recolul.recoru.attendance_chart import AttendanceChart, ChartRow
+from recolul.time import MIN_HOURS_FOR_MANDATORY_BREAK, get_entry_work_time, get_required_time
+
+DEFAULT_CLOCK_IN = Duration(9 * 60)
+DEFAULT_MAX_WORK_TIME = Duration(10 * 60)
+
+
+class Scenario(enum.Enum):
+    EVEN = "even"
+    """The overtime balance is spread evenly over the remaining days"""
+    FRONT_LOADED = "front"
+    """The overtime balance is made up as soon as possible"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PlannedDay:
+    row: ChartRow
+    clock_in: Duration
+    work_time: Duration
+    """Work time counted for the day, not including the break"""
+    leave_time: Duration
+    includes_break: bool
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class LeavePlan:
+    scenario: Scenario
+    overtime_balance: Duration
+    """Balance before the planned days"""
+    days: list[PlannedDay]
+    final_balance: Duration
+    """Balance at the end of the month, not zero when max_work_time is too short to make up for the balance"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _RemainingDay:
+    row: ChartRow
+    clock_in_minutes: int
+    base_minutes: int  # Work minutes still required without overtime, leaves already deducted
+
+
+@profiling.timed("planner.get_leave_plans")
+def get_leave_plans(
+    full_attendance_chart: AttendanceChart,
+    scenarios: list[Scenario] | None = None,
+    clock_in: Duration = DEFAULT_CLOCK_IN,
+    max_work_time: Duration = DEFAULT_MAX_WORK_TIME,
+    today: date | None = None
+) -> list[LeavePlan]:
+    """
+    Plan the rest of the month under each scenario (all of them by default).
+    Today is planned from its clock-in if it is in progress, and future days from `clock_in`.
+    Days are planned in a single pass over the chart, then a single pass over the remaining days per scenario.
+    """
+    overtime_balance, remaining_days = _split_chart(full_attendance_chart, clock_in.minutes, today or date.today())
+    return [
+        _plan(scenario, overtime_balance, remaining_days, max_work_time.minutes)
+        for scenario in scenarios or list(Scenario)
+    ]
+
+
+def get_leave_plan(full_attendance_chart: AttendanceChart, scenario: Scenario = Scenario.EVEN, **kwargs) -> LeavePlan:
+    return get_leave_plans(full_attendance_chart, [scenario], **kwargs)[0]
+
+
+def _split_chart(
+    full_attendance_chart: AttendanceChart,
+    default_clock_in_minutes: int,
+    today: date
+) -> tuple[int, list[_RemainingDay]]:
+    """Overtime balance in minutes of the days that are over, and the days to plan"""
+    overtime_balance = 0
+    remaining_days = []
+    for row in full_attendance_chart:
+        required_minutes = get_required_time(row).minutes
+        is_past = row.date < today if row.date else row.day_of_month < today.day
+        is_today = row.date == today if row.date else row.day_of_month == today.day
+
+        clock_in_minutes = None
+        row_work_minutes = 0
+        for entry in row.entries:
+            if is_today and entry.clock_in_time and not entry.clock_out_time:
+                # In progress: planned from its clock-in instead of counted until now
+                clock_in_minutes = parse_minutes(entry.clock_in_time)
+            else:
+                # Only leaves count for future days
+                row_work_minutes += get_entry_work_time(entry).minutes
+
+        clocked_out_today = is_today and clock_in_minutes is None and any(entry.clock_out_time for entry in row.entries)
+        if is_past or clocked_out_today:
+            if required_minutes > 0 or row_work_minutes > 0:
+                overtime_balance += row_work_minutes - required_minutes
+            continue
+
+        if clock_in_minutes is None and required_minutes <= row_work_minutes:
+            # Nothing to plan: not a working day, or a full day of leave
+            overtime_balance += row_work_minutes - required_minutes
+            continue
+        remaining_days.append(_RemainingDay(
+            row=row,
+            clock_in_minutes=default_clock_in_minutes if clock_in_minutes is None else clock_in_minutes,
+            base_minutes=required_minutes - row_work_minutes
+        ))
+    return overtime_balance, remaining_days
+
+
+def _plan(
+    scenario: Scenario,
+    overtime_balance: int,
+    remaining_days: list[_RemainingDay],
+    max_work_minutes: int
+) -> LeavePlan:
+    # Minutes to add to the base work time of the remaining days, negative when ahead
+    to_make_up = -overtime_balance
+    planned_days = []
+    for index, remaining_day in enumerate(remaining_days):
+        if scenario is Scenario.EVEN:
+            # Ceiling, so that the balance is made up early rather than left to the last day
+            share = -(-to_make_up // (len(remaining_days) - index))
+        else:
+            share = to_make_up
+        work_minutes = min(max(remaining_day.base_minutes + share, 0), max_work_minutes)
+        to_make_up -= work_minutes - remaining_day.base_minutes
+
+        # A break is deducted from the time at work once it reaches 6 hours
+        includes_break = work_minutes >= MIN_HOURS_FOR_MANDATORY_BREAK.minutes
+        planned_days.append(PlannedDay(
+            row=remaining_day.row,
+            clock_in=Duration(remaining_day.clock_in_minutes),
+            work_time=Duration(work_minutes),
+            leave_time=Duration(remaining_day.clock_in_minutes + work_minutes + (60 if includes_break else 0)),
+            includes_break=includes_break
+        ))
+    return LeavePlan(
+        scenario=scenario,
+        overtime_balance=Duration(overtime_balance),
+        days=planned_days,
+        final_balance=Duration(-to_make_up)
+    )
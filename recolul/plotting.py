@@ -1,27 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
 import plotly.graph_objects as go
 
 from recolul.duration import Duration
 
+# Formats of write_overtime_balance_history. Images require kaleido (pip install recolul[images]).
+OUTPUT_FORMATS = ["html", "png", "svg"]
 
-def plot_overtime_balance_history(days: list[str], overtime_history: list[Duration]) -> None:
-    cumulative_overtime_history = []
-    for overtime in overtime_history:
-        last_cumulative_overtime = (
-            cumulative_overtime_history[-1] if cumulative_overtime_history
-            else Duration()
-        )
-        cumulative_overtime_history.append(last_cumulative_overtime + overtime)
 
+def get_overtime_balance_figure(days: list[str], overtime_history: list[Duration], title: str | None = None) -> go.Figure:
+    cumulative_overtime_history = list(accumulate(overtime.minutes for overtime in overtime_history))
     fig = go.Figure(
             data=go.Scatter(
                 x=days,
-                y=[duration.minutes for duration in cumulative_overtime_history],
-                text=[str(duration) for duration in cumulative_overtime_history],
+                y=cumulative_overtime_history,
+                text=[str(Duration(minutes)) for minutes in cumulative_overtime_history],
                 hovertemplate="%{x} %{text}<extra></extra>",
                 mode="lines+markers"
             )
     )
     fig.update_layout(
+        title=title,
         yaxis_title="Overtime balance (minutes)"
     )
-    fig.show()
+    return fig
+
+
+def plot_overtime_balance_history(days: list[str], overtime_history: list[Duration]) -> None:
+    get_overtime_balance_figure(days, overtime_history).show()
+
+
+def write_overtime_balance_history(
+    days: list[str],
+    overtime_history: list[Duration],
+    path: str,
+    title: str | None = None
+) -> None:
+    """
+    Write the graph to an HTML, PNG or SVG file, depending on the extension of path.
+    HTML files load plotly.min.js from their folder, where it is written once, so that they work offline
+    and the bundle isn't repeated in every file.
+    """
+    output_format = os.path.splitext(path)[1].removeprefix(".").lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown graph format '{output_format}'. Choose from {', '.join(OUTPUT_FORMATS)}")
+
+    fig = get_overtime_balance_figure(days, overtime_history, title)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if output_format == "html":
+        fig.write_html(path, include_plotlyjs="directory")
+    else:
+        fig.write_image(path, format=output_format)
+
+
+def write_overtime_balance_histories(
+    histories: list[tuple[str, list[str], list[Duration], str | None]],
+    max_workers: int | None = None
+) -> None:
+    """
+    Write many graphs in parallel processes, given (path, days, overtime history, title) tuples.
+    Figures are serialized with the GIL held, hence processes instead of threads.
+    """
+    if not histories:
+        return
+    # Write the shared Plotly bundle before the workers, so that they don't all write it at once
+    for directory in {
+        os.path.dirname(os.path.abspath(path)) for path, *_ in histories
+        if path.lower().endswith(".html")
+    }:
+        _write_plotly_bundle(directory)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(_write_overtime_balance_history, histories, chunksize=8):
+            pass
+
+
+def _write_overtime_balance_history(history: tuple[str, list[str], list[Duration], str | None]) -> None:
+    path, days, overtime_history, title = history
+    write_overtime_balance_history(days, overtime_history, path, title)
+
+
+def _write_plotly_bundle(directory: str) -> None:
+    from plotly.offline import get_plotlyjs
+
+    bundle_path = os.path.join(directory, "plotly.min.js")
+    if not os.path.exists(bundle_path):
+        with open(bundle_path, "wt", encoding="UTF-8") as bundle_file:
+            bundle_file.write(get_plotlyjs())
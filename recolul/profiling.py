@@ -0,0 +1,155 @@
+"""
+Wall time spent in each phase (login, fetch, parse, computations), enabled with `recolul --profile`.
+When profiling is disabled, spans only cost a global lookup.
+"""
+import dataclasses
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+_F = TypeVar("_F", bound=Callable)
+
+FORMATS = ["text", "json", "prometheus"]
+
+
+@dataclasses.dataclass
+class PhaseTiming:
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class Profiler:
+    """
+    Timings of each phase, accumulated over all the calls. Thread-safe.
+    Nested phases are also counted in their parent phase.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: dict[str, PhaseTiming] = {}
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._phases.get(phase)
+            if timing is None:
+                timing = self._phases[phase] = PhaseTiming()
+            timing.calls += 1
+            timing.total_seconds += seconds
+            timing.max_seconds = max(timing.max_seconds, seconds)
+
+    def get_phases(self) -> dict[str, PhaseTiming]:
+        """Copy of the timings, by phase in order of first call"""
+        with self._lock:
+            return {phase: dataclasses.replace(timing) for phase, timing in self._phases.items()}
+
+    def format(self, output_format: str = "text") -> str:
+        match output_format:
+            case "text":
+                return self.to_text()
+            case "json":
+                return self.to_json()
+            case "prometheus":
+                return self.to_prometheus()
+        raise ValueError(f"Unknown profile format '{output_format}'. Choose from {', '.join(FORMATS)}")
+
+    def to_text(self) -> str:
+        lines = [f"{'phase':<36}{'calls':>8}{'total':>12}{'mean':>12}{'max':>12}"]
+        for phase, timing in self.get_phases().items():
+            lines.append(
+                f"{phase:<36}{timing.calls:>8}"
+                f"{timing.total_seconds * 1000:>10.2f}ms"
+                f"{timing.mean_seconds * 1000:>10.2f}ms"
+                f"{timing.max_seconds * 1000:>10.2f}ms"
+            )
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            phase: {
+                "calls": timing.calls,
+                "totalSeconds": timing.total_seconds,
+                "meanSeconds": timing.mean_seconds,
+                "maxSeconds": timing.max_seconds
+            }
+            for phase, timing in self.get_phases().items()
+        })
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        phases = self.get_phases()
+        lines = [
+            "# HELP recolul_phase_seconds_total Wall time spent in each phase.",
+            "# TYPE recolul_phase_seconds_total counter",
+            *(
+                f'recolul_phase_seconds_total{{phase="{phase}"}} {timing.total_seconds}'
+                for phase, timing in phases.items()
+            ),
+            "# HELP recolul_phase_calls_total Number of runs of each phase.",
+            "# TYPE recolul_phase_calls_total counter",
+            *(f'recolul_phase_calls_total{{phase="{phase}"}} {timing.calls}' for phase, timing in phases.items()),
+            "# HELP recolul_phase_max_seconds Longest run of each phase.",
+            "# TYPE recolul_phase_max_seconds gauge",
+            *(f'recolul_phase_max_seconds{{phase="{phase}"}} {timing.max_seconds}' for phase, timing in phases.items())
+        ]
+        return "\n".join(lines) + "\n"
+
+
+_profiler: Profiler | None = None
+
+
+def enable() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Profiler | None:
+    return _profiler
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    if _profiler is None:
+        yield
+        return
+    with _profiler.span(phase):
+        yield
+
+
+def timed(phase: str) -> Callable[[_F], _F]:
+    """Decorator recording the calls of a function as a phase"""
+    def decorator(function: _F) -> _F:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorator
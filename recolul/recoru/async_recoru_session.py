@@ -0,0 +1,175 @@
+"""
+asyncio version of RecoruSession, for fetching the charts of many accounts from one event loop.
+Requires aiohttp (pip install recolul[async]).
+"""
+import asyncio
+import random
+from datetime import date
+
+import aiohttp
+
+from recolul.config import DEFAULT_RECORU_BASE_URL
+from recolul.errors import InvalidRecoruLoginError, UnexpectedRecoruPageError
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.recoru.chart_cache import ChartCache
+from recolul.recoru.months import current_month, get_month_offset, get_month_range
+from recolul.recoru.parsed_charts import ParsedChartMemo
+from recolul.recoru.parsers import check_parser
+from recolul.recoru.recoru_session import RecoruSession
+from recolul.recoru.snapshot_archive import SnapshotArchive
+
+DEFAULT_TIMEOUT = 30.0  # Seconds, per request
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # Seconds, doubled after each retry
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+class AsyncRecoruSession:
+    """
+    Same contract as RecoruSession, with `await` in front of get_attendance_chart.
+
+    Requests time out after `timeout` seconds. Connection errors, timeouts and 5xx responses are
+    retried up to `max_retries` times, with exponential backoff and jitter.
+    Sessions of different accounts can share the keep-alive connections of a single connector:
+    each session keeps its own cookies.
+    """
+    def __init__(
+        self,
+        contract_id: str,
+        auth_id: str,
+        password: str,
+        cache: ChartCache | None = None,
+        parser: str | None = None,
+        base_url: str = DEFAULT_RECORU_BASE_URL,
+        connector: aiohttp.BaseConnector | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        archive: SnapshotArchive | None = None,
+        parsed_charts: ParsedChartMemo | None = None
+    ):
+        self._contract_id: str = contract_id
+        self._auth_id: str = auth_id
+        self._password: str = password
+        self._cache: ChartCache | None = cache
+        self._parser: str | None = check_parser(parser) if parser else None
+        self._base_url: str = base_url.rstrip("/")
+        self._connector: aiohttp.BaseConnector | None = connector
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._max_retries: int = max_retries
+        self._backoff: float = backoff
+        self._archive: SnapshotArchive | None = archive
+        self.parsed_charts: ParsedChartMemo = parsed_charts or ParsedChartMemo()
+
+        self._session: aiohttp.ClientSession | None = None
+        self._logged_in: bool = False
+        self._login_lock = asyncio.Lock()
+        self._login_count: int = 0
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=self._connector or aiohttp.TCPConnector(limit=DEFAULT_MAX_CONNECTIONS),
+            connector_owner=self._connector is None,
+            timeout=self._timeout,
+            # RecoRu sets its session cookie on /ap
+            cookie_jar=aiohttp.CookieJar(unsafe=True)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        assert self._session, "AsyncRecoruSession should be used as an async context manager"
+        return self._session
+
+    async def get_attendance_chart(self, month: date | None = None) -> AttendanceChart:
+        """Attendance chart of the given month (first day of the month), or of the current month"""
+        month = month or current_month()
+        if self._cache and (text := self._cache.get(self._contract_id, self._auth_id, month)) is not None:
+            return self._get_parsed_attendance_chart(month, text)
+
+        login_count = await self._ensure_logged_in()
+        text = await self._load_attendance_chart_gadget(month)
+        if self._is_login_page(text):
+            # Session has expired
+            await self._ensure_logged_in(expired_login_count=login_count)
+            text = await self._load_attendance_chart_gadget(month)
+            if self._is_login_page(text):
+                raise UnexpectedRecoruPageError()
+
+        # Only pages that could be parsed are kept
+        attendance_chart = self._get_parsed_attendance_chart(month, text)
+        if self._cache:
+            self._cache.set(self._contract_id, self._auth_id, month, text)
+        if self._archive:
+            self._archive.add(self._contract_id, self._auth_id, month, text)
+        return attendance_chart
+
+    async def get_attendance_charts(self, first_month: date, last_month: date) -> list[AttendanceChart]:
+        """Attendance charts of every month from first_month to last_month, fetched concurrently"""
+        return list(await asyncio.gather(
+            *(self.get_attendance_chart(month) for month in get_month_range(first_month, last_month))
+        ))
+
+    async def _ensure_logged_in(self, expired_login_count: int | None = None) -> int:
+        """
+        Log in if needed, or if the session of the given login has expired.
+        When charts are fetched concurrently, only one task logs in.
+        """
+        async with self._login_lock:
+            if not self._logged_in or self._login_count == expired_login_count:
+                await self._login()
+            return self._login_count
+
+    async def _login(self):
+        # Get a session ID
+        await self._request("GET", "/ap/")
+
+        form_data = {
+            "contractId": self._contract_id,
+            "authId": self._auth_id,
+            "password": self._password
+        }
+        text = await self._request("POST", "/ap/login", form_data)
+        if "message-err" in text:
+            raise InvalidRecoruLoginError()
+
+        self._logged_in = True
+        self._login_count += 1
+
+    async def _load_attendance_chart_gadget(self, month: date) -> str:
+        # Months are selected relatively to the current month
+        form_data = {"periodPoint": str(get_month_offset(month))}
+        return await self._request("POST", "/ap/home/loadAttendanceChartGadget", form_data)
+
+    async def _request(self, method: str, path: str, form_data: dict[str, str] | None = None) -> str:
+        """Text of the response, retrying connection errors, timeouts and 5xx responses"""
+        url = f"{self._base_url}{path}"
+        attempt = 0
+        while True:
+            try:
+                async with self.session.request(method, url, data=form_data) as response:
+                    if response.status < 500 or attempt >= self._max_retries:
+                        response.raise_for_status()
+                        return await response.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self._max_retries:
+                    raise
+            # Jitter avoids retrying thousands of sessions at the same time
+            await asyncio.sleep(self._backoff * 2 ** attempt * random.uniform(0.5, 1.0))
+            attempt += 1
+
+    def _get_parsed_attendance_chart(self, month: date, text: str) -> AttendanceChart:
+        return self.parsed_charts.get_or_parse(
+            month,
+            text,
+            lambda page: RecoruSession._parse_attendance_chart(page, self._parser)
+        )
+
+    @staticmethod
+    def _is_login_page(text: str) -> bool:
+        """When not logged in, RecoRu redirects to the login page instead of returning the chart"""
+        return "ID-attendanceChartGadgetTable" not in text
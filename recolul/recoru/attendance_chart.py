@@ -1,8 +1,18 @@
+import datetime
 import re
+import sys
+import threading
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import accumulate
 from typing import TypeAlias
 
-from bs4 import Tag
+from bs4 import BeautifulSoup, Tag
+
+from recolul import profiling
+from recolul.recoru.parsers import get_default_parser
 
 
 class ChartColumn(str, Enum):
@@ -19,7 +29,7 @@ class ChartHeader:
     """Header of the attendance chart"""
     def __init__(self, tag: Tag):
         self._column_indices: dict[ChartColumn, int] = {
-            ChartCell(column).text.strip(): i
+            ChartCell.from_tag(column).text: i
             for i, column in enumerate(tag.find_all("td", recursive=False))
         }
 
@@ -30,92 +40,232 @@ class ChartHeader:
         return column in self._column_indices
 
 
+@dataclass(frozen=True, slots=True)
 class ChartCell:
     """Single cell of the attendance chart"""
-    def __init__(self, tag: Tag):
-        self._tag = tag
-
-    @property
-    def text(self) -> str:
-        return self._tag.text.strip()
+    text: str
+    color: str = ""
 
-    @property
-    def color(self) -> str:
-        label = self._tag.find("label", recursive=False)
-        if not label:
-            return ""
-        return label.attrs\
-            .get("style", "")\
-            .removeprefix("color: ")\
+    @classmethod
+    def from_tag(cls, tag: Tag) -> "ChartCell":
+        label = tag.find("label", recursive=False)
+        color = (
+            label.attrs
+            .get("style", "")
+            .removeprefix("color: ")
             .removesuffix(";")
+        ) if label else ""
+        return cls(text=tag.text.strip(), color=color)
 
 
+@dataclass(frozen=True, slots=True)
 class ChartRowEntry:
     """Sub-row of the attendance chart"""
-    def __init__(self, header: ChartHeader, tag: Tag):
-        self._header = header
-        self._tag = tag
+    day: ChartCell
+    workplace: str = ""
+    category: str = ""
+    clock_in_time: str = ""
+    clock_out_time: str = ""
+    work_time: str = ""
+    memo: str = ""
 
-    def __getitem__(self, column: ChartColumn) -> ChartCell:
-        column_index = self._header.get_column_index(column)
-        column = self._tag.select_one(f"td:nth-child({column_index + 1})", recursive=False)
-        return ChartCell(column)
+    @classmethod
+    def from_tag(cls, header: ChartHeader, tag: Tag) -> "ChartRowEntry":
+        """Extract all the needed cells at once, so that the tag can be released after parsing"""
+        cells = tag.find_all("td", recursive=False)
 
-    @property
-    def day(self) -> ChartCell:
-        return self[ChartColumn.DATE]
+        def get_text(column: ChartColumn) -> str:
+            if not header.has_column(column):
+                return ""
+            return cells[header.get_column_index(column)].text.strip()
 
-    @property
-    def workplace(self) -> str:
-        return self[ChartColumn.WORKPLACE].text
+        return cls(
+            day=ChartCell.from_tag(cells[header.get_column_index(ChartColumn.DATE)]),
+            # Few distinct values repeated on every entry
+            workplace=sys.intern(get_text(ChartColumn.WORKPLACE)),
+            category=sys.intern(get_text(ChartColumn.CATEGORY)),
+            clock_in_time=get_text(ChartColumn.START),
+            clock_out_time=get_text(ChartColumn.END),
+            work_time=get_text(ChartColumn.WORK_TIME),
+            memo=get_text(ChartColumn.MEMO)
+        )
 
-    @property
-    def category(self) -> str:
-        return self[ChartColumn.CATEGORY].text
+    def __getitem__(self, column: ChartColumn) -> ChartCell:
+        if column == ChartColumn.DATE:
+            return self.day
+        return ChartCell(getattr(self, _ENTRY_FIELDS[column]))
 
-    @property
-    def clock_in_time(self) -> str:
-        return self[ChartColumn.START].text
 
-    @property
-    def clock_out_time(self) -> str:
-        return self[ChartColumn.END].text
+_ENTRY_FIELDS: dict[ChartColumn, str] = {
+    ChartColumn.WORKPLACE: "workplace",
+    ChartColumn.CATEGORY: "category",
+    ChartColumn.START: "clock_in_time",
+    ChartColumn.END: "clock_out_time",
+    ChartColumn.WORK_TIME: "work_time",
+    ChartColumn.MEMO: "memo"
+}
 
-    @property
-    def work_time(self) -> str:
-        return self[ChartColumn.WORK_TIME].text
 
-    @property
-    def memo(self) -> str:
-        return self[ChartColumn.MEMO].text
+class DayType(Enum):
+    WORKING = "working"
+    HOLIDAY = "holiday"
+    SWAP_DAY = "swap day"  # Holiday worked in exchange for another day
+    WEEKEND = "weekend"
 
 
+@dataclass(frozen=True, slots=True)
 class ChartRow:
-    """Row of the attendance chart"""
+    """
+    Row of the attendance chart.
+    day_of_month and day_type are computed once, when the row is created.
+    Entries can be given as a list, they are stored as a tuple.
+    """
     _date_regex = re.compile(r"^(\d{1,2})\/(\d{1,2})\(.\)$")
 
-    def __init__(self, entries: list[ChartRowEntry]):
-        assert entries, "Empty ChartRow"
-        self._entries = entries
+    entries: tuple[ChartRowEntry, ...]
+    date: datetime.date | None = None  # None when the page doesn't contain it
+    day_of_month: int = field(init=False, compare=False)
+    day_type: DayType = field(init=False, compare=False)
 
-    @property
-    def entries(self) -> list[ChartRowEntry]:
-        return self._entries
+    def __post_init__(self):
+        assert self.entries, "Empty ChartRow"
+        if not isinstance(self.entries, tuple):
+            object.__setattr__(self, "entries", tuple(self.entries))
+        object.__setattr__(self, "day_of_month", self._get_day_of_month())
+        object.__setattr__(self, "day_type", self._get_day_type())
 
     @property
     def day(self) -> ChartCell:
-        return self._entries[0][ChartColumn.DATE]
+        return self.entries[0].day
 
     @property
-    def day_of_month(self) -> int:
-        match = ChartRow._date_regex.match(self._entries[0].day.text)
+    def memo(self) -> str:
+        return self.entries[0].memo
+
+    def _get_day_of_month(self) -> int:
+        if self.date:
+            return self.date.day
+        match = ChartRow._date_regex.match(self.day.text)
         if not match:
             return 0
         return int(match.group(2))
 
-    @property
-    def memo(self) -> str:
-        return self._entries[0][ChartColumn.MEMO].text
+    def _get_day_type(self) -> DayType:
+        if self.day.text and self.day.color not in ["blue", "red"]:
+            return DayType.WORKING
+        if "swap day" in self.memo.lower():
+            return DayType.SWAP_DAY
+        if self.day.color == "blue" or (self.date and self.date.weekday() == 6):
+            # Saturdays are blue, Sundays and public holidays red
+            return DayType.WEEKEND
+        return DayType.HOLIDAY
 
 
 AttendanceChart: TypeAlias = list[ChartRow]
+
+
+class CalendarIndex:
+    """
+    Rows of an attendance chart by date, for charts that are queried repeatedly.
+    All the rows need a date.
+    """
+    def __init__(self, attendance_chart: AttendanceChart):
+        self.attendance_chart = attendance_chart
+        self._dates: list[datetime.date] = [row.date for row in attendance_chart]
+        if None in self._dates:
+            raise ValueError("Attendance chart rows without dates")
+        self._positions: dict[datetime.date, int] = {day: i for i, day in enumerate(self._dates)}
+        # Number of working days before each row
+        self._working_day_counts: list[int] = list(
+            accumulate((row.day_type is DayType.WORKING for row in attendance_chart), initial=0)
+        )
+
+    def get_row(self, day: datetime.date) -> ChartRow | None:
+        position = self._positions.get(day)
+        return self.attendance_chart[position] if position is not None else None
+
+    def until(self, day: datetime.date) -> AttendanceChart:
+        """Rows until the given day, included"""
+        return self.attendance_chart[:bisect_right(self._dates, day)]
+
+    def count_working_days(self, until: datetime.date | None = None) -> int:
+        """Number of working days of the chart, or until the given day (included)"""
+        if until is None:
+            return self._working_day_counts[-1]
+        return self._working_day_counts[bisect_right(self._dates, until)]
+
+
+_MAX_CALENDAR_INDICES = 64
+_calendar_indices: dict[int, tuple[AttendanceChart, int, CalendarIndex | None]] = {}
+_calendar_indices_lock = threading.Lock()
+
+
+def get_calendar_index(attendance_chart: AttendanceChart) -> CalendarIndex | None:
+    """
+    Calendar index of the chart, or None if some of its rows have no date.
+    Built once per chart object: unchanged pages are parsed to the same object (see ParsedChartMemo),
+    so refreshes reuse it. Charts must not be modified once indexed.
+    """
+    with _calendar_indices_lock:
+        cached = _calendar_indices.get(id(attendance_chart))
+    if cached is not None and cached[0] is attendance_chart and cached[1] == len(attendance_chart):
+        return cached[2]
+
+    try:
+        calendar_index = CalendarIndex(attendance_chart)
+    except ValueError:
+        calendar_index = None
+    with _calendar_indices_lock:
+        if len(_calendar_indices) >= _MAX_CALENDAR_INDICES:
+            # Oldest first
+            del _calendar_indices[next(iter(_calendar_indices))]
+        # The chart is kept alive with its index, so that its id isn't reused
+        _calendar_indices[id(attendance_chart)] = (attendance_chart, len(attendance_chart), calendar_index)
+    return calendar_index
+
+
+def merge_attendance_charts(attendance_charts: Iterable[AttendanceChart]) -> AttendanceChart:
+    """Merge charts of consecutive months, given in chronological order"""
+    return [row for attendance_chart in attendance_charts for row in attendance_chart]
+
+
+@profiling.timed("recoru.parse_attendance_chart")
+def parse_attendance_chart(text: str, parser: str | None = None) -> AttendanceChart:
+    """Parse the attendance chart gadget returned by RecoRu"""
+    soup = BeautifulSoup(text, parser or get_default_parser())
+    table = soup.select_one("#ID-attendanceChartGadgetTable")
+
+    table_header = table.select_one("thead > tr", recursive=False)
+    header = ChartHeader(table_header)
+
+    chart_rows = []
+    current_row_entries = []
+    current_row_date = None
+    table_body = table.find("tbody", recursive=False)
+    for row in table_body.find_all("tr", recursive=False):
+        entry = ChartRowEntry.from_tag(header, row)
+        if entry.day.text:  # New row
+            # Append previous row
+            if current_row_entries:
+                chart_rows.append(ChartRow(tuple(current_row_entries), current_row_date))
+            current_row_entries = [entry]
+            current_row_date = _get_row_date(row)
+        else:  # Row with multiple entries
+            current_row_entries.append(entry)
+    if current_row_entries:
+        chart_rows.append(ChartRow(tuple(current_row_entries), current_row_date))
+
+    # Entries don't reference the tree anymore
+    soup.decompose()
+    return chart_rows
+
+
+_edit_dialog_regex = re.compile(r"loadAttendanceEditDialog\('\d+',\s*'(\d{4})(\d{2})(\d{2})'")
+
+
+def _get_row_date(tag: Tag) -> datetime.date | None:
+    """Rows open an edit dialog of their date on click, e.g. loadAttendanceEditDialog('36','20230814','1', 'false')"""
+    match = _edit_dialog_regex.search(tag.attrs.get("onclick", ""))
+    if not match:
+        return None
+    return datetime.date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
@@ -0,0 +1,49 @@
+import hashlib
+import os
+import time
+from datetime import date, datetime
+
+from recolul.config import DEFAULT_CACHE_DIR
+from recolul.recoru.files import write_atomically
+from recolul.recoru.months import add_months
+
+DEFAULT_TTL = 5 * 60  # Seconds
+
+
+def get_account_hash(contract_id: str, auth_id: str) -> str:
+    """Identify an account without login information appearing in file names"""
+    return hashlib.sha256(f"{contract_id}:{auth_id}".encode()).hexdigest()[:16]
+
+
+class ChartCache:
+    """
+    On-disk cache of raw attendance chart pages, keyed by account and month.
+    A chart fetched after the end of its month can't change anymore, so it never expires.
+    Other charts expire after `ttl` seconds, e.g. a chart of last month fetched before the month ended.
+    With `refresh`, cached charts are never read, only updated.
+    """
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL, refresh: bool = False):
+        self._directory = directory
+        self._ttl = ttl
+        self._refresh = refresh
+
+    def get(self, contract_id: str, auth_id: str, month: date) -> str | None:
+        if self._refresh:
+            return None
+        path = self._get_path(contract_id, auth_id, month)
+        try:
+            fetched_at = os.path.getmtime(path)
+            is_complete = datetime.fromtimestamp(fetched_at).date() >= add_months(month, 1)
+            if not is_complete and time.time() - fetched_at >= self._ttl:
+                return None
+            with open(path, "rt", encoding="UTF-8") as cache_file:
+                return cache_file.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, contract_id: str, auth_id: str, month: date, text: str) -> None:
+        write_atomically(self._get_path(contract_id, auth_id, month), text)
+
+    def _get_path(self, contract_id: str, auth_id: str, month: date) -> str:
+        account_hash = get_account_hash(contract_id, auth_id)
+        return os.path.join(self._directory, f"{account_hash}-{month:%Y-%m}.html")
@@ -0,0 +1,52 @@
+import json
+import os
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+from recolul.config import DEFAULT_CACHE_DIR
+from recolul.recoru.chart_cache import get_account_hash
+from recolul.recoru.files import write_atomically
+
+
+class CookieStore:
+    """
+    Persist RecoRu session cookies between invocations, so that logging in is only needed
+    when the session has expired. Cookie files are only readable by the current user.
+    """
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self._directory = directory
+
+    def load(self, contract_id: str, auth_id: str, cookie_jar: RequestsCookieJar) -> bool:
+        """Return whether cookies were found"""
+        try:
+            with open(self._get_path(contract_id, auth_id), "rt", encoding="UTF-8") as cookie_file:
+                cookies = json.load(cookie_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        for cookie in cookies:
+            cookie_jar.set_cookie(create_cookie(**cookie))
+        return bool(cookies)
+
+    def save(self, contract_id: str, auth_id: str, cookie_jar: RequestsCookieJar) -> None:
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires
+            }
+            for cookie in cookie_jar
+        ]
+        write_atomically(self._get_path(contract_id, auth_id), json.dumps(cookies))
+
+    def clear(self, contract_id: str, auth_id: str) -> None:
+        try:
+            os.remove(self._get_path(contract_id, auth_id))
+        except FileNotFoundError:
+            pass
+
+    def _get_path(self, contract_id: str, auth_id: str) -> str:
+        return os.path.join(self._directory, f"{get_account_hash(contract_id, auth_id)}-cookies.json")
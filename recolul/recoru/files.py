@@ -0,0 +1,24 @@
+import os
+import tempfile
+
+
+def write_atomically(path: str, data: str | bytes) -> None:
+    """
+    Write to a temporary file next to path, then replace path with it, so that concurrent readers
+    never see a partial file. The file and its missing folders are only accessible by the current user.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    # mkstemp creates the file with 0600 permissions
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        if isinstance(data, str):
+            with os.fdopen(fd, "wt", encoding="UTF-8") as tmp_file:
+                tmp_file.write(data)
+        else:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,24 @@
+from datetime import date
+
+
+def current_month() -> date:
+    return date.today().replace(day=1)
+
+
+def get_month_offset(month: date, reference: date | None = None) -> int:
+    """Number of months from the reference month (current month by default) to the given month"""
+    reference = reference or current_month()
+    return (month.year - reference.year) * 12 + month.month - reference.month
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` months after the given month"""
+    return date(month.year + (month.month - 1 + months) // 12, (month.month - 1 + months) % 12 + 1, 1)
+
+
+def get_month_range(first_month: date, last_month: date) -> list[date]:
+    """First day of every month from first_month to last_month, both included"""
+    return [
+        add_months(first_month, i)
+        for i in range(get_month_offset(last_month, first_month) + 1)
+    ]
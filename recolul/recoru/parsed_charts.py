@@ -0,0 +1,34 @@
+import hashlib
+import threading
+from collections.abc import Callable
+from datetime import date
+
+from recolul.recoru.attendance_chart import AttendanceChart
+
+
+class ParsedChartMemo:
+    """
+    Last parsed chart of each month, by hash of the page it was parsed from.
+    Most refetches return the same page, which is then not parsed again: the same AttendanceChart object
+    is returned, so results derived from it can also be reused (e.g. by OvertimeEngine). Returned charts
+    are shared and must not be modified.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._charts: dict[date, tuple[bytes, AttendanceChart]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_parse(self, month: date, text: str, parse: Callable[[str], AttendanceChart]) -> AttendanceChart:
+        digest = hashlib.blake2b(text.encode("UTF-8"), digest_size=16).digest()
+        with self._lock:
+            parsed = self._charts.get(month)
+            if parsed is not None and parsed[0] == digest:
+                self.hits += 1
+                return parsed[1]
+            self.misses += 1
+
+        attendance_chart = parse(text)
+        with self._lock:
+            self._charts[month] = (digest, attendance_chart)
+        return attendance_chart
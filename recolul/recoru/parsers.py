@@ -0,0 +1,31 @@
+import os
+from importlib.util import find_spec
+
+# BeautifulSoup tree builders, from fastest to slowest.
+# html.parser is part of the standard library and always available.
+PARSER_BACKENDS: dict[str, str | None] = {
+    "lxml": "lxml",
+    "html.parser": None
+}
+
+
+def get_available_parsers() -> list[str]:
+    return [
+        parser for parser, module in PARSER_BACKENDS.items()
+        if module is None or find_spec(module) is not None
+    ]
+
+
+def get_default_parser() -> str:
+    """Fastest available parser, unless overridden by the RECOLUL_PARSER environment variable"""
+    if parser := os.getenv("RECOLUL_PARSER"):
+        return check_parser(parser)
+    return get_available_parsers()[0]
+
+
+def check_parser(parser: str) -> str:
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser '{parser}'. Valid parsers: {', '.join(PARSER_BACKENDS)}")
+    if parser not in get_available_parsers():
+        raise ValueError(f"Parser '{parser}' is not installed")
+    return parser
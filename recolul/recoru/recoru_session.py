@@ -1,20 +1,56 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
 import requests
-from bs4 import BeautifulSoup
 
-from recolul.errors import InvalidRecoruLoginError
-from recolul.recoru.attendance_chart import AttendanceChart, ChartHeader, ChartRow, ChartRowEntry
+from recolul import profiling
+from recolul.config import DEFAULT_RECORU_BASE_URL
+from recolul.errors import InvalidRecoruLoginError, UnexpectedRecoruPageError
+from recolul.recoru.attendance_chart import AttendanceChart, parse_attendance_chart
+from recolul.recoru.chart_cache import ChartCache
+from recolul.recoru.cookie_store import CookieStore
+from recolul.recoru.months import current_month, get_month_offset, get_month_range
+from recolul.recoru.parsed_charts import ParsedChartMemo
+from recolul.recoru.parsers import check_parser
+from recolul.recoru.snapshot_archive import Snapshot, SnapshotArchive, read_html_file
 
 
 class RecoruSession:
-    def __init__(self, contract_id: str, auth_id: str, password: str):
+    def __init__(
+        self,
+        contract_id: str,
+        auth_id: str,
+        password: str,
+        cache: ChartCache | None = None,
+        cookie_store: CookieStore | None = None,
+        parser: str | None = None,
+        base_url: str = DEFAULT_RECORU_BASE_URL,
+        archive: SnapshotArchive | None = None,
+        parsed_charts: ParsedChartMemo | None = None
+    ):
         self._contract_id: str = contract_id
         self._auth_id: str = auth_id
         self._password: str = password
+        self._cache: ChartCache | None = cache
+        self._cookie_store: CookieStore | None = cookie_store
+        self._parser: str | None = check_parser(parser) if parser else None
+        self._base_url: str = base_url.rstrip("/")
+        self._archive: SnapshotArchive | None = archive
+        # Can be shared by the sessions of an account, e.g. between the refreshes of the GUI
+        self.parsed_charts: ParsedChartMemo = parsed_charts or ParsedChartMemo()
 
         self._session: requests.Session | None = None
+        self._logged_in: bool = False
+        self._login_lock = threading.Lock()
+        self._login_count: int = 0
 
     def __enter__(self):
         self._session = requests.Session()
+        self._logged_in = bool(
+            self._cookie_store
+            and self._cookie_store.load(self._contract_id, self._auth_id, self._session.cookies)
+        )
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -26,26 +62,66 @@ class RecoruSession:
         assert self._session, "RecoruSession should be used as a context manager"
         return self._session
 
-    def get_attendance_chart(self) -> AttendanceChart:
-        self._login()
-
-        response = self.session.post("https://app.recoru.in/ap/home/loadAttendanceChartGadget")
-        response.raise_for_status()
-        return self._parse_attendance_chart(response.text)
+    @profiling.timed("recoru.get_attendance_chart")
+    def get_attendance_chart(self, month: date | None = None) -> AttendanceChart:
+        """Attendance chart of the given month (first day of the month), or of the current month"""
+        month = month or current_month()
+        if self._cache and (text := self._cache.get(self._contract_id, self._auth_id, month)) is not None:
+            return self._get_parsed_attendance_chart(month, text)
+
+        login_count = self._ensure_logged_in()
+        response = self._load_attendance_chart_gadget(month)
+        if self._is_login_page(response):
+            # Restored session has expired
+            self._ensure_logged_in(expired_login_count=login_count)
+            response = self._load_attendance_chart_gadget(month)
+            if self._is_login_page(response):
+                raise UnexpectedRecoruPageError()
+
+        # Only pages that could be parsed are kept
+        attendance_chart = self._get_parsed_attendance_chart(month, response.text)
+        if self._cache:
+            self._cache.set(self._contract_id, self._auth_id, month, response.text)
+        if self._archive:
+            self._archive.add(self._contract_id, self._auth_id, month, response.text)
+        return attendance_chart
+
+    def get_attendance_charts(self, first_month: date, last_month: date, max_workers: int = 4) -> list[AttendanceChart]:
+        """Attendance charts of every month from first_month to last_month, fetched in parallel"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_attendance_chart, get_month_range(first_month, last_month)))
 
     @classmethod
-    def read_attendance_chart_file(cls, path: str) -> AttendanceChart:
-        """Used for testing"""
-
-        with open(path, "rt", encoding="UTF-8") as attendance_chart_file:
-            text = attendance_chart_file.read()
-        return cls._parse_attendance_chart(text)
+    def read_attendance_chart_file(cls, path: str, parser: str | None = None) -> AttendanceChart:
+        """Read a saved chart page, gzip-compressed or not"""
+        return cls._parse_attendance_chart(read_html_file(path), parser)
 
+    @classmethod
+    def read_attendance_chart_snapshot(
+        cls,
+        archive: SnapshotArchive,
+        snapshot: Snapshot,
+        parser: str | None = None
+    ) -> AttendanceChart:
+        """Reprocess an archived chart page, without network access"""
+        return cls._parse_attendance_chart(archive.read(snapshot), parser)
+
+    def _ensure_logged_in(self, expired_login_count: int | None = None) -> int:
+        """
+        Log in if needed, or if the session of the given login has expired.
+        When charts are fetched in parallel, only one thread logs in.
+        """
+        with self._login_lock:
+            if not self._logged_in or self._login_count == expired_login_count:
+                self._login()
+            return self._login_count
+
+    @profiling.timed("recoru.login")
     def _login(self):
         # Get a session ID
-        self.session.get("https://app.recoru.in/ap/")
+        self.session.get(f"{self._base_url}/ap/")
 
-        url = "https://app.recoru.in/ap/login"
+        url = f"{self._base_url}/ap/login"
         form_data = {
             "contractId": self._contract_id,
             "authId": self._auth_id,
@@ -54,28 +130,31 @@ class RecoruSession:
         response = self.session.post(url, data=form_data)
         response.raise_for_status()
         if "message-err" in response.text:
+            if self._cookie_store:
+                self._cookie_store.clear(self._contract_id, self._auth_id)
             raise InvalidRecoruLoginError()
 
+        self._logged_in = True
+        self._login_count += 1
+        if self._cookie_store:
+            self._cookie_store.save(self._contract_id, self._auth_id, self.session.cookies)
+
+    @profiling.timed("recoru.load_attendance_chart_gadget")
+    def _load_attendance_chart_gadget(self, month: date) -> requests.Response:
+        # Months are selected relatively to the current month
+        form_data = {"periodPoint": get_month_offset(month)}
+        response = self.session.post(f"{self._base_url}/ap/home/loadAttendanceChartGadget", data=form_data)
+        response.raise_for_status()
+        return response
+
+    def _get_parsed_attendance_chart(self, month: date, text: str) -> AttendanceChart:
+        return self.parsed_charts.get_or_parse(month, text, lambda page: self._parse_attendance_chart(page, self._parser))
+
+    @staticmethod
+    def _is_login_page(response: requests.Response) -> bool:
+        """When not logged in, RecoRu redirects to the login page instead of returning the chart"""
+        return "ID-attendanceChartGadgetTable" not in response.text
+
     @staticmethod
-    def _parse_attendance_chart(text: str) -> AttendanceChart:
-        soup = BeautifulSoup(text, "html.parser")
-        table = soup.select_one("#ID-attendanceChartGadgetTable")
-
-        table_header = table.select_one("thead > tr", recursive=False)
-        header = ChartHeader(table_header)
-
-        chart_rows = []
-        current_row_entries = []
-        table_body = table.find("tbody", recursive=False)
-        for row in table_body.find_all("tr", recursive=False):
-            entry = ChartRowEntry(header, row)
-            if entry.day.text:  # New row
-                # Append previous row
-                if current_row_entries:
-                    chart_rows.append(ChartRow(current_row_entries))
-                current_row_entries = [entry]
-            else:  # Row with multiple entries
-                current_row_entries.append(entry)
-        if current_row_entries:
-            chart_rows.append(ChartRow(current_row_entries))
-        return chart_rows
+    def _parse_attendance_chart(text: str, parser: str | None = None) -> AttendanceChart:
+        return parse_attendance_chart(text, parser)
@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import mmap
+import os
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from recolul.config import DEFAULT_CACHE_DIR
+from recolul.recoru.chart_cache import get_account_hash
+from recolul.recoru.files import write_atomically
+
+DEFAULT_ARCHIVE_DIR = os.path.join(DEFAULT_CACHE_DIR, "snapshots")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """An archived attendance chart page, fetched at `fetched_at` (UTC)"""
+    month: date
+    fetched_at: datetime
+    digest: str
+
+
+class SnapshotArchive:
+    """
+    Archive of every fetched attendance chart page, keyed by account, month and fetch time,
+    so that balances can be recomputed offline, e.g. after a rule change.
+
+    Pages are stored gzip-compressed and deduplicated by content: refetching an unchanged month only
+    appends a line to the index of the account. Layout of the directory:
+    - objects/<digest[:2]>/<digest[2:]>.html.gz: pages, by SHA-256 of their text
+    - index/<account hash>.tsv: one "<fetch time>\t<YYYY-MM>\t<digest>" line per fetch, in fetch order
+    """
+    def __init__(self, directory: str = DEFAULT_ARCHIVE_DIR):
+        self._directory = directory
+        self._index_lock = threading.Lock()
+
+    def add(
+        self,
+        contract_id: str,
+        auth_id: str,
+        month: date,
+        text: str,
+        fetched_at: datetime | None = None
+    ) -> Snapshot:
+        data = text.encode("UTF-8")
+        snapshot = Snapshot(
+            month=month.replace(day=1),
+            fetched_at=(fetched_at or datetime.now(timezone.utc)).astimezone(timezone.utc),
+            digest=hashlib.sha256(data).hexdigest()
+        )
+        object_path = self._get_object_path(snapshot.digest)
+        if not os.path.exists(object_path):
+            # mtime=0 so that the same page is always compressed to the same bytes,
+            # then concurrent writers of the same object write the same bytes and the last replace wins harmlessly
+            write_atomically(object_path, gzip.compress(data, mtime=0))
+
+        index_path = self._get_index_path(contract_id, auth_id)
+        os.makedirs(os.path.dirname(index_path), mode=0o700, exist_ok=True)
+        with self._index_lock, open(index_path, "at", encoding="UTF-8") as index_file:
+            index_file.write(f"{snapshot.fetched_at.isoformat()}\t{snapshot.month:%Y-%m}\t{snapshot.digest}\n")
+        return snapshot
+
+    def get_snapshots(self, contract_id: str, auth_id: str, month: date | None = None) -> list[Snapshot]:
+        """Snapshots of the account, of all months or of the given month, from oldest to newest"""
+        try:
+            with open(self._get_index_path(contract_id, auth_id), "rt", encoding="UTF-8") as index_file:
+                lines = index_file.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+        snapshots = []
+        for line in lines:
+            fetched_at, snapshot_month, digest = line.split("\t")
+            snapshot_month = datetime.strptime(snapshot_month, "%Y-%m").date()
+            if month is None or snapshot_month == month.replace(day=1):
+                snapshots.append(Snapshot(snapshot_month, datetime.fromisoformat(fetched_at), digest))
+        snapshots.sort(key=lambda snapshot: snapshot.fetched_at)
+        return snapshots
+
+    def find(self, contract_id: str, auth_id: str, month: date, as_of: datetime | None = None) -> Snapshot | None:
+        """Latest snapshot of the month fetched at or before as_of (naive times are local)"""
+        snapshots = self.get_snapshots(contract_id, auth_id, month)
+        if as_of is not None:
+            as_of = as_of.astimezone(timezone.utc)
+            snapshots = [snapshot for snapshot in snapshots if snapshot.fetched_at <= as_of]
+        return snapshots[-1] if snapshots else None
+
+    def read(self, snapshot: Snapshot) -> str:
+        return read_html_file(self._get_object_path(snapshot.digest))
+
+    def _get_object_path(self, digest: str) -> str:
+        return os.path.join(self._directory, "objects", digest[:2], f"{digest[2:]}.html.gz")
+
+    def _get_index_path(self, contract_id: str, auth_id: str) -> str:
+        return os.path.join(self._directory, "index", f"{get_account_hash(contract_id, auth_id)}.tsv")
+
+
+def read_html_file(path: str) -> str:
+    """Read an HTML file, gzip-compressed or not, through a memory map instead of a copy in a read buffer"""
+    with open(path, "rb") as html_file:
+        if not os.fstat(html_file.fileno()).st_size:
+            return ""
+        with mmap.mmap(html_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:2] == _GZIP_MAGIC:
+                return zlib.decompress(data, wbits=16 + zlib.MAX_WBITS).decode("UTF-8")
+            return str(data, "UTF-8")
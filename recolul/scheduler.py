@@ -0,0 +1,197 @@
+"""
+Scheduler of RecoRu fetches for bulk access, so that fetching many accounts doesn't get them throttled or locked out.
+
+- A token bucket limits the rate at which fetches start, over all accounts
+- At most `max_per_contract` fetches of the same contract ID run at once
+- Queued fetches start in submission order, skipping those of contracts at their cap
+- Concurrency is adapted to RecoRu (AIMD): it grows by one after a full round of fast successful fetches,
+  and is halved when a fetch fails or is slower than `latency_threshold`
+"""
+import dataclasses
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from recolul.errors import InvalidRecoruLoginError
+
+DEFAULT_RATE = 5.0  # Fetches per second
+DEFAULT_BURST = 10
+DEFAULT_MAX_PER_CONTRACT = 4
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_LATENCY_THRESHOLD = 10.0  # Seconds
+
+
+class TokenBucket:
+    """`rate` tokens per second, at most `capacity` of them saved up for bursts"""
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the number of seconds until a token is available"""
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class AdaptiveLimit:
+    """Additive increase, multiplicative decrease of a concurrency limit"""
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        latency_threshold: float = DEFAULT_LATENCY_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._limit = float(initial)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._latency_threshold = latency_threshold
+        self._clock = clock
+        self._decreased_at = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def record(self, latency: float, failed: bool, started_at: float) -> None:
+        if failed or latency > self._latency_threshold:
+            # Fetches that started before the last decrease saw the previous concurrency, don't decrease twice for it
+            if started_at >= self._decreased_at:
+                self._limit = max(self._minimum, self._limit / 2)
+                self._decreased_at = self._clock()
+        else:
+            # +1 after `limit` successes
+            self._limit = min(self._maximum, self._limit + 1 / self._limit)
+
+
+class FetchScheduler:
+    """
+    Run fetches under a global rate limit, a per-contract concurrency cap and an adaptive concurrency limit.
+    Use as a context manager, or call shutdown.
+    """
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_per_contract: int = DEFAULT_MAX_PER_CONTRACT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        latency_threshold: float = DEFAULT_LATENCY_THRESHOLD
+    ):
+        self._token_bucket = TokenBucket(rate, burst)
+        self._max_per_contract = max_per_contract
+        self._adaptive_limit = AdaptiveLimit(
+            initial=max(1, max_concurrency // 2),
+            maximum=max_concurrency,
+            latency_threshold=latency_threshold
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="recolul-fetch")
+
+        self._condition = threading.Condition()
+        self._queue: deque[_Job] = deque()
+        self._in_flight = 0
+        self._in_flight_per_contract: dict[str, int] = defaultdict(int)
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name="recolul-fetch-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self._adaptive_limit.limit
+
+    def submit(
+        self,
+        contract_id: str,
+        function: Callable,
+        *args,
+        **kwargs
+    ) -> Future:
+        """Schedule function(*args, **kwargs), a fetch of an account of contract_id"""
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("FetchScheduler is shut down")
+            self._queue.append(_Job(contract_id, function, args, kwargs, future))
+            self._condition.notify_all()
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop once the queued fetches have run"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            self._dispatcher.join()
+            self._executor.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        with self._condition:
+            while True:
+                if not self._queue:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                    continue
+                if self._in_flight >= self._adaptive_limit.limit or (job := self._get_startable_job()) is None:
+                    self._condition.wait()
+                    continue
+                if (delay := self._token_bucket.try_acquire()) > 0:
+                    self._condition.wait(delay)
+                    continue
+                self._queue.remove(job)
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self._in_flight += 1
+                self._in_flight_per_contract[job.contract_id] += 1
+                self._executor.submit(self._run, job)
+
+    def _get_startable_job(self) -> "_Job | None":
+        """First queued job whose contract is under its concurrency cap"""
+        for job in self._queue:
+            if self._in_flight_per_contract[job.contract_id] < self._max_per_contract:
+                return job
+        return None
+
+    def _run(self, job: "_Job") -> None:
+        started_at = time.monotonic()
+        failed = False
+        try:
+            job.future.set_result(job.function(*job.args, **job.kwargs))
+        except InvalidRecoruLoginError as error:
+            # Not a sign of load
+            job.future.set_exception(error)
+        except BaseException as error:
+            failed = True
+            job.future.set_exception(error)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._in_flight_per_contract[job.contract_id] -= 1
+                self._adaptive_limit.record(time.monotonic() - started_at, failed, started_at)
+                self._condition.notify_all()
+
+
+# Compared by identity, to be removed from the queue
+@dataclasses.dataclass(frozen=True, slots=True, eq=False)
+class _Job:
+    contract_id: str
+    function: Callable
+    args: tuple
+    kwargs: dict
+    future: Future
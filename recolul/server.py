@@ -0,0 +1,277 @@
+"""
+JSON API over the overtime computations, for dashboards and bots.
+
+recolul serve [--host 127.0.0.1] [--port 8000]
+
+The RecoRu session and the parsed charts are kept in memory. The chart of the current month is
+refetched in the background, so that requests are answered without waiting for RecoRu.
+When profiling is enabled, /metrics returns the phase timings in the Prometheus text format.
+"""
+import json
+import sys
+import threading
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from recolul import profiling, time
+from recolul.duration import Duration
+from recolul.errors import InvalidRecoruLoginError, NoClockInError
+from recolul.incremental import OvertimeEngine
+from recolul.recoru.attendance_chart import AttendanceChart, CalendarIndex
+from recolul.recoru.chart_cache import DEFAULT_TTL
+from recolul.recoru.months import current_month, get_month_range
+from recolul.recoru.parsed_charts import ParsedChartMemo
+from recolul.recoru.recoru_session import RecoruSession
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+
+class ChartStore:
+    """
+    Parsed charts of one account. Charts of past months are fetched once,
+    the chart of the current month is refetched every `interval` seconds by refresh_forever.
+    """
+    def __init__(self, recoru_session: RecoruSession, interval: float = DEFAULT_TTL):
+        self._recoru_session = recoru_session
+        self._interval = interval
+        self._calendar_indices: dict[date, CalendarIndex] = {}
+        self._incomplete_months: set[date] = set()  # Months that were not over when fetched
+        self._fetch_lock = threading.Lock()  # RecoruSession is used by one thread at a time
+
+    @property
+    def parsed_charts(self) -> ParsedChartMemo:
+        return self._recoru_session.parsed_charts
+
+    def get_attendance_chart(self, month: date) -> AttendanceChart:
+        return self.get_calendar_index(month).attendance_chart
+
+    def get_attendance_charts(self, first_month: date, last_month: date) -> list[AttendanceChart]:
+        return [self.get_attendance_chart(month) for month in get_month_range(first_month, last_month)]
+
+    def get_calendar_index(self, month: date) -> CalendarIndex:
+        if (calendar_index := self._calendar_indices.get(month)) is not None:
+            return calendar_index
+        with self._fetch_lock:
+            if month not in self._calendar_indices:
+                self._fetch(month)
+            return self._calendar_indices[month]
+
+    def refresh(self) -> None:
+        with self._fetch_lock:
+            # Also fetch the last state of the previous month after a month change
+            for month in sorted(self._incomplete_months | {current_month()}):
+                self._fetch(month)
+
+    def refresh_forever(self, stop_event: threading.Event) -> None:
+        while not stop_event.wait(self._interval):
+            try:
+                self.refresh()
+            except Exception as error:
+                # Keep answering with the last chart
+                print(f"Could not refresh the attendance chart: {error}", file=sys.stderr)
+
+    def _fetch(self, month: date) -> None:
+        attendance_chart = self._recoru_session.get_attendance_chart(month)
+        calendar_index = self._calendar_indices.get(month)
+        # Unchanged pages give the same chart object, whose index can be kept
+        if calendar_index is None or calendar_index.attendance_chart is not attendance_chart:
+            self._calendar_indices[month] = CalendarIndex(attendance_chart)
+        if month < current_month():
+            self._incomplete_months.discard(month)
+        else:
+            self._incomplete_months.add(month)
+
+
+class RecoluServer:
+    def __init__(
+        self,
+        recoru_session: RecoruSession,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        refresh_interval: float = DEFAULT_TTL
+    ):
+        self.chart_store = ChartStore(recoru_session, refresh_interval)
+        self._overtime_engine = OvertimeEngine()
+        self._engine_lock = threading.Lock()  # OvertimeEngine is not thread-safe
+        self._stop_event = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self) -> None:
+        """Serve in a background thread"""
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self.chart_store.refresh_forever, args=(self._stop_event,), daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def serve_forever(self) -> None:
+        threading.Thread(target=self.chart_store.refresh_forever, args=(self._stop_event,), daemon=True).start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stop_event.set()
+            self._server.server_close()
+
+    def get_balance(self, first_month: date, last_month: date, exclude_last_day: bool) -> dict:
+        attendance_charts = self.chart_store.get_attendance_charts(first_month, last_month)
+        attendance_chart = self._get_until_today(attendance_charts, last_month, exclude_last_day)
+        with self._engine_lock:
+            overtime_balance, total_workplace_times = self._overtime_engine.get_overtime_balance(attendance_chart)
+        return {
+            "overtimeBalance": str(overtime_balance),
+            "totalWorkplaceTimes": _format_workplace_times(total_workplace_times),
+            "workingDays": sum(
+                self.chart_store.get_calendar_index(month).count_working_days()
+                for month in get_month_range(first_month, last_month)
+            )
+        }
+
+    def get_workplaces(self, first_month: date, last_month: date, exclude_last_day: bool) -> dict:
+        balance = self.get_balance(first_month, last_month, exclude_last_day)
+        return balance["totalWorkplaceTimes"]
+
+    def get_history(self, first_month: date, last_month: date, exclude_last_day: bool) -> dict:
+        attendance_charts = self.chart_store.get_attendance_charts(first_month, last_month)
+        attendance_chart = self._get_until_today(attendance_charts, last_month, exclude_last_day)
+        with self._engine_lock:
+            days, overtime_history, _ = self._overtime_engine.get_overtime_history(attendance_chart)
+        return {
+            "days": days,
+            "overtimeHistory": [str(overtime) for overtime in overtime_history]
+        }
+
+    def get_leave_time(self) -> dict:
+        attendance_chart = self.chart_store.get_calendar_index(current_month()).until(date.today())
+        try:
+            with self._engine_lock:
+                leave_times = self._overtime_engine.get_leave_time(attendance_chart)
+        except NoClockInError:
+            return {"clockedOut": True, "leaveTimes": []}
+        return {
+            "clockedOut": False,
+            "leaveTimes": [
+                {
+                    "includesBreak": leave_time.includes_break,
+                    "minTime": str(leave_time.min_time),
+                    "maxTime": str(leave_time.max_time) if leave_time.max_time is not None else None
+                }
+                for leave_time in leave_times
+            ]
+        }
+
+    @staticmethod
+    def _get_until_today(
+        attendance_charts: list[AttendanceChart],
+        last_month: date,
+        exclude_last_day: bool
+    ) -> AttendanceChart:
+        attendance_chart = time.merge_until_today(attendance_charts, last_month)
+        if exclude_last_day and len(attendance_chart) > 1:
+            attendance_chart = attendance_chart[:-1]
+        return attendance_chart
+
+
+def _format_workplace_times(total_workplace_times: dict[str, Duration]) -> dict[str, str]:
+    return {workplace: str(work_time) for workplace, work_time in total_workplace_times.items()}
+
+
+def _make_handler(server: RecoluServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                match url.path.rstrip("/"):
+                    case "/balance":
+                        self._respond(200, server.get_balance(*_parse_period(query)))
+                    case "/workplaces":
+                        self._respond(200, server.get_workplaces(*_parse_period(query)))
+                    case "/history":
+                        self._respond(200, server.get_history(*_parse_period(query)))
+                    case "/when":
+                        self._respond(200, server.get_leave_time())
+                    case "/metrics":
+                        self._respond_metrics()
+                    case _:
+                        self._respond(404, {"error": "Not found"})
+            except ValueError as error:
+                self._respond(400, {"error": str(error)})
+            except InvalidRecoruLoginError:
+                self._respond(502, {"error": "Invalid RecoRu login information"})
+            except Exception as error:
+                self._respond(502, {"error": f"{type(error).__name__}: {error}"})
+
+        def log_message(self, format, *args):
+            pass
+
+        def _respond(self, status: int, content: dict):
+            self._send(status, json.dumps(content, ensure_ascii=False), "application/json; charset=UTF-8")
+
+        def _respond_metrics(self):
+            profiler = profiling.get_profiler()
+            if profiler is None:
+                self._respond(404, {"error": "Profiling is disabled"})
+                return
+            parsed_charts = server.chart_store.parsed_charts
+            metrics = profiler.to_prometheus() + "\n".join([
+                "# HELP recolul_parsed_chart_hits_total Fetched pages that were unchanged and not parsed again.",
+                "# TYPE recolul_parsed_chart_hits_total counter",
+                f"recolul_parsed_chart_hits_total {parsed_charts.hits}",
+                "# HELP recolul_parsed_chart_misses_total Fetched pages that were parsed.",
+                "# TYPE recolul_parsed_chart_misses_total counter",
+                f"recolul_parsed_chart_misses_total {parsed_charts.misses}"
+            ]) + "\n"
+            self._send(200, metrics, "text/plain; version=0.0.4; charset=UTF-8")
+
+        def _send(self, status: int, text: str, content_type: str):
+            body = text.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def _parse_period(query: dict[str, str]) -> tuple[date, date, bool]:
+    """Query parameters: from=YYYY-MM, to=YYYY-MM, excludeLastDay=true"""
+    last_month = _parse_month(query["to"]) if "to" in query else current_month()
+    first_month = _parse_month(query["from"]) if "from" in query else last_month
+    if last_month > current_month():
+        raise ValueError("'to' can't be a future month")
+    if first_month > last_month:
+        raise ValueError("'from' must be before 'to'")
+    return first_month, last_month, query.get("excludeLastDay", "").lower() in ("1", "true")
+
+
+def _parse_month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
@@ -1,16 +1,32 @@
 import dataclasses
-from collections import defaultdict
-from datetime import datetime
+from collections.abc import Callable
+from datetime import date, datetime
+from functools import lru_cache
 
-from recolul.duration import Duration
+from recolul import profiling
+from recolul.duration import Duration, parse_minutes
 from recolul.errors import NoClockInError
-from recolul.recoru.attendance_chart import AttendanceChart, ChartRow, ChartRowEntry
+from recolul.recoru.attendance_chart import (
+    AttendanceChart,
+    ChartRow,
+    ChartRowEntry,
+    DayType,
+    get_calendar_index,
+    merge_attendance_charts
+)
+from recolul.recoru.months import current_month
 
-_MIN_HOURS_FOR_MANDATORY_BREAK = Duration(6 * 60)
+MIN_HOURS_FOR_MANDATORY_BREAK = Duration(6 * 60)
+DEFAULT_WORKPLACE = "HF Bldg."  # Workplace is empty for paid leaves
 
 
+@profiling.timed("time.until_today")
 def until_today(attendance_chart: AttendanceChart) -> AttendanceChart:
     """Return a slice of the attendance chart that only contains rows until today"""
+    if (calendar_index := get_calendar_index(attendance_chart)) is not None:
+        return calendar_index.until(date.today())
+
+    # Pages without dates
     current_day_of_month = datetime.now().day
     return [
         row for row in attendance_chart
@@ -18,80 +34,48 @@ def until_today(attendance_chart: AttendanceChart) -> AttendanceChart:
     ]
 
 
+def merge_until_today(attendance_charts: list[AttendanceChart], last_month: date) -> AttendanceChart:
+    """Merge the charts of consecutive months. Only the chart of the current month contains future days."""
+    if last_month == current_month():
+        attendance_charts = attendance_charts[:-1] + [until_today(attendance_charts[-1])]
+    return merge_attendance_charts(attendance_charts)
+
+
+def get_leave_work_time(category: str) -> Duration | None:
+    """Work time counted for a leave category, or None if the category isn't a leave"""
+    leave_minutes = _get_leave_minutes(category)
+    return Duration(leave_minutes) if leave_minutes is not None else None
+
+
 def get_entry_work_time(entry: ChartRowEntry) -> Duration:
     """
     Get work time from the column if available,
     else calculate it from clock-in time and current time
     """
-    category = entry.category
-    if category.startswith(
-        ("Half Day Leave", "Flexible Holiday AM", "Flexible Holiday PM")
-    ):
-        return Duration(4 * 60)
-    if category.endswith(("Leave", "Leagve")) or category == "Flexible Holiday":
-        return Duration(8 * 60)
-
-    if not (raw_clock_in_time := entry.clock_in_time):
-        return Duration(0)
-    clock_in_time = Duration.parse(raw_clock_in_time)
-
-    if raw_clock_out_time := entry.clock_out_time:
-        clock_out_time = Duration.parse(raw_clock_out_time)
-    else:
-        # Current day
-        clock_out_time = Duration.now()
-
-    if clock_out_time < clock_in_time:
-        # After midnight
-        clock_out_time += Duration(24 * 60)
-
-    work_time = clock_out_time - clock_in_time
-    break_time = (
-        Duration(60) if work_time >= _MIN_HOURS_FOR_MANDATORY_BREAK
-        else Duration(0)
-    )
-    return work_time - break_time
+    return Duration(_get_entry_work_minutes(entry))
 
 
 def get_row_work_time(row: ChartRow) -> Duration:
-    total_work_time = Duration()
-    for entry in row.entries:
-        total_work_time += get_entry_work_time(entry)
-    return total_work_time
+    return Duration(sum(_get_entry_work_minutes(entry) for entry in row.entries))
 
 
+@profiling.timed("time.get_overtime_history")
 def get_overtime_history(attendance_chart: AttendanceChart) -> tuple[list[str], list[Duration], dict[str, Duration]]:
-    days = []
-    overtime_history = []
-    total_workplace_times = defaultdict(Duration)
-    for row in attendance_chart:
-        day = row.day.text
-        if _is_working_day(row) or _is_swap_day(row):
-            required_time = Duration(8 * 60)
-        else:
-            required_time = Duration(0)
-
-        row_work_time = Duration()
-        for entry in row.entries:
-            entry_work_time = get_entry_work_time(entry)
-            row_work_time += entry_work_time
-
-            workplace = entry.workplace or "HF Bldg."  # Workplace is empty for paid leaves
-            total_workplace_times[workplace] += entry_work_time
-
-        if not (required_time or row_work_time):
-            # Can have work time during holidays
-            continue
-
-        days.append(day)
-        overtime_history.append(row_work_time - required_time)
-
-    return days, overtime_history, total_workplace_times
+    days, overtime_history, total_workplace_minutes = _get_overtime_history_minutes(attendance_chart)
+    return (
+        days,
+        [Duration(minutes) for minutes in overtime_history],
+        {workplace: Duration(minutes) for workplace, minutes in total_workplace_minutes.items()}
+    )
 
 
+@profiling.timed("time.get_overtime_balance")
 def get_overtime_balance(attendance_chart: AttendanceChart) -> tuple[Duration, dict[str, Duration]]:
-    _, history, total_workplace_times = get_overtime_history(attendance_chart)
-    return sum(history, Duration()), total_workplace_times
+    _, history, total_workplace_minutes = _get_overtime_history_minutes(attendance_chart)
+    return (
+        Duration(sum(history)),
+        {workplace: Duration(minutes) for workplace, minutes in total_workplace_minutes.items()}
+    )
 
 
 @dataclasses.dataclass
@@ -101,11 +85,15 @@ class LeaveTime:
     max_time: Duration | None = None
 
 
+@profiling.timed("time.get_leave_time")
 def get_leave_time(attendance_chart: AttendanceChart) -> list[LeaveTime]:
-    day_base_hours = Duration(8 * 60)
     overtime_balance, _ = get_overtime_balance(attendance_chart[:-1])
+    return get_leave_time_from_balance(overtime_balance, attendance_chart[-1])
+
 
-    last_row = attendance_chart[-1]
+def get_leave_time_from_balance(overtime_balance: Duration, last_row: ChartRow) -> list[LeaveTime]:
+    """Leave times of the last row, given the overtime balance of the previous rows"""
+    day_base_hours = Duration(8 * 60)
     last_clock_in = None
     for entry in last_row.entries:
         if entry.clock_in_time and not entry.clock_out_time:
@@ -120,20 +108,20 @@ def get_leave_time(attendance_chart: AttendanceChart) -> list[LeaveTime]:
     required_today = day_base_hours - overtime_balance
     leave_time_without_break = last_clock_in + required_today
     leave_time_with_break = last_clock_in + required_today + Duration(60)
-    if required_today > _MIN_HOURS_FOR_MANDATORY_BREAK:
+    if required_today > MIN_HOURS_FOR_MANDATORY_BREAK:
         # When more than 6 hours must be achieved during the day,
         # add a mandatory 1-hour break time.
         return [
             LeaveTime(includes_break=True, min_time=leave_time_with_break)
         ]
-    if required_today > _MIN_HOURS_FOR_MANDATORY_BREAK - Duration(60):
+    if required_today > MIN_HOURS_FOR_MANDATORY_BREAK - Duration(60):
         # When the required time is between 5 and 6 hours, there is a first interval where
         # the overtime balance becomes positive, and then it becomes negative again when 6
         # hours have been worked because an hour is subtracted for break time.
         first_leave_time = LeaveTime(
             includes_break=False,
             min_time=leave_time_without_break,
-            max_time=last_clock_in + _MIN_HOURS_FOR_MANDATORY_BREAK
+            max_time=last_clock_in + MIN_HOURS_FOR_MANDATORY_BREAK
         )
         second_leave_time = LeaveTime(includes_break=True, min_time=leave_time_with_break)
         return [first_leave_time, second_leave_time]
@@ -142,13 +130,186 @@ def get_leave_time(attendance_chart: AttendanceChart) -> list[LeaveTime]:
         ]
 
 
+def get_required_time(row: ChartRow) -> Duration:
+    return Duration(_get_required_minutes(row))
+
+
+@profiling.timed("time.count_working_days")
 def count_working_days(attendance_chart: AttendanceChart) -> int:
-    return sum(1 for row in attendance_chart if _is_working_day(row))
+    if (calendar_index := get_calendar_index(attendance_chart)) is not None:
+        return calendar_index.count_working_days()
+    return sum(1 for row in attendance_chart if row.day_type is DayType.WORKING)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class MonthSummary:
+    """Everything the front ends show about a chart, computed by get_month_summary"""
+    overtime_balance: Duration
+    total_workplace_times: dict[str, Duration]
+    working_days: int
+    """Working days of the whole chart, including future days"""
+    last_day: ChartRow | None
+    """Row of today, or last row until today"""
+    last_day_work_time: Duration
+    leave_times: list[LeaveTime] | None
+    """Leave times of the last day, None if it isn't in progress"""
+
+    @property
+    def last_day_clock_in(self) -> str:
+        return max(entry.clock_in_time for entry in self.last_day.entries) if self.last_day else ""
+
+
+@profiling.timed("time.get_month_summary")
+def get_month_summary(
+    full_attendance_chart: AttendanceChart,
+    exclude_last_day: bool = False,
+    evaluate: Callable[[ChartRow], "RowResult"] | None = None,
+    today: date | None = None
+) -> MonthSummary:
+    """
+    Summary of the chart, including future days, in a single traversal.
+    The balance and workplace totals are those of the rows until today, without the last of them if exclude_last_day
+    and there are others.
+    Rows are evaluated by evaluate_row, or e.g. by OvertimeEngine.evaluate_row to reuse the results of complete rows.
+    """
+    evaluate = evaluate or evaluate_row
+    today = today or date.today()
+    overtime_minutes = 0  # Before the last row
+    total_workplace_minutes = {}
+    working_days = 0
+    last_row = None
+    last_row_result = None
+    has_previous_rows = False
+    for row in full_attendance_chart:
+        if row.day_type is DayType.WORKING:
+            working_days += 1
+        if (row.date > today) if row.date else (row.day_of_month > today.day):
+            continue
+
+        if last_row_result is not None:
+            _add_row_result(last_row_result, total_workplace_minutes)
+            overtime_minutes += last_row_result.overtime_minutes or 0
+            has_previous_rows = True
+        last_row = row
+        last_row_result = evaluate(row)
+
+    if last_row is None:
+        return MonthSummary(Duration(0), {}, working_days, None, Duration(0), None)
+
+    try:
+        leave_times = get_leave_time_from_balance(Duration(overtime_minutes), last_row)
+    except NoClockInError:
+        leave_times = None
+    if not exclude_last_day or not has_previous_rows:
+        _add_row_result(last_row_result, total_workplace_minutes)
+        overtime_minutes += last_row_result.overtime_minutes or 0
+    return MonthSummary(
+        overtime_balance=Duration(overtime_minutes),
+        total_workplace_times={workplace: Duration(minutes) for workplace, minutes in total_workplace_minutes.items()},
+        working_days=working_days,
+        last_day=last_row,
+        last_day_work_time=Duration(sum(entry_work_minutes for _, entry_work_minutes in last_row_result.workplace_minutes)),
+        leave_times=leave_times
+    )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RowResult:
+    """Overtime of a row in minutes (None if the row doesn't count), and work minutes of each entry per workplace"""
+    overtime_minutes: int | None
+    workplace_minutes: tuple[tuple[str, int], ...]
+
+
+def evaluate_row(row: ChartRow) -> RowResult:
+    required_minutes = _get_required_minutes(row)
+    workplace_minutes = tuple(
+        (entry.workplace or DEFAULT_WORKPLACE, _get_entry_work_minutes(entry))
+        for entry in row.entries
+    )
+    row_work_minutes = sum(entry_work_minutes for _, entry_work_minutes in workplace_minutes)
+    if required_minutes <= 0 and row_work_minutes <= 0:
+        # Can have work time during holidays
+        return RowResult(overtime_minutes=None, workplace_minutes=workplace_minutes)
+    return RowResult(overtime_minutes=row_work_minutes - required_minutes, workplace_minutes=workplace_minutes)
+
+
+def is_row_in_progress(row: ChartRow) -> bool:
+    """Whether the work time of the row depends on the current time"""
+    return any(
+        entry.clock_in_time and not entry.clock_out_time and _get_leave_minutes(entry.category) is None
+        for entry in row.entries
+    )
+
+
+def _get_overtime_history_minutes(
+    attendance_chart: AttendanceChart
+) -> tuple[list[str], list[int], dict[str, int]]:
+    """get_overtime_history in minutes, to avoid allocating a Duration for every operation"""
+    days = []
+    overtime_history = []
+    total_workplace_minutes = {}
+    for row in attendance_chart:
+        required_minutes = _get_required_minutes(row)
+
+        row_work_minutes = 0
+        for entry in row.entries:
+            entry_work_minutes = _get_entry_work_minutes(entry)
+            row_work_minutes += entry_work_minutes
+
+            workplace = entry.workplace or DEFAULT_WORKPLACE
+            total_workplace_minutes[workplace] = total_workplace_minutes.get(workplace, 0) + entry_work_minutes
+
+        if required_minutes <= 0 and row_work_minutes <= 0:
+            # Can have work time during holidays
+            continue
 
+        days.append(row.day.text)
+        overtime_history.append(row_work_minutes - required_minutes)
 
-def _is_swap_day(row: ChartRow) -> bool:
-    return "swap day" in row.memo.lower()
+    return days, overtime_history, total_workplace_minutes
 
 
-def _is_working_day(row: ChartRow) -> bool:
-    return row.day.text and row.day.color not in ["blue", "red"]
+def _add_row_result(row_result: RowResult, total_workplace_minutes: dict[str, int]) -> None:
+    for workplace, entry_work_minutes in row_result.workplace_minutes:
+        total_workplace_minutes[workplace] = total_workplace_minutes.get(workplace, 0) + entry_work_minutes
+
+
+def _get_entry_work_minutes(entry: ChartRowEntry) -> int:
+    if (leave_minutes := _get_leave_minutes(entry.category)) is not None:
+        return leave_minutes
+
+    if not (raw_clock_in_time := entry.clock_in_time):
+        return 0
+    clock_in_minutes = parse_minutes(raw_clock_in_time)
+
+    if raw_clock_out_time := entry.clock_out_time:
+        clock_out_minutes = parse_minutes(raw_clock_out_time)
+    else:
+        # Current day
+        clock_out_minutes = Duration.now().minutes
+
+    if clock_out_minutes < clock_in_minutes:
+        # After midnight
+        clock_out_minutes += 24 * 60
+
+    work_minutes = clock_out_minutes - clock_in_minutes
+    break_minutes = 60 if work_minutes >= MIN_HOURS_FOR_MANDATORY_BREAK.minutes else 0
+    return work_minutes - break_minutes
+
+
+def _get_required_minutes(row: ChartRow) -> int:
+    if row.day_type is DayType.WORKING or row.day_type is DayType.SWAP_DAY:
+        return 8 * 60
+    return 0
+
+
+@lru_cache(maxsize=256)
+def _get_leave_minutes(category: str) -> int | None:
+    if category.startswith(
+        ("Half Day Leave", "Flexible Holiday AM", "Flexible Holiday PM")
+    ):
+        return 4 * 60
+    if category.endswith(("Leave", "Leagve")) or category == "Flexible Holiday":
+        return 8 * 60
+    return None
+
@@ -0,0 +1,100 @@
+"""
+Live leave time, for `recolul when --watch`.
+
+The chart is refetched every `interval` seconds over the same session. In between, the status is updated
+every `tick` seconds from the last chart: complete rows are evaluated once, only the row in progress
+is evaluated again against the current time.
+"""
+import sys
+import time
+from collections.abc import Callable
+from typing import TextIO
+
+from recolul.duration import Duration
+from recolul.errors import NoClockInError
+from recolul.incremental import OvertimeEngine
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.time import LeaveTime, get_row_work_time, until_today
+
+DEFAULT_TICK = 1.0  # Seconds
+
+
+def watch_leave_time(
+    get_attendance_chart: Callable[[], AttendanceChart],
+    interval: float,
+    output: TextIO = sys.stdout,
+    tick: float = DEFAULT_TICK,
+    sleep: Callable[[float], None] = time.sleep
+) -> None:
+    """Show the leave time of today until the user clocks out"""
+    overtime_engine = OvertimeEngine()
+    attendance_chart = until_today(get_attendance_chart())
+    fetched_at = time.monotonic()
+    fetch_error = None
+    status_line = _StatusLine(output)
+    while True:
+        try:
+            status = format_status(overtime_engine, attendance_chart)
+        except NoClockInError:
+            status_line.finish("You have clocked out.")
+            return
+        if fetch_error:
+            status += f"  (could not refresh: {fetch_error})"
+        status_line.update(status)
+
+        sleep(tick)
+        if time.monotonic() - fetched_at >= interval:
+            try:
+                attendance_chart = until_today(get_attendance_chart())
+                fetch_error = None
+            except Exception as error:
+                # Keep following the last chart
+                fetch_error = error
+            fetched_at = time.monotonic()
+
+
+def format_status(overtime_engine: OvertimeEngine, attendance_chart: AttendanceChart) -> str:
+    """Raise NoClockInError when today isn't in progress"""
+    leave_times = overtime_engine.get_leave_time(attendance_chart)
+    overtime_balance, _ = overtime_engine.get_overtime_balance(attendance_chart)
+    now = Duration.now()
+    status = (
+        f"{now}  Worked today: {get_row_work_time(attendance_chart[-1])}  Overtime balance: {overtime_balance}  "
+    )
+    if len(leave_times) == 1:
+        break_msg = "break time included" if leave_times[0].includes_break else "break time not included"
+        return status + f"Leave at {leave_times[0].min_time} ({break_msg}, {_format_remaining(leave_times[0], now)})"
+    return status + (
+        f"Leave between {leave_times[0].min_time} and {leave_times[0].max_time} "
+        f"({_format_remaining(leave_times[0], now)}), or after {leave_times[1].min_time}"
+    )
+
+
+def _format_remaining(leave_time: LeaveTime, now: Duration) -> str:
+    remaining = leave_time.min_time - now
+    return f"in {remaining}" if remaining else "now"
+
+
+class _StatusLine:
+    """Rewrite a single line on terminals, print a line per change otherwise"""
+    def __init__(self, output: TextIO):
+        self._output = output
+        self._in_place = output.isatty()
+        self._text = None
+
+    def update(self, text: str) -> None:
+        if text == self._text:
+            return
+        self._text = text
+        if self._in_place:
+            # Back to the start of the line, and clear it
+            self._output.write(f"\r\033[K{text}")
+        else:
+            self._output.write(f"{text}\n")
+        self._output.flush()
+
+    def finish(self, text: str) -> None:
+        if self._in_place and self._text is not None:
+            self._output.write("\n")
+        self._output.write(f"{text}\n")
+        self._output.flush()
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from benchmarks.mock_server import MockRecoruServer
+from recolul.batch import run_batch_async
+from recolul.config import Config
+from recolul.errors import InvalidRecoruLoginError
+from recolul.recoru.months import add_months, current_month
+from recolul.recoru.recoru_session import RecoruSession
+
+aiohttp = pytest.importorskip("aiohttp")
+async_recoru_session = pytest.importorskip("recolul.recoru.async_recoru_session")
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockRecoruServer() as mock_server:
+        yield mock_server
+
+
+def test_same_chart_as_recoru_session(server: MockRecoruServer):
+    async def fetch():
+        async with async_recoru_session.AsyncRecoruSession(
+            "100000", "alice", "secret", base_url=server.base_url
+        ) as recoru_session:
+            return await recoru_session.get_attendance_charts(add_months(current_month(), -1), current_month())
+
+    charts = asyncio.run(fetch())
+    with RecoruSession("100000", "alice", "secret", base_url=server.base_url) as recoru_session:
+        assert charts == recoru_session.get_attendance_charts(add_months(current_month(), -1), current_month())
+
+
+def test_invalid_login(server: MockRecoruServer):
+    async def fetch():
+        async with async_recoru_session.AsyncRecoruSession(
+            "100000", "alice", "wrong", base_url=server.base_url, max_retries=0
+        ) as recoru_session:
+            await recoru_session.get_attendance_chart()
+
+    with pytest.raises(InvalidRecoruLoginError):
+        asyncio.run(fetch())
+
+
+def test_retry_server_errors():
+    async def fetch(contract_id: str):
+        async with async_recoru_session.AsyncRecoruSession(
+            contract_id, "alice", "secret", base_url=flaky_server.base_url, max_retries=10, backoff=0.01
+        ) as recoru_session:
+            return await recoru_session.get_attendance_chart()
+
+    async def fetch_all():
+        return await asyncio.gather(*(fetch(f"{i:06}") for i in range(10)))
+
+    with MockRecoruServer(error_rate=0.3, seed=1) as flaky_server:
+        charts = asyncio.run(fetch_all())
+        assert flaky_server.login_count == 10
+    assert all(chart[0].day_of_month == 1 for chart in charts)
+
+
+def test_give_up_after_max_retries():
+    async def fetch():
+        async with async_recoru_session.AsyncRecoruSession(
+            "100000", "alice", "secret", base_url=broken_server.base_url, max_retries=2, backoff=0.01
+        ) as recoru_session:
+            await recoru_session.get_attendance_chart()
+
+    with MockRecoruServer(error_rate=1.0) as broken_server:
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(fetch())
+        assert broken_server.request_count == 3
+
+
+def test_run_batch_async(server: MockRecoruServer):
+    configs = [
+        Config("100000", "alice", "secret", server.base_url),
+        Config("100000", "bob", "wrong", server.base_url)
+    ]
+    results = asyncio.run(run_batch_async(configs))
+    assert results[0].ok
+    assert results[0].working_days > 0
+    assert results[1].error == "Invalid RecoRu login information"
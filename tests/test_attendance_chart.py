@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+import pytest
+
+from recolul import time
+from recolul.duration import Duration
+from recolul.recoru.attendance_chart import CalendarIndex, ChartCell, ChartColumn, ChartRow, ChartRowEntry, DayType
+from tests.utils import load_mock_attendance_chart
+
+
+def test_entries_are_plain_records():
+    chart = load_mock_attendance_chart("multiple_entry_rows.html")
+    row = chart[0]
+    assert row.day == ChartCell(text="8/7(月)", color="#666")
+    assert row.day_of_month == 7
+    assert [entry.workplace for entry in row.entries] == ["WFH", "HF Bldg."]
+
+    entry = row.entries[1]
+    assert entry[ChartColumn.DATE] is entry.day
+    assert entry[ChartColumn.START] == ChartCell("09:18")
+    assert entry[ChartColumn.END].text == "17:16"
+    assert not hasattr(entry, "__dict__")
+    with pytest.raises(AttributeError):
+        entry.workplace = "WFH"
+
+
+def test_row_from_entry_list():
+    entries = [ChartRowEntry(day=ChartCell("8/7(月)", "#666"), workplace="WFH"), ChartRowEntry(day=ChartCell(""))]
+    row = ChartRow(entries)
+    assert row.entries == tuple(entries)
+    assert row == ChartRow(tuple(entries))
+    assert row.day_of_month == 7
+
+
+def test_workplaces_are_interned():
+    chart = load_mock_attendance_chart("multiple_entry_rows.html")
+    workplaces = [entry.workplace for row in chart for entry in row.entries if entry.workplace == "HF Bldg."]
+    assert len(workplaces) > 1
+    assert all(workplace is workplaces[0] for workplace in workplaces)
+
+
+def test_calendar_index():
+    chart = load_mock_attendance_chart("worked_holiday.html")
+    assert [row.date for row in chart] == [date(2023, 11, day) for day in range(19, 26)]
+    assert [row.day_type for row in chart] == [
+        DayType.WEEKEND,
+        DayType.WORKING,
+        DayType.WORKING,
+        DayType.WORKING,
+        DayType.HOLIDAY,  # Labor Thanksgiving Day
+        DayType.WORKING,
+        DayType.WEEKEND
+    ]
+
+    calendar_index = CalendarIndex(chart)
+    assert calendar_index.get_row(date(2023, 11, 23)) is chart[4]
+    assert calendar_index.get_row(date(2023, 11, 30)) is None
+    assert calendar_index.until(date(2023, 11, 22)) == chart[:4]
+    assert calendar_index.until(date(2023, 11, 1)) == []
+    assert calendar_index.count_working_days() == time.count_working_days(chart) == 4
+    assert calendar_index.count_working_days(until=date(2023, 11, 23)) == 3
+
+
+def test_swap_day():
+    entry = ChartRowEntry(day=ChartCell("11/26(日)", "red"), memo="Swap Day for 11/29")
+    row = ChartRow((entry,), date(2023, 11, 26))
+    assert row.day_type is DayType.SWAP_DAY
+    assert time.get_required_time(row) == Duration(8 * 60)
+
+
+def test_until_today():
+    today = date.today()
+    rows = [
+        ChartRow((ChartRowEntry(day=ChartCell(f"{day.month}/{day.day}(月)", "#666")),), day)
+        for day in (today - timedelta(days=1), today, today + timedelta(days=1))
+    ]
+    assert time.until_today(rows) == rows[:2]
+
+    # A row without a date: falls back to the days of the month
+    rows.insert(1, ChartRow((ChartRowEntry(day=ChartCell(f"{today.month}/{today.day}(月)", "#666")),)))
+    assert time.until_today(rows) == [row for row in rows if row.day_of_month <= today.day]
+    assert time.count_working_days(rows) == 4
@@ -0,0 +1,45 @@
+from recolul import time
+from recolul.batch import read_credentials, run_batch
+from recolul.config import Config
+from recolul.errors import InvalidRecoruLoginError
+from tests.utils import load_mock_attendance_chart
+
+
+def test_read_credentials(tmp_path):
+    path = tmp_path / "credentials.csv"
+    path.write_text(
+        "contractId,authId,password\n"
+        "123456,alice@example.com,secret\n"
+        "\n"
+        '123456,bob@example.com,"pass,word"\n',
+        encoding="UTF-8"
+    )
+    assert read_credentials(str(path)) == [
+        Config(recoru_contract_id="123456", recoru_auth_id="alice@example.com", recoru_password="secret"),
+        Config(recoru_contract_id="123456", recoru_auth_id="bob@example.com", recoru_password="pass,word")
+    ]
+
+
+def test_run_batch_isolates_errors():
+    chart = load_mock_attendance_chart("multiple_entry_rows.html")
+
+    def get_attendance_chart(config: Config):
+        if config.recoru_password == "wrong":
+            raise InvalidRecoruLoginError()
+        return chart
+
+    configs = [
+        Config(recoru_contract_id="1", recoru_auth_id="alice", recoru_password="secret"),
+        Config(recoru_contract_id="1", recoru_auth_id="bob", recoru_password="wrong"),
+        Config(recoru_contract_id="2", recoru_auth_id="carol", recoru_password="secret")
+    ]
+    results = run_batch(configs, max_workers=2, get_attendance_chart=get_attendance_chart)
+
+    assert [result.auth_id for result in results] == ["alice", "bob", "carol"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].error == "Invalid RecoRu login information"
+
+    expected_balance, expected_workplace_times = time.get_overtime_balance(time.until_today(chart))
+    assert results[0].overtime_balance == expected_balance
+    assert results[0].total_workplace_times == expected_workplace_times
+    assert results[0].working_days == 5
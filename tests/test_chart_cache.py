@@ -0,0 +1,60 @@
+import os
+import time
+from datetime import date, datetime
+
+from recolul.recoru.chart_cache import ChartCache
+from recolul.recoru.months import current_month
+from recolul.recoru.recoru_session import RecoruSession
+from tests.utils import read_resource
+
+
+def _age_cache_files(directory, seconds: float):
+    for filename in os.listdir(directory):
+        path = os.path.join(directory, filename)
+        mtime = time.time() - seconds
+        os.utime(path, (mtime, mtime))
+
+
+def test_current_month_expires(tmp_path):
+    cache = ChartCache(str(tmp_path), ttl=60)
+    cache.set("123", "alice", current_month(), "<html></html>")
+    assert cache.get("123", "alice", current_month()) == "<html></html>"
+    assert cache.get("123", "bob", current_month()) is None
+
+    _age_cache_files(tmp_path, 120)
+    assert cache.get("123", "alice", current_month()) is None
+
+
+def test_past_month_never_expires(tmp_path):
+    cache = ChartCache(str(tmp_path), ttl=0)
+    cache.set("123", "alice", date(2023, 8, 1), "<html></html>")
+    _age_cache_files(tmp_path, 365 * 24 * 60 * 60)
+    assert cache.get("123", "alice", date(2023, 8, 1)) == "<html></html>"
+
+
+def test_past_month_fetched_during_month_expires(tmp_path):
+    cache = ChartCache(str(tmp_path), ttl=60)
+    cache.set("123", "alice", date(2023, 8, 1), "<html></html>")
+    # Fetched on Aug 15, the rest of the month may have changed since
+    fetched_at = datetime(2023, 8, 15, 18).timestamp()
+    for filename in os.listdir(tmp_path):
+        os.utime(tmp_path / filename, (fetched_at, fetched_at))
+    assert cache.get("123", "alice", date(2023, 8, 1)) is None
+
+
+def test_refresh(tmp_path):
+    ChartCache(str(tmp_path)).set("123", "alice", date(2023, 8, 1), "<html>old</html>")
+    cache = ChartCache(str(tmp_path), refresh=True)
+    assert cache.get("123", "alice", date(2023, 8, 1)) is None
+    cache.set("123", "alice", date(2023, 8, 1), "<html>new</html>")
+    assert ChartCache(str(tmp_path)).get("123", "alice", date(2023, 8, 1)) == "<html>new</html>"
+
+
+def test_session_uses_cache(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    cache.set("123", "alice", current_month(), read_resource("multiple_entry_rows.html"))
+
+    # Not used as a context manager: any network access would fail
+    recoru_session = RecoruSession(contract_id="123", auth_id="alice", password="secret", cache=cache)
+    chart = recoru_session.get_attendance_chart()
+    assert [row.day.text for row in chart][:2] == ["8/7(月)", "8/8(火)"]
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import get_cli_environment
+
+# Print the heavy modules imported by a command
+_SCRIPT = """
+import sys
+from recolul import cli
+sys.argv = ["recolul", *sys.argv[1:]]
+try:
+    cli.main()
+except SystemExit:
+    pass
+print(sorted(module for module in ("plotly", "requests", "bs4", "asyncio") if module in sys.modules))
+"""
+
+
+@pytest.mark.parametrize("args, allowed_modules", [
+    (["--version"], []),
+    (["when"], ["bs4"])  # The cached chart still needs to be parsed
+])
+def test_lazy_imports(tmp_path, args: list[str], allowed_modules: list[str]):
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, *args],
+        env=get_cli_environment(str(tmp_path)),
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    assert result.stdout.splitlines()[-1] == str(allowed_modules)
@@ -0,0 +1,60 @@
+import pytest
+
+from recolul import time
+from recolul.duration import Duration
+from tests.utils import load_mock_attendance_chart
+
+np = pytest.importorskip("numpy")
+columnar = pytest.importorskip("recolul.columnar")
+
+FIXTURES = [
+    "clock_out_after_midnight.html",
+    "multiple_entry_rows.html",
+    "unworked_wednesday.html",
+    "worked_holiday.html"
+]
+
+
+@pytest.mark.parametrize("filename", FIXTURES)
+def test_overtime_history_matches(filename: str):
+    chart = load_mock_attendance_chart(filename)
+    days, overtime_history, total_workplace_times = columnar.get_overtime_history(
+        columnar.ColumnarChart.from_chart(chart)
+    )
+    expected_days, expected_history, expected_workplace_times = time.get_overtime_history(chart)
+    assert days == expected_days
+    assert [Duration(int(minutes)) for minutes in overtime_history] == expected_history
+    assert total_workplace_times == expected_workplace_times
+    assert list(total_workplace_times) == list(expected_workplace_times)
+
+
+def test_in_progress_entry():
+    chart = load_mock_attendance_chart("when_break.html")
+    now = Duration.parse("18:00")
+    _, overtime_history, _ = columnar.get_overtime_history(columnar.ColumnarChart.from_chart(chart), now=now)
+    last_clock_in = Duration.parse(chart[-1].entries[-1].clock_in_time)
+    assert overtime_history[-1] == (now - last_clock_in - Duration(60) - Duration(8 * 60)).minutes
+
+
+def test_stacked_balances():
+    charts = [load_mock_attendance_chart(filename) for filename in FIXTURES]
+    stacked = columnar.ColumnarChart.stack([columnar.ColumnarChart.from_chart(chart) for chart in charts])
+    balances = columnar.get_overtime_balances(stacked)
+    assert [Duration(int(minutes)) for minutes in balances] == [
+        time.get_overtime_balance(chart)[0] for chart in charts
+    ]
+
+    total_workplace_times = columnar.get_total_workplace_times(stacked)
+    assert total_workplace_times["WFH"] == sum(
+        (time.get_overtime_balance(chart)[1].get("WFH", Duration()) for chart in charts),
+        Duration()
+    )
+
+
+def test_stacked_empty_charts():
+    chart = columnar.ColumnarChart.from_chart(load_mock_attendance_chart("worked_holiday.html"))
+    empty = columnar.ColumnarChart.from_chart([])
+    balances = columnar.get_overtime_balances(columnar.ColumnarChart.stack([empty, chart, empty]))
+    assert [Duration(int(minutes)) for minutes in balances] == [
+        Duration(), columnar.get_overtime_balance(chart)[0], Duration()
+    ]
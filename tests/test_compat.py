@@ -0,0 +1,35 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _get_minimum_python() -> str | None:
+    """Oldest interpreter installed here that setup.cfg supports and that is older than the running one"""
+    with open(os.path.join(_ROOT, "setup.cfg"), encoding="UTF-8") as setup_cfg:
+        minimum_minor = int(re.search(r"python_requires = >=3\.(\d+)", setup_cfg.read()).group(1))
+    for minor in range(minimum_minor, sys.version_info.minor):
+        executable = shutil.which(f"python3.{minor}")
+        # e.g. pyenv shims of versions that aren't installed
+        if executable and subprocess.run([executable, "-c", ""], capture_output=True).returncode == 0:
+            return executable
+    return None
+
+
+def test_compiles_on_minimum_python():
+    """The tests may run on a newer Python than the oldest supported one, e.g. with its f-string syntax"""
+    executable = _get_minimum_python()
+    if executable is None:
+        pytest.skip("No older supported Python installed")
+    result = subprocess.run(
+        [executable, "-m", "compileall", "-q", "recolul", "gui", "benchmarks", "tests"],
+        cwd=_ROOT,
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
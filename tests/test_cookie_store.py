@@ -0,0 +1,72 @@
+import stat
+
+from requests.cookies import RequestsCookieJar
+
+from recolul.recoru.cookie_store import CookieStore
+from recolul.recoru.recoru_session import RecoruSession
+from tests.utils import MockResponse, read_resource
+
+
+def _make_session(cookie_store: CookieStore, gadget_responses: list[str]) -> tuple[RecoruSession, list[str]]:
+    calls = []
+    recoru_session = RecoruSession(contract_id="123", auth_id="alice", password="secret", cookie_store=cookie_store)
+
+    def login():
+        calls.append("login")
+        recoru_session._logged_in = True
+        recoru_session._login_count += 1
+
+    def load_attendance_chart_gadget(month):
+        calls.append("gadget")
+        return MockResponse(gadget_responses.pop(0))
+
+    recoru_session._login = login
+    recoru_session._load_attendance_chart_gadget = load_attendance_chart_gadget
+    return recoru_session, calls
+
+
+def test_save_and_load(tmp_path):
+    cookie_store = CookieStore(str(tmp_path))
+    cookie_jar = RequestsCookieJar()
+    cookie_jar.set("JSESSIONID", "abc", domain="app.recoru.in", path="/ap")
+    cookie_store.save("123", "alice", cookie_jar)
+
+    (path,) = tmp_path.iterdir()
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    loaded_cookie_jar = RequestsCookieJar()
+    assert cookie_store.load("123", "alice", loaded_cookie_jar)
+    assert loaded_cookie_jar.get("JSESSIONID", domain="app.recoru.in", path="/ap") == "abc"
+    assert not cookie_store.load("123", "bob", RequestsCookieJar())
+
+
+def test_restored_session_skips_login(tmp_path):
+    cookie_store = CookieStore(str(tmp_path))
+    cookie_jar = RequestsCookieJar()
+    cookie_jar.set("JSESSIONID", "abc", domain="app.recoru.in", path="/ap")
+    cookie_store.save("123", "alice", cookie_jar)
+
+    recoru_session, calls = _make_session(cookie_store, [read_resource("when_break.html")])
+    with recoru_session:
+        assert recoru_session.get_attendance_chart()
+    assert calls == ["gadget"]
+
+
+def test_expired_session_logs_in_again(tmp_path):
+    cookie_store = CookieStore(str(tmp_path))
+    cookie_jar = RequestsCookieJar()
+    cookie_jar.set("JSESSIONID", "expired", domain="app.recoru.in", path="/ap")
+    cookie_store.save("123", "alice", cookie_jar)
+
+    login_page = "<form id=\"loginForm\"></form>"
+    recoru_session, calls = _make_session(cookie_store, [login_page, read_resource("when_break.html")])
+    with recoru_session:
+        assert recoru_session.get_attendance_chart()
+    assert calls == ["gadget", "login", "gadget"]
+
+
+def test_no_cookies_logs_in(tmp_path):
+    recoru_session, calls = _make_session(CookieStore(str(tmp_path)), [read_resource("when_break.html")])
+    with recoru_session:
+        assert recoru_session.get_attendance_chart()
+    assert calls == ["login", "gadget"]
@@ -0,0 +1,19 @@
+import pytest
+
+from recolul.duration import Duration
+
+
+def test_parse():
+    assert Duration.parse("08:25") == Duration(8 * 60 + 25)
+    assert Duration.parse("") == Duration(0)
+    assert Duration.parse_many(["01:00", "", "10:05"]) == [Duration(60), Duration(0), Duration(605)]
+
+
+def test_hash():
+    assert len({Duration(60), Duration.parse("01:00"), Duration(61)}) == 2
+    assert Duration(60) != Duration(61)
+
+
+def test_slots():
+    with pytest.raises(AttributeError):
+        Duration(60).seconds = 0
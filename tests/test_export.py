@@ -0,0 +1,54 @@
+import pytest
+
+from recolul import time
+from recolul.config import Config
+from tests.utils import load_mock_attendance_chart
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+export = pytest.importorskip("recolul.export")
+
+
+def test_overtime_history(tmp_path):
+    chart = load_mock_attendance_chart("multiple_entry_rows.html")
+    with export.ExportWriter(str(tmp_path)) as writer:
+        writer.write_chart("100000", "alice", chart)
+
+    overtime = pq.read_table(tmp_path / "overtime.parquet").to_pydict()
+    days, overtime_history, _ = time.get_overtime_history(chart)
+    assert overtime["day"] == days
+    assert overtime["overtime_minutes"] == [overtime.minutes for overtime in overtime_history]
+    assert set(overtime["auth_id"]) == {"alice"}
+
+    entries = pq.read_table(tmp_path / "entries.parquet").to_pydict()
+    assert len(entries["workplace"]) == sum(len(row.entries) for row in chart)
+    _, total_workplace_times = time.get_overtime_balance(chart)
+    for workplace, total_work_time in total_workplace_times.items():
+        assert sum(
+            work_minutes for entry_workplace, work_minutes in zip(entries["workplace"], entries["work_minutes"])
+            if entry_workplace == workplace
+        ) == total_work_time.minutes
+
+
+def test_streamed_batches(tmp_path):
+    charts = {
+        "alice": load_mock_attendance_chart("multiple_entry_rows.html"),
+        "bob": load_mock_attendance_chart("worked_holiday.html")
+    }
+    configs = [Config("100000", auth_id, "secret") for auth_id in ["alice", "bob", "carol"]]
+
+    def get_attendance_chart(config: Config):
+        return charts[config.recoru_auth_id]
+
+    with export.ExportWriter(str(tmp_path), file_format="arrow", batch_size=4) as writer:
+        errors = export.export_accounts(configs, writer, get_attendance_chart, max_workers=2)
+    assert list(errors) == [("100000", "carol")]
+
+    with pa.ipc.open_stream(tmp_path / "overtime.arrows") as reader:
+        batches = list(reader)
+    assert max(batch.num_rows for batch in batches) == 4
+    overtime = pa.Table.from_batches(batches).to_pydict()
+    assert overtime["auth_id"] == (
+        ["alice"] * len(time.get_overtime_history(charts["alice"])[0])
+        + ["bob"] * len(time.get_overtime_history(charts["bob"])[0])
+    )
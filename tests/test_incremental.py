@@ -0,0 +1,54 @@
+import pytest
+
+from recolul import time
+from recolul.duration import Duration
+from recolul.incremental import OvertimeEngine
+from tests.utils import load_mock_attendance_chart
+
+
+@pytest.mark.parametrize("filename", ["multiple_entry_rows.html", "worked_holiday.html", "clock_out_after_midnight.html"])
+def test_same_results_as_time(filename: str):
+    chart = load_mock_attendance_chart(filename)
+    engine = OvertimeEngine()
+    for _ in range(2):
+        assert engine.get_overtime_history(chart) == time.get_overtime_history(chart)
+        assert engine.get_overtime_balance(chart) == time.get_overtime_balance(chart)
+    assert engine.misses == len(chart)
+
+
+def test_only_new_rows_are_evaluated():
+    chart = load_mock_attendance_chart("multiple_entry_rows.html")
+    engine = OvertimeEngine()
+    engine.get_overtime_balance(chart[:-1])
+    assert engine.misses == len(chart) - 1
+
+    # Same content, fetched again
+    refreshed_chart = load_mock_attendance_chart("multiple_entry_rows.html")
+    assert engine.get_overtime_balance(refreshed_chart) == time.get_overtime_balance(refreshed_chart)
+    assert engine.misses == len(chart)
+
+    # Edited row
+    edited_chart = [chart[1], *chart[1:]]
+    assert engine.get_overtime_balance(edited_chart) == time.get_overtime_balance(edited_chart)
+    assert engine.misses == len(chart)
+    assert engine.hits == len(edited_chart)
+
+
+@pytest.mark.parametrize("filename", ["when_break.html", "when_no_break.html", "when_double_leave.html"])
+def test_leave_time(filename: str):
+    chart = load_mock_attendance_chart(filename)
+    assert OvertimeEngine().get_leave_time(chart) == time.get_leave_time(chart)
+
+
+def test_row_in_progress_is_reevaluated(monkeypatch):
+    chart = load_mock_attendance_chart("when_break.html")
+    engine = OvertimeEngine()
+
+    monkeypatch.setattr(Duration, "now", classmethod(lambda cls: cls.parse("15:00")))
+    first_balance, _ = engine.get_overtime_balance(chart)
+    monkeypatch.setattr(Duration, "now", classmethod(lambda cls: cls.parse("15:30")))
+    second_balance, _ = engine.get_overtime_balance(chart)
+
+    assert second_balance - first_balance == Duration(30)
+    assert engine.misses == 1
+    assert engine.hits == 0
@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+from benchmarks.mock_server import MockRecoruServer
+from recolul import time
+from recolul.errors import InvalidRecoruLoginError
+from recolul.recoru.months import add_months, current_month
+from recolul.recoru.recoru_session import RecoruSession
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockRecoruServer() as mock_server:
+        yield mock_server
+
+
+def test_fetch_current_month(server: MockRecoruServer):
+    with RecoruSession("100000", "alice", "secret", base_url=server.base_url) as recoru_session:
+        chart = recoru_session.get_attendance_chart()
+    assert chart[0].day_of_month == 1
+    today_row = time.until_today(chart)[-1]
+    assert today_row.day_of_month == date.today().day
+    # Today is in progress
+    assert any(entry.clock_in_time and not entry.clock_out_time for entry in today_row.entries)
+
+
+def test_fetch_past_months(server: MockRecoruServer):
+    with RecoruSession("100000", "alice", "secret", base_url=server.base_url) as recoru_session:
+        charts = recoru_session.get_attendance_charts(add_months(current_month(), -2), current_month())
+        assert recoru_session.get_attendance_chart() is not None
+    assert len(charts) == 3
+    for i, chart in enumerate(charts):
+        assert chart[0].day.text.startswith(f"{add_months(current_month(), i - 2).month}/1(")
+
+
+def test_invalid_login(server: MockRecoruServer):
+    with RecoruSession("100000", "alice", "wrong", base_url=server.base_url) as recoru_session:
+        with pytest.raises(InvalidRecoruLoginError):
+            recoru_session.get_attendance_chart()
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.recoru.parsers import check_parser, get_available_parsers
+from recolul.recoru.recoru_session import RecoruSession
+from tests.utils import RESOURCES_FOLDER
+
+FIXTURES = sorted(os.listdir(RESOURCES_FOLDER))
+
+
+def _to_tuples(chart: AttendanceChart) -> list[tuple]:
+    return [
+        (
+            row.day.text,
+            row.day.color,
+            row.day_of_month,
+            row.memo,
+            [
+                (entry.workplace, entry.category, entry.clock_in_time, entry.clock_out_time, entry.work_time)
+                for entry in row.entries
+            ]
+        )
+        for row in chart
+    ]
+
+
+@pytest.mark.parametrize("filename", FIXTURES)
+@pytest.mark.parametrize("parser", get_available_parsers())
+def test_parsers_are_identical(parser: str, filename: str):
+    path = os.path.join(RESOURCES_FOLDER, filename)
+    reference = RecoruSession.read_attendance_chart_file(path, parser="html.parser")
+    assert _to_tuples(RecoruSession.read_attendance_chart_file(path, parser=parser)) == _to_tuples(reference)
+
+
+def test_check_parser():
+    assert check_parser("html.parser") == "html.parser"
+    with pytest.raises(ValueError):
+        check_parser("regex")
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+from recolul.duration import Duration
+from recolul.planner import Scenario, get_leave_plan, get_leave_plans
+from recolul.recoru.attendance_chart import ChartCell, ChartRow, ChartRowEntry
+from tests.utils import load_mock_attendance_chart
+
+MONDAY = date(2024, 3, 4)
+
+
+def _row(day: date, clock_in_time: str = "", clock_out_time: str = "", category: str = "") -> ChartRow:
+    color = "blue" if day.weekday() == 5 else "red" if day.weekday() == 6 else "#666"
+    entry = ChartRowEntry(
+        day=ChartCell(f"{day.month}/{day.day}(月)", color),
+        category=category,
+        clock_in_time=clock_in_time,
+        clock_out_time=clock_out_time
+    )
+    return ChartRow((entry,), day)
+
+
+def test_today_matches_leave_time():
+    chart = load_mock_attendance_chart("when_break.html")
+    for plan in get_leave_plans(chart, today=chart[-1].date):
+        assert [(day.leave_time, day.includes_break) for day in plan.days] == [(Duration.parse("18:31"), True)]
+
+    chart = load_mock_attendance_chart("when_no_break.html")
+    plan = get_leave_plan(chart, today=chart[-1].date)
+    assert [(day.leave_time, day.includes_break) for day in plan.days] == [(Duration.parse("13:39"), False)]
+
+
+def test_even_spread():
+    chart = [
+        # 1 hour behind
+        _row(MONDAY, "09:00", "17:00"),
+        # Today, in progress
+        _row(MONDAY + timedelta(days=1), "10:00"),
+        _row(MONDAY + timedelta(days=2)),
+        _row(MONDAY + timedelta(days=3), category="Paid Leave"),
+        _row(MONDAY + timedelta(days=4), category="Half Day Leave AM"),
+        _row(MONDAY + timedelta(days=5))  # Saturday
+    ]
+    plan = get_leave_plan(chart, Scenario.EVEN, clock_in=Duration.parse("08:30"), today=chart[1].date)
+    assert plan.overtime_balance == -Duration(60)
+    assert [day.row for day in plan.days] == [chart[1], chart[2], chart[4]]
+    assert [day.work_time for day in plan.days] == [Duration(8 * 60 + 20), Duration(8 * 60 + 20), Duration(4 * 60 + 20)]
+    assert [day.leave_time for day in plan.days] == [
+        Duration.parse("19:20"),
+        Duration.parse("17:50"),
+        # Less than 6 hours, no break
+        Duration.parse("12:50")
+    ]
+    assert plan.final_balance == Duration(0)
+
+
+def test_front_loaded():
+    chart = [_row(MONDAY, "09:00", "21:00"), *(_row(MONDAY + timedelta(days=day)) for day in range(1, 4))]
+    plan = get_leave_plan(chart, Scenario.FRONT_LOADED, today=chart[1].date)
+    # 3 hours ahead, all used on the first remaining day
+    assert plan.overtime_balance == Duration(3 * 60)
+    assert [day.work_time for day in plan.days] == [Duration(5 * 60), Duration(8 * 60), Duration(8 * 60)]
+    assert [day.includes_break for day in plan.days] == [False, True, True]
+    assert plan.final_balance == Duration(0)
+
+
+def test_max_work_time():
+    chart = [_row(MONDAY, "09:00", "10:00"), _row(MONDAY + timedelta(days=1))]
+    plan = get_leave_plan(chart, Scenario.FRONT_LOADED, max_work_time=Duration(10 * 60), today=chart[1].date)
+    assert [day.work_time for day in plan.days] == [Duration(10 * 60)]
+    assert plan.final_balance == -Duration(5 * 60)
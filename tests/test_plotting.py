@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from recolul import plotting
+from recolul.duration import Duration
+
+
+def test_cumulative_balance():
+    fig = plotting.get_overtime_balance_figure(["1", "2", "3"], [Duration(30), Duration(-45), Duration(10)])
+    assert list(fig.data[0].y) == [30, -15, -5]
+    assert list(fig.data[0].text) == [str(Duration(30)), str(Duration(-15)), str(Duration(-5))]
+
+
+def test_html_graphs_share_plotly_bundle(tmp_path):
+    days = ["1", "2"]
+    histories = [
+        (str(tmp_path / f"{account}.html"), days, [Duration(minutes), Duration(-minutes)], account)
+        for account, minutes in (("alice", 10), ("bob", 20), ("carol", 30))
+    ]
+    plotting.write_overtime_balance_histories(histories, max_workers=2)
+
+    assert sorted(os.listdir(tmp_path)) == ["alice.html", "bob.html", "carol.html", "plotly.min.js"]
+    html = (tmp_path / "alice.html").read_text(encoding="UTF-8")
+    assert 'src="plotly.min.js"' in html
+    assert len(html) < len((tmp_path / "plotly.min.js").read_text(encoding="UTF-8"))
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        plotting.write_overtime_balance_history(["1"], [Duration(0)], str(tmp_path / "graph.pdf"))
+
+
+def test_missing_folder(tmp_path):
+    path = tmp_path / "graphs" / "graph.html"
+    plotting.write_overtime_balance_history(["1"], [Duration(0)], str(path))
+    assert path.exists()
+    assert (path.parent / "plotly.min.js").exists()
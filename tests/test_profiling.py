@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from recolul import profiling, time
+from tests.utils import load_mock_attendance_chart
+
+
+@pytest.fixture
+def profiler():
+    yield profiling.enable()
+    profiling.disable()
+
+
+def test_disabled_by_default():
+    assert profiling.get_profiler() is None
+    time.get_overtime_balance(load_mock_attendance_chart("multiple_entry_rows.html"))
+
+
+def test_phases(profiler: profiling.Profiler):
+    chart = load_mock_attendance_chart("when_break.html")
+    time.get_leave_time(chart)
+    time.get_leave_time(chart)
+
+    phases = profiler.get_phases()
+    assert list(phases) == ["recoru.parse_attendance_chart", "time.get_overtime_balance", "time.get_leave_time"]
+    assert phases["time.get_leave_time"].calls == 2
+    # Nested phases are included in their parent
+    assert phases["time.get_leave_time"].total_seconds >= phases["time.get_overtime_balance"].total_seconds
+
+
+def test_formats(profiler: profiling.Profiler):
+    with profiling.span("fetch"):
+        pass
+    assert json.loads(profiler.format("json"))["fetch"]["calls"] == 1
+    assert 'recolul_phase_calls_total{phase="fetch"} 1\n' in profiler.format("prometheus")
+    assert profiler.format("text").splitlines()[1].startswith("fetch")
+    with pytest.raises(ValueError):
+        profiler.format("xml")
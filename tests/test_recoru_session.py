@@ -0,0 +1,84 @@
+import threading
+from datetime import date
+
+import pytest
+
+from recolul.errors import UnexpectedRecoruPageError
+from recolul.recoru.attendance_chart import merge_attendance_charts
+from recolul.recoru.chart_cache import ChartCache
+from recolul.recoru.months import current_month, get_month_offset, get_month_range
+from recolul.recoru.recoru_session import RecoruSession
+from tests.utils import MockResponse, read_resource
+
+
+def test_month_range():
+    assert get_month_range(date(2024, 11, 1), date(2025, 2, 1)) == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)
+    ]
+    assert get_month_range(date(2025, 2, 1), date(2025, 2, 1)) == [date(2025, 2, 1)]
+    assert get_month_offset(date(2024, 11, 1), date(2025, 2, 1)) == -3
+    assert get_month_offset(current_month()) == 0
+
+
+def test_get_attendance_charts_in_parallel():
+    pages = {
+        date(2023, 8, 1): read_resource("multiple_entry_rows.html"),
+        date(2023, 11, 1): read_resource("unworked_wednesday.html"),
+        date(2023, 12, 1): read_resource("clock_out_after_midnight.html")
+    }
+    login_count = 0
+    lock = threading.Lock()
+    recoru_session = RecoruSession(contract_id="123", auth_id="alice", password="secret")
+
+    def login():
+        nonlocal login_count
+        with lock:
+            login_count += 1
+        recoru_session._logged_in = True
+        recoru_session._login_count += 1
+
+    def load_attendance_chart_gadget(month: date):
+        assert recoru_session._logged_in
+        return MockResponse(pages.get(month, pages[date(2023, 8, 1)]))
+
+    recoru_session._login = login
+    recoru_session._load_attendance_chart_gadget = load_attendance_chart_gadget
+
+    charts = recoru_session.get_attendance_charts(date(2023, 8, 1), date(2023, 12, 1))
+    assert login_count == 1
+    assert len(charts) == 5
+    merged_chart = merge_attendance_charts([charts[0], charts[3], charts[4]])
+    days = [row.day.text for row in merged_chart]
+    assert days[0] == "8/7(月)"
+    assert days[-1] == "12/3(日)"
+    assert days.index("11/20(月)") < days.index("12/1(金)")
+
+
+def test_unchanged_page_is_not_parsed_again():
+    pages = [read_resource("when_break.html"), read_resource("when_break.html"), read_resource("worked_holiday.html")]
+    recoru_session = RecoruSession(contract_id="123", auth_id="alice", password="secret")
+    recoru_session._logged_in = True
+    recoru_session._load_attendance_chart_gadget = lambda month: MockResponse(pages.pop(0))
+
+    first = recoru_session.get_attendance_chart(date(2024, 3, 1))
+    assert recoru_session.get_attendance_chart(date(2024, 3, 1)) is first
+    assert (recoru_session.parsed_charts.hits, recoru_session.parsed_charts.misses) == (1, 1)
+
+    changed = recoru_session.get_attendance_chart(date(2024, 3, 1))
+    assert changed is not first
+    assert changed[-1].date == date(2023, 11, 25)
+    assert (recoru_session.parsed_charts.hits, recoru_session.parsed_charts.misses) == (1, 2)
+
+
+def test_unexpected_page_is_not_cached(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    recoru_session = RecoruSession(contract_id="123", auth_id="alice", password="secret", cache=cache)
+    recoru_session._login = lambda: setattr(recoru_session, "_login_count", recoru_session._login_count + 1)
+    recoru_session._logged_in = True
+    # Still not the chart after logging in again
+    maintenance_page = "<html><body>Under maintenance</body></html>"
+    recoru_session._load_attendance_chart_gadget = lambda month: MockResponse(maintenance_page)
+
+    with pytest.raises(UnexpectedRecoruPageError):
+        recoru_session.get_attendance_chart(date(2024, 3, 1))
+    assert cache.get("123", "alice", date(2024, 3, 1)) is None
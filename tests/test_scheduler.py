@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.mock_server import MockRecoruServer
+from recolul import batch
+from recolul.config import Config
+from recolul.scheduler import AdaptiveLimit, FetchScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    token_bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert token_bucket.try_acquire() == 0
+    assert token_bucket.try_acquire() == 0
+    assert token_bucket.try_acquire() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert token_bucket.try_acquire() == 0
+    # Tokens don't accumulate over the capacity
+    clock.now = 100
+    assert [token_bucket.try_acquire() for _ in range(3)][-1] > 0
+
+
+def test_adaptive_limit():
+    clock = FakeClock()
+    adaptive_limit = AdaptiveLimit(initial=4, maximum=5, latency_threshold=1.0, clock=clock)
+    # About one per round of `limit` successes
+    for _ in range(5):
+        adaptive_limit.record(latency=0.1, failed=False, started_at=clock.now)
+    assert adaptive_limit.limit == 5
+
+    clock.now = 10
+    adaptive_limit.record(latency=0.1, failed=True, started_at=9)
+    assert adaptive_limit.limit == 2
+    # Started before the decrease
+    adaptive_limit.record(latency=2.0, failed=False, started_at=9.5)
+    assert adaptive_limit.limit == 2
+    adaptive_limit.record(latency=2.0, failed=False, started_at=11)
+    assert adaptive_limit.limit == 1
+
+
+def test_max_per_contract():
+    lock = threading.Lock()
+    running = {"a": 0, "b": 0}
+    max_running = {"a": 0, "b": 0}
+
+    def fetch(contract_id: str):
+        with lock:
+            running[contract_id] += 1
+            max_running[contract_id] = max(max_running[contract_id], running[contract_id])
+        time.sleep(0.01)
+        with lock:
+            running[contract_id] -= 1
+
+    with FetchScheduler(rate=1000, burst=1000, max_per_contract=2, max_concurrency=8) as scheduler:
+        futures = [scheduler.submit(contract_id, fetch, contract_id) for contract_id in "ab" * 10]
+        for future in futures:
+            future.result()
+    assert max_running == {"a": 2, "b": 2}
+
+
+def test_rate_limit():
+    with FetchScheduler(rate=50, burst=1) as scheduler:
+        start = time.perf_counter()
+        for future in [scheduler.submit(str(i), lambda: None) for i in range(6)]:
+            future.result()
+    assert time.perf_counter() - start >= 0.09
+
+
+def test_run_batch_with_scheduler():
+    with MockRecoruServer() as server:
+        configs = [
+            Config("100000", auth_id, password, server.base_url)
+            for auth_id, password in (("alice", "secret"), ("bob", "wrong"), ("carol", "secret"))
+        ]
+        with FetchScheduler(rate=100, max_per_contract=2) as scheduler:
+            results = batch.run_batch(configs, scheduler=scheduler)
+    assert [result.auth_id for result in results] == ["alice", "bob", "carol"]
+    assert [result.ok for result in results] == [True, False, True]
@@ -0,0 +1,106 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.mock_server import MockRecoruServer
+from recolul import profiling, time
+from recolul.recoru.months import add_months, current_month
+from recolul.recoru.recoru_session import RecoruSession
+from recolul.server import RecoluServer
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with MockRecoruServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def recolul_server(mock_server: MockRecoruServer):
+    with RecoruSession("100000", "alice", "secret", base_url=mock_server.base_url) as recoru_session:
+        with RecoluServer(recoru_session, port=0) as server:
+            yield server
+
+
+def _get(server: RecoluServer, path: str) -> tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(f"{server.base_url}{path}") as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def _get_chart(mock_server: MockRecoruServer, month=None):
+    with RecoruSession("100000", "alice", "secret", base_url=mock_server.base_url) as recoru_session:
+        return recoru_session.get_attendance_chart(month)
+
+
+def test_balance(mock_server: MockRecoruServer, recolul_server: RecoluServer):
+    full_attendance_chart = _get_chart(mock_server)
+    overtime_balance, total_workplace_times = time.get_overtime_balance(time.until_today(full_attendance_chart))
+
+    status, balance = _get(recolul_server, "/balance")
+    assert status == 200
+    assert balance["overtimeBalance"] == str(overtime_balance)
+    assert balance["workingDays"] == time.count_working_days(full_attendance_chart)
+
+    status, workplaces = _get(recolul_server, "/workplaces")
+    assert workplaces == {workplace: str(work_time) for workplace, work_time in total_workplace_times.items()}
+
+
+def test_answered_from_memory(mock_server: MockRecoruServer, recolul_server: RecoluServer):
+    _get(recolul_server, "/balance")
+    request_count = mock_server.request_count
+    for path in ["/balance", "/when", "/history", "/workplaces"]:
+        assert _get(recolul_server, path)[0] == 200
+    assert mock_server.request_count == request_count
+
+
+def test_history_of_period(mock_server: MockRecoruServer, recolul_server: RecoluServer):
+    previous_month = add_months(current_month(), -1)
+    status, history = _get(recolul_server, f"/history?from={previous_month:%Y-%m}")
+    assert status == 200
+    days, overtime_history, _ = time.get_overtime_history(
+        time.merge_until_today([_get_chart(mock_server, previous_month), _get_chart(mock_server)], current_month())
+    )
+    assert history == {"days": days, "overtimeHistory": [str(overtime) for overtime in overtime_history]}
+
+
+def test_when(recolul_server: RecoluServer):
+    status, when = _get(recolul_server, "/when")
+    assert status == 200
+    # Today is in progress on the mock server
+    assert not when["clockedOut"]
+    assert when["leaveTimes"][0]["minTime"]
+
+
+def test_metrics(recolul_server: RecoluServer):
+    assert _get(recolul_server, "/metrics")[0] == 404
+
+    profiling.enable()
+    try:
+        _get(recolul_server, "/balance")
+        with urllib.request.urlopen(f"{recolul_server.base_url}/metrics") as response:
+            metrics = response.read().decode()
+    finally:
+        profiling.disable()
+    assert "# TYPE recolul_phase_seconds_total counter" in metrics
+    assert 'recolul_phase_calls_total{phase="time.until_today"} 1' in metrics
+    assert f"recolul_parsed_chart_misses_total {recolul_server.chart_store.parsed_charts.misses}" in metrics
+
+
+def test_errors(recolul_server: RecoluServer):
+    assert _get(recolul_server, "/unknown")[0] == 404
+    assert _get(recolul_server, "/balance?from=2020-13")[0] == 400
+    assert _get(recolul_server, f"/balance?to={add_months(current_month(), 1):%Y-%m}")[0] == 400
+
+
+def test_refresh_keeps_unchanged_chart(recolul_server: RecoluServer):
+    chart_store = recolul_server.chart_store
+    calendar_index = chart_store.get_calendar_index(current_month())
+    hits = chart_store.parsed_charts.hits
+    chart_store.refresh()
+    assert chart_store.parsed_charts.hits == hits + 1
+    assert chart_store.get_calendar_index(current_month()) is calendar_index
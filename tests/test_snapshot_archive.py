@@ -0,0 +1,70 @@
+import gzip
+import os
+from datetime import date, datetime, timezone
+
+from benchmarks.mock_server import MockRecoruServer
+from recolul.recoru.months import add_months, current_month
+from recolul.recoru.recoru_session import RecoruSession
+from recolul.recoru.snapshot_archive import SnapshotArchive, read_html_file
+from tests.utils import load_mock_attendance_chart, read_resource
+
+
+def test_snapshots_are_deduplicated(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    text = read_resource("worked_holiday.html")
+    month = date(2023, 11, 1)
+    first = archive.add("123", "alice", month, text, datetime(2023, 11, 25, 9, tzinfo=timezone.utc))
+    second = archive.add("123", "alice", month, text, datetime(2023, 11, 25, 18, tzinfo=timezone.utc))
+    archive.add("123", "bob", month, text)
+
+    assert first.digest == second.digest
+    assert len(os.listdir(tmp_path / "objects")) == 1
+    assert archive.get_snapshots("123", "alice") == [first, second]
+    assert archive.get_snapshots("123", "alice", date(2023, 10, 1)) == []
+    assert archive.read(first) == text
+
+
+def test_find_as_of(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    month = date(2023, 11, 1)
+    morning = archive.add("123", "alice", month, "morning", datetime(2023, 11, 25, 9, tzinfo=timezone.utc))
+    evening = archive.add("123", "alice", month, "evening", datetime(2023, 11, 25, 18, tzinfo=timezone.utc))
+
+    assert archive.find("123", "alice", month) == evening
+    assert archive.find("123", "alice", month, as_of=datetime(2023, 11, 25, 12, tzinfo=timezone.utc)) == morning
+    assert archive.find("123", "alice", month, as_of=datetime(2023, 11, 24, tzinfo=timezone.utc)) is None
+    assert archive.find("123", "bob", month) is None
+
+
+def test_reprocess_snapshot(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    snapshot = archive.add("123", "alice", date(2023, 11, 1), read_resource("worked_holiday.html"))
+    assert RecoruSession.read_attendance_chart_snapshot(archive, snapshot) == (
+        load_mock_attendance_chart("worked_holiday.html")
+    )
+
+
+def test_read_compressed_file(tmp_path):
+    text = read_resource("multiple_entry_rows.html")
+    path = tmp_path / "chart.html.gz"
+    path.write_bytes(gzip.compress(text.encode("UTF-8")))
+    assert read_html_file(str(path)) == text
+    assert RecoruSession.read_attendance_chart_file(str(path)) == load_mock_attendance_chart("multiple_entry_rows.html")
+
+    empty_path = tmp_path / "empty.html"
+    empty_path.write_bytes(b"")
+    assert read_html_file(str(empty_path)) == ""
+
+
+def test_fetched_charts_are_archived(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    first_month = add_months(current_month(), -1)
+    with MockRecoruServer() as server:
+        with RecoruSession("100000", "alice", "secret", base_url=server.base_url, archive=archive) as recoru_session:
+            charts = recoru_session.get_attendance_charts(first_month, current_month())
+
+    snapshots = archive.get_snapshots("100000", "alice")
+    assert sorted(snapshot.month for snapshot in snapshots) == [first_month, current_month()]
+    for chart in charts:
+        snapshot = archive.find("100000", "alice", chart[0].date.replace(day=1))
+        assert RecoruSession.read_attendance_chart_snapshot(archive, snapshot) == chart
@@ -1,16 +1,17 @@
-import os.path
+import dataclasses
+from datetime import timedelta
 
 from recolul.duration import Duration
-from recolul.recoru.attendance_chart import AttendanceChart
-from recolul.recoru.recoru_session import RecoruSession
-from recolul.time import LeaveTime, get_leave_time, get_overtime_history
-
-RESOURCES_FOLDER = os.path.realpath(f"{__file__}/../resources")
-
-
-def load_mock_attendance_chart(filename: str) -> AttendanceChart:
-    path = os.path.join(RESOURCES_FOLDER, filename)
-    return RecoruSession.read_attendance_chart_file(path)
+from recolul.time import (
+    LeaveTime,
+    count_working_days,
+    get_leave_time,
+    get_month_summary,
+    get_overtime_balance,
+    get_overtime_history,
+    get_row_work_time
+)
+from tests.utils import load_mock_attendance_chart
 
 
 def test_get_overtime_history_multiple_entry_rows():
@@ -100,3 +101,33 @@ def test_double_leave_time():
         LeaveTime(includes_break=False, min_time=Duration.parse("14:22"), max_time=Duration.parse("15:00")),
         LeaveTime(includes_break=True, min_time=Duration.parse("15:22"))
     ]
+
+
+def test_month_summary():
+    chart = load_mock_attendance_chart("when_break.html")
+    today = chart[-1].date
+    future_row = dataclasses.replace(chart[-2], date=today + timedelta(days=1))
+    summary = get_month_summary([*chart, future_row], today=today)
+
+    overtime_balance, total_workplace_times = get_overtime_balance(chart)
+    assert summary.overtime_balance == overtime_balance
+    assert summary.total_workplace_times == total_workplace_times
+    assert summary.working_days == count_working_days(chart) + 1
+    assert summary.last_day is chart[-1]
+    assert summary.last_day_clock_in == "09:39"
+    assert summary.last_day_work_time == get_row_work_time(chart[-1])
+    assert summary.leave_times == get_leave_time(chart)
+
+    summary = get_month_summary(chart, exclude_last_day=True, today=today)
+    assert (summary.overtime_balance, summary.total_workplace_times) == get_overtime_balance(chart[:-1])
+
+    # First day of the month, not excluded
+    summary = get_month_summary(chart[:1], exclude_last_day=True, today=today)
+    assert (summary.overtime_balance, summary.total_workplace_times) == get_overtime_balance(chart[:1])
+
+
+def test_month_summary_clocked_out():
+    chart = load_mock_attendance_chart("worked_holiday.html")
+    summary = get_month_summary(chart, today=chart[-1].date)
+    assert summary.overtime_balance == get_overtime_balance(chart)[0]
+    assert summary.leave_times is None
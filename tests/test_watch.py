@@ -0,0 +1,50 @@
+import io
+
+from recolul.watch import watch_leave_time
+from tests.utils import load_mock_attendance_chart
+
+
+def test_watch_until_clocked_out():
+    charts = [
+        load_mock_attendance_chart("when_break.html"),
+        load_mock_attendance_chart("when_break.html"),
+        load_mock_attendance_chart("worked_holiday.html")
+    ]
+    fetches = []
+    sleeps = []
+
+    def get_attendance_chart():
+        fetches.append(None)
+        return charts[len(fetches) - 1]
+
+    output = io.StringIO()
+    # A zero interval refetches after every tick
+    watch_leave_time(get_attendance_chart, interval=0, output=output, sleep=sleeps.append)
+
+    lines = output.getvalue().splitlines()
+    # Not a terminal: unchanged statuses aren't repeated
+    assert len(lines) == 2
+    assert "Leave at 18:31 (break time included" in lines[0]
+    assert lines[-1] == "You have clocked out."
+    assert len(fetches) == 3
+    assert sleeps == [1.0, 1.0]
+
+
+def test_watch_keeps_last_chart_on_error():
+    fetches = []
+
+    def get_attendance_chart():
+        fetches.append(None)
+        if len(fetches) == 1:
+            return load_mock_attendance_chart("when_break.html")
+        if len(fetches) == 2:
+            raise ConnectionError("RecoRu is down")
+        return load_mock_attendance_chart("worked_holiday.html")
+
+    output = io.StringIO()
+    watch_leave_time(get_attendance_chart, interval=0, output=output, sleep=lambda _: None)
+
+    lines = output.getvalue().splitlines()
+    assert "could not refresh: RecoRu is down" in lines[1]
+    assert "Leave at 18:31" in lines[1]
+    assert lines[-1] == "You have clocked out."
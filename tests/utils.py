@@ -0,0 +1,22 @@
+import os.path
+
+from recolul.recoru.attendance_chart import AttendanceChart
+from recolul.recoru.recoru_session import RecoruSession
+
+RESOURCES_FOLDER = os.path.realpath(f"{__file__}/../resources")
+
+
+def load_mock_attendance_chart(filename: str) -> AttendanceChart:
+    path = os.path.join(RESOURCES_FOLDER, filename)
+    return RecoruSession.read_attendance_chart_file(path)
+
+
+def read_resource(filename: str) -> str:
+    with open(os.path.join(RESOURCES_FOLDER, filename), "rt", encoding="UTF-8") as resource_file:
+        return resource_file.read()
+
+
+class MockResponse:
+    """Stands for the requests.Response of a page"""
+    def __init__(self, text: str):
+        self.text = text